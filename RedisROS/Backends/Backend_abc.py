@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+
+
+class Backend_abc(ABC):
+    """
+    The base class for all communication backends.
+
+    A backend provides pub/sub, key-value storage, locks and the registration of nodes and endpoints
+    in the communication graph. Values and messages are returned as bytes, as with redis.
+    """
+
+    # ================================================================== Pub/sub
+    @abstractmethod
+    def publish(self, channel: str, data) -> int:
+        """
+        Publish data on a channel
+
+        :return: The number of subscribers the data was delivered to
+        """
+        pass
+
+    @abstractmethod
+    def pubsub(self):
+        """
+        Get a new pub/sub connection, ignoring subscribe messages.
+        The connection exposes subscribe(**{channel: handler}), unsubscribe(*channels),
+        psubscribe(**{pattern: handler}), punsubscribe(*patterns), get_message(timeout) and close(), as redis-py's PubSub.
+        """
+        pass
+
+    @abstractmethod
+    def numsub(self, *channels) -> list:
+        """
+        Get the number of subscribers of the given channels
+
+        :return: A list of (channel, count) tuples
+        """
+        pass
+
+    @abstractmethod
+    def numpat(self) -> int:
+        """
+        Get the number of pattern subscriptions, which are not counted by numsub
+        """
+        pass
+
+    # ================================================================== Key-value
+    @abstractmethod
+    def get(self, key: str):
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value) -> None:
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        """
+        Atomically increment the integer stored at key, starting from 0
+
+        :param amount: The increment, negative to decrement
+        :return: The incremented value
+        """
+        pass
+
+    # ================================================================== Lists
+    @abstractmethod
+    def push(self, key: str, value, max_length: int = None) -> None:
+        """
+        Append a value to the list stored at key
+
+        :param max_length: If given, only the max_length most recent values of the list are kept
+        """
+        pass
+
+    @abstractmethod
+    def get_list(self, key: str, start: int = 0, end: int = -1) -> list:
+        """
+        Get the values of the list stored at key between start and end included, as redis LRANGE
+        """
+        pass
+
+    # ================================================================== Locks
+    @abstractmethod
+    def lock(self, name: str):
+        """
+        Get a lock context manager for the given name
+        """
+        pass
+
+    # ================================================================== Graph registration
+    @abstractmethod
+    def get_comm_graph(self, comm_graph: str) -> dict:
+        """
+        Get the communication graph, mapping every node address to its list of endpoint entries
+        """
+        pass
+
+    @abstractmethod
+    def declare_node(self,
+                     comm_graph: str,
+                     address: str,
+                     labels: list,
+                     properties: dict
+                     ) -> None:
+        """
+        Declare a node in the communication graph
+
+        :param comm_graph: The name of the communication graph
+        :param address: The address of the node
+        :param labels: The labels of the node
+        :param properties: The properties of the node
+        """
+        pass
+
+    @abstractmethod
+    def undeclare_node(self, comm_graph: str, address: str) -> None:
+        """
+        Remove a node from the communication graph
+        """
+        pass
+
+    @abstractmethod
+    def declare_endpoint(self,
+                         comm_graph: str,
+                         parent_address: str,
+                         entry: dict,
+                         labels: list,
+                         properties: dict,
+                         relation: str,
+                         relation_properties: dict,
+                         outgoing: bool = True
+                         ) -> None:
+        """
+        Declare an endpoint in the communication graph, and relate its parent node to the resource it uses
+        (topic, shared variable, ...). The resource is created if it does not exist.
+
+        :param comm_graph: The name of the communication graph
+        :param parent_address: The address of the parent node
+        :param entry: The entry of the endpoint in the parent node
+        :param labels: The labels of the resource, the first one is used to identify it
+        :param properties: The properties of the resource, must contain its name
+        :param relation: The type of the relation between the parent node and the resource
+        :param relation_properties: The properties of the relation
+        :param outgoing: If True, the relation goes from the parent node to the resource, otherwise the other way around
+        """
+        pass
+
+    @abstractmethod
+    def undeclare_endpoint(self,
+                           comm_graph: str,
+                           parent_address: str,
+                           entry: dict,
+                           label: str,
+                           name: str,
+                           relation: str,
+                           outgoing: bool = True
+                           ) -> None:
+        """
+        Remove an endpoint from the communication graph, and the resource it uses if no relation is left to it
+
+        :param comm_graph: The name of the communication graph
+        :param parent_address: The address of the parent node
+        :param entry: The entry of the endpoint in the parent node
+        :param label: The label identifying the resource
+        :param name: The name of the resource
+        :param relation: The type of the relation between the parent node and the resource
+        :param outgoing: If True, the relation goes from the parent node to the resource, otherwise the other way around
+        """
+        pass
@@ -0,0 +1,32 @@
+from RedisROS import Config
+from .Backend_abc import Backend_abc
+from .Redis_backend import Redis_backend
+from .Memory_backend import Memory_backend
+
+# -> Available backends
+backends = {
+    "redis": Redis_backend,
+    "memory": Memory_backend
+}
+
+
+def create_backend(backend: str or Backend_abc = None, **kwargs) -> Backend_abc:
+    """
+    Create a communication backend
+
+    :param backend: The name of the backend ("redis" or "memory"), or a backend instance to use as is.
+                    If None, Config.backend is used.
+    :param kwargs: The arguments passed to the backend constructor
+    """
+
+    # -> Use given backend instances as is
+    if isinstance(backend, Backend_abc):
+        return backend
+
+    if backend is None:
+        backend = Config.backend
+
+    if backend not in backends:
+        raise ValueError(f"Unknown backend: {backend}, available backends: {list(backends.keys())}")
+
+    return backends[backend](**kwargs)
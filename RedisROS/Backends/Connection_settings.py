@@ -0,0 +1,58 @@
+import os
+
+from RedisROS import Config
+
+
+def parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def parse_list(value: str) -> list:
+    return [element.strip() for element in value.split(",") if element.strip()]
+
+
+# -> Connection settings, with the environment variables overriding them and their parser
+connection_settings = {
+    "host": ("REDISROS_REDIS_HOST", str),
+    "port": ("REDISROS_REDIS_PORT", int),
+    "db": ("REDISROS_REDIS_DB", int),
+    "password": ("REDISROS_REDIS_PASSWORD", str),
+    "unix_socket_path": ("REDISROS_REDIS_UNIX_SOCKET_PATH", str),
+    "socket_timeout": ("REDISROS_REDIS_SOCKET_TIMEOUT", float),
+    "socket_connect_timeout": ("REDISROS_REDIS_SOCKET_CONNECT_TIMEOUT", float),
+    "socket_keepalive": ("REDISROS_REDIS_SOCKET_KEEPALIVE", parse_bool),
+    "shards": ("REDISROS_REDIS_SHARDS", parse_list),
+}
+
+# -> Settings shared by the primary instance and the shards
+shared_settings = ["password", "socket_timeout", "socket_connect_timeout", "socket_keepalive"]
+
+
+def get_connection_settings(connection: dict = None) -> dict:
+    """
+    Get the redis connection settings, from lowest to highest priority:
+    - the Config redis_* settings
+    - the REDISROS_REDIS_* environment variables
+    - the given connection settings
+
+    :param connection: Connection settings overriding the Config and environment settings
+    :return: The connection settings, with the keys of connection_settings
+    """
+
+    # -> Get the Config settings
+    settings = {key: getattr(Config, f"redis_{key}") for key in connection_settings}
+
+    # -> Override with the environment variables
+    for key, (variable, parse) in connection_settings.items():
+        if variable in os.environ:
+            settings[key] = parse(os.environ[variable])
+
+    # -> Override with the given settings
+    if connection is not None:
+        for key in connection:
+            if key not in connection_settings:
+                raise ValueError(f"Unknown connection setting: {key}, available settings: {list(connection_settings.keys())}")
+
+        settings.update(connection)
+
+    return settings
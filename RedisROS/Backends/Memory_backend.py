@@ -0,0 +1,361 @@
+import copy
+import re
+from fnmatch import translate
+from queue import SimpleQueue, Empty
+from threading import Lock as ThreadLock
+
+from .Backend_abc import Backend_abc
+
+
+def encode(value) -> bytes:
+    """
+    Encode a value the way redis stores it
+    """
+    if isinstance(value, bytes):
+        return value
+    elif isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    elif isinstance(value, str):
+        return value.encode()
+    else:
+        return str(value).encode()
+
+
+def compile_pattern(pattern: str):
+    """
+    Compile a redis glob-style channel pattern (*, ?, [...]) into a matcher
+    """
+    return re.compile(translate(pattern)).match
+
+
+class Memory_store:
+    def __init__(self):
+        """
+        Process-wide storage shared by all the memory backends
+        """
+
+        self.store_lock = ThreadLock()
+
+        # -> Key-value storage
+        self.values = {}
+        self.lists = {}
+
+        # -> Pub/sub subscriptions (channel -> set of pubsubs)
+        self.channels = {}
+
+        # -> Pattern subscriptions (pattern -> (matcher, set of pubsubs)), and the patterns matching every channel
+        #    published to, resolved once per channel and reset when the pattern subscriptions change
+        self.patterns = {}
+        self.pattern_routes = {}      # channel -> tuple of (pattern, pubsub)
+
+        # -> Named locks
+        self.locks = {}
+
+        # -> Communication graphs and resources graph
+        self.comm_graphs = {}
+        self.graph_nodes = {}           # (label, name) -> {"labels": [...], "properties": {...}}
+        self.graph_relations = []       # (source key, relation, target key)
+
+    def clear(self) -> None:
+        """
+        Reset the store (equivalent of redis FLUSHALL)
+        """
+        with self.store_lock:
+            self.values.clear()
+            self.lists.clear()
+            self.locks.clear()
+            self.comm_graphs.clear()
+            self.graph_nodes.clear()
+            self.graph_relations.clear()
+
+
+# -> Process-wide store
+memory_store = Memory_store()
+
+
+class Memory_pubsub:
+    def __init__(self, store: Memory_store):
+        """
+        In-process pub/sub connection, mimicking the subset of redis-py's PubSub used by the endpoints
+        """
+
+        self.store = store
+        self.channels = {}
+        self.patterns = {}
+        self.queue = SimpleQueue()
+
+    def subscribe(self, *args, **kwargs) -> None:
+        """
+        Subscribe to channels, with an optional handler per channel given as keyword arguments
+        """
+
+        new_channels = dict.fromkeys(args)
+        new_channels.update(kwargs)
+
+        with self.store.store_lock:
+            for channel, handler in new_channels.items():
+                self.channels[encode(channel)] = handler
+                self.store.channels.setdefault(channel, set()).add(self)
+
+    def unsubscribe(self, *channels) -> None:
+        """
+        Unsubscribe from the given channels, or from every channel if none is given
+        """
+
+        with self.store.store_lock:
+            for channel in channels or [channel.decode() for channel in self.channels]:
+                self.channels.pop(encode(channel), None)
+                self.store.channels.get(channel, set()).discard(self)
+
+    def psubscribe(self, *args, **kwargs) -> None:
+        """
+        Subscribe to the channels matching glob-style patterns, with an optional handler per pattern given as keyword arguments
+        """
+
+        new_patterns = dict.fromkeys(args)
+        new_patterns.update(kwargs)
+
+        with self.store.store_lock:
+            for pattern, handler in new_patterns.items():
+                self.patterns[encode(pattern)] = handler
+
+                if pattern not in self.store.patterns:
+                    self.store.patterns[pattern] = (compile_pattern(pattern), set())
+
+                self.store.patterns[pattern][1].add(self)
+
+            self.store.pattern_routes.clear()
+
+    def punsubscribe(self, *patterns) -> None:
+        """
+        Unsubscribe from the given patterns, or from every pattern if none is given
+        """
+
+        with self.store.store_lock:
+            for pattern in patterns or [pattern.decode() for pattern in self.patterns]:
+                self.patterns.pop(encode(pattern), None)
+
+                if pattern in self.store.patterns:
+                    self.store.patterns[pattern][1].discard(self)
+
+                    if not self.store.patterns[pattern][1]:
+                        del self.store.patterns[pattern]
+
+            self.store.pattern_routes.clear()
+
+    def get_message(self, timeout: float = 0.):
+        """
+        Get the next message. If a handler is registered for its channel (or pattern), call it and return None.
+
+        :param timeout: The time (s) to wait for a message, None to wait indefinitely
+        """
+
+        try:
+            message = self.queue.get(block=timeout is None or timeout > 0, timeout=timeout)
+        except Empty:
+            return None
+
+        if message["type"] == "pmessage":
+            handler = self.patterns.get(message["pattern"])
+        else:
+            handler = self.channels.get(message["channel"])
+
+        if handler is not None:
+            handler(message)
+            return None
+
+        return message
+
+    def close(self) -> None:
+        self.unsubscribe()
+        self.punsubscribe()
+
+
+class Memory_backend(Backend_abc):
+    def __init__(self, store: Memory_store = None, client_name: str = None, connection: dict = None):
+        """
+        In-process communication backend, for single-process deployments and tests.
+        All memory backends of a process share the same store unless given another one.
+
+        :param store: The store to use. If None, the process-wide store is used.
+        :param client_name: Unused, kept for compatibility with the other backends
+        :param connection: Unused, kept for compatibility with the other backends
+        """
+
+        self.store = store if store is not None else memory_store
+
+    # ================================================================== Pub/sub
+    def publish(self, channel: str, data) -> int:
+        subscribers = tuple(self.store.channels.get(channel, ()))
+        pattern_subscribers = self.__get_pattern_routes(channel=channel) if self.store.patterns else ()
+
+        if not subscribers and not pattern_subscribers:
+            return 0
+
+        data = encode(data)
+
+        if subscribers:
+            message = {"type": "message", "pattern": None, "channel": channel.encode(), "data": data}
+
+            for pubsub in subscribers:
+                pubsub.queue.put(message)
+
+        for pattern, pubsub in pattern_subscribers:
+            pubsub.queue.put({"type": "pmessage", "pattern": pattern, "channel": channel.encode(), "data": data})
+
+        return len(subscribers) + len(pattern_subscribers)
+
+    def __get_pattern_routes(self, channel: str) -> tuple:
+        """
+        Get the pattern subscriptions matching a channel, as (pattern, pubsub) pairs, matched once per channel
+        """
+
+        routes = self.store.pattern_routes.get(channel)
+
+        if routes is None:
+            with self.store.store_lock:
+                routes = tuple(
+                    (pattern.encode(), pubsub)
+                    for pattern, (match, pubsubs) in self.store.patterns.items() if match(channel)
+                    for pubsub in pubsubs
+                )
+
+                self.store.pattern_routes[channel] = routes
+
+        return routes
+
+    def pubsub(self) -> Memory_pubsub:
+        return Memory_pubsub(store=self.store)
+
+    def numsub(self, *channels) -> list:
+        return [(channel.encode(), len(self.store.channels.get(channel, ()))) for channel in channels]
+
+    def numpat(self) -> int:
+        return sum(len(pubsubs) for _, pubsubs in self.store.patterns.values())
+
+    # ================================================================== Key-value
+    def get(self, key: str):
+        return self.store.values.get(key)
+
+    def set(self, key: str, value) -> None:
+        self.store.values[key] = encode(value)
+
+    def exists(self, key: str) -> bool:
+        return key in self.store.values or key in self.store.lists or key in self.store.comm_graphs
+
+    def delete(self, key: str) -> None:
+        self.store.values.pop(key, None)
+        self.store.lists.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self.store.store_lock:
+            value = int(self.store.values.get(key, 0)) + amount
+            self.store.values[key] = encode(value)
+
+            return value
+
+    # ================================================================== Lists
+    def push(self, key: str, value, max_length: int = None) -> None:
+        with self.store.store_lock:
+            values = self.store.lists.setdefault(key, [])
+            values.append(encode(value))
+
+            if max_length is not None and len(values) > max_length:
+                del values[:len(values) - max_length]
+
+    def get_list(self, key: str, start: int = 0, end: int = -1) -> list:
+        with self.store.store_lock:
+            values = self.store.lists.get(key, [])
+
+            # (LRANGE end is inclusive)
+            return values[start:] if end == -1 else values[start:end + 1]
+
+    # ================================================================== Locks
+    def lock(self, name: str):
+        with self.store.store_lock:
+            return self.store.locks.setdefault(name, ThreadLock())
+
+    # ================================================================== Graph registration
+    def get_comm_graph(self, comm_graph: str) -> dict:
+        with self.lock(name=comm_graph):
+            return copy.deepcopy(self.store.comm_graphs.get(comm_graph, {}))
+
+    def declare_node(self,
+                     comm_graph: str,
+                     address: str,
+                     labels: list,
+                     properties: dict
+                     ) -> None:
+
+        with self.lock(name=comm_graph):
+            self.store.comm_graphs.setdefault(comm_graph, {})[address] = []
+
+            self.store.graph_nodes[("node", address)] = {
+                "labels": ["node"] + labels,
+                "properties": dict(properties)
+            }
+
+    def undeclare_node(self, comm_graph: str, address: str) -> None:
+        with self.lock(name=comm_graph):
+            del self.store.comm_graphs[comm_graph][address]
+
+            # -> Delete the node and its relations
+            key = ("node", address)
+            self.store.graph_nodes.pop(key, None)
+            self.store.graph_relations[:] = [relation for relation in self.store.graph_relations
+                                             if key not in (relation[0], relation[2])]
+
+    def declare_endpoint(self,
+                         comm_graph: str,
+                         parent_address: str,
+                         entry: dict,
+                         labels: list,
+                         properties: dict,
+                         relation: str,
+                         relation_properties: dict,
+                         outgoing: bool = True
+                         ) -> None:
+
+        with self.lock(name=comm_graph):
+            # -> Declare the endpoint in the parent node
+            self.store.comm_graphs[comm_graph][parent_address].append(copy.deepcopy(entry))
+
+            # -> Create the resource if it does not exist
+            key = (labels[0], properties["name"])
+
+            if key not in self.store.graph_nodes:
+                self.store.graph_nodes[key] = {"labels": list(labels), "properties": dict(properties)}
+
+            # -> Create relationship
+            parent_key = ("node", parent_address)
+
+            if outgoing:
+                self.store.graph_relations.append((parent_key, relation, key))
+            else:
+                self.store.graph_relations.append((key, relation, parent_key))
+
+    def undeclare_endpoint(self,
+                           comm_graph: str,
+                           parent_address: str,
+                           entry: dict,
+                           label: str,
+                           name: str,
+                           relation: str,
+                           outgoing: bool = True
+                           ) -> None:
+
+        with self.lock(name=comm_graph):
+            # -> Undeclare the endpoint in the parent node
+            self.store.comm_graphs[comm_graph][parent_address].remove(entry)
+
+            # -> Delete relation
+            key = (label, name)
+            parent_key = ("node", parent_address)
+            relation = (parent_key, relation, key) if outgoing else (key, relation, parent_key)
+
+            if relation in self.store.graph_relations:
+                self.store.graph_relations.remove(relation)
+
+            # -> Delete resource if no relationships are left to it
+            if not any(key in (relation[0], relation[2]) for relation in self.store.graph_relations):
+                self.store.graph_nodes.pop(key, None)
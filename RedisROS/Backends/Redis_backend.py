@@ -0,0 +1,345 @@
+import select
+import time
+import zlib
+
+from redis import Redis
+from redis.commands.graph import Graph, Node
+from redis_lock import Lock
+
+from .Backend_abc import Backend_abc
+from .Connection_settings import get_connection_settings, shared_settings
+
+
+def get_shard_key(channel: str) -> str:
+    """
+    Get the key a channel is hashed on. Channels derived from a topic (<topic>/~...) are hashed on the topic,
+    so all the channels of a subscriber live on the same instance.
+    """
+    return channel.split("/~", 1)[0]
+
+
+class Sharded_pubsub:
+    def __init__(self, backend):
+        """
+        Pub/sub connection spread across the instances of a sharded redis backend.
+        Only the instances with subscribed channels are connected to.
+        """
+
+        self.backend = backend
+        self.pubsubs = {}
+        self.__next = 0
+
+    def __get_pubsub(self, shard: int):
+        if shard not in self.pubsubs:
+            self.pubsubs[shard] = self.backend.channel_clients[shard].pubsub(ignore_subscribe_messages=True)
+
+        return self.pubsubs[shard]
+
+    def subscribe(self, *args, **kwargs) -> None:
+        for channel in args:
+            self.__get_pubsub(shard=self.backend.get_shard(channel)).subscribe(channel)
+
+        for channel, handler in kwargs.items():
+            self.__get_pubsub(shard=self.backend.get_shard(channel)).subscribe(**{channel: handler})
+
+    def unsubscribe(self, *channels) -> None:
+        if not channels:
+            for pubsub in self.pubsubs.values():
+                pubsub.unsubscribe()
+
+        for channel in channels:
+            self.__get_pubsub(shard=self.backend.get_shard(channel)).unsubscribe(channel)
+
+    def psubscribe(self, *args, **kwargs) -> None:
+        # -> The channels matching a pattern can be hashed to any instance
+        for shard in range(len(self.backend.channel_clients)):
+            self.__get_pubsub(shard=shard).psubscribe(*args, **kwargs)
+
+    def punsubscribe(self, *patterns) -> None:
+        for pubsub in self.pubsubs.values():
+            pubsub.punsubscribe(*patterns)
+
+    def get_message(self, timeout: float = 0.):
+        """
+        Read a message from the first instance with one pending, waiting up to timeout (s) for any instance to receive one
+        """
+
+        pubsubs = [pubsub for pubsub in self.pubsubs.values() if pubsub.connection is not None]
+
+        if not pubsubs:
+            return None
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            # -> Poll the instances in turn, starting after the last one read so no instance is starved
+            for _ in range(len(pubsubs)):
+                self.__next = (self.__next + 1) % len(pubsubs)
+                pubsub = pubsubs[self.__next]
+
+                if pubsub.connection.can_read(timeout=0):
+                    return pubsub.get_message(timeout=0.)
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return None
+
+            # -> Wait for any instance to receive a message (the connections were opened by can_read)
+            select.select([pubsub.connection._sock for pubsub in pubsubs], [], [], remaining)
+
+    def close(self) -> None:
+        for pubsub in self.pubsubs.values():
+            pubsub.close()
+
+
+class Redis_backend(Backend_abc):
+    def __init__(self, client_name: str = None, connection: dict = None):
+        """
+        Redis communication backend.
+        The communication graph is stored as a RedisJSON document and mirrored in the ROS_graph RedisGraph.
+
+        Pub/sub channels can be hashed across several redis instances (shards), key-value storage, locks
+        and the communication graph stay on the primary instance.
+
+        :param client_name: The name of the redis client
+        :param connection: Connection settings overriding the Config and environment settings (see Connection_settings)
+        """
+
+        settings = get_connection_settings(connection=connection)
+        shards = settings.pop("shards")
+
+        # -> Setup redis connection
+        self.client = Redis(client_name=client_name, **settings)
+
+        # -> Setup the connections to the instances channels are hashed across
+        self.channel_clients = [self.client]
+
+        for shard in shards:
+            common_settings = {key: settings[key] for key in shared_settings}
+
+            if isinstance(shard, str):
+                self.channel_clients.append(Redis.from_url(shard, client_name=client_name, **common_settings))
+            else:
+                self.channel_clients.append(Redis(client_name=client_name, **{**common_settings, **shard}))
+
+    def get_shard(self, channel: str) -> int:
+        """
+        Get the index of the instance a channel is hashed to
+        """
+
+        if len(self.channel_clients) == 1:
+            return 0
+
+        return zlib.crc32(get_shard_key(channel=channel).encode()) % len(self.channel_clients)
+
+    # ================================================================== Pub/sub
+    def publish(self, channel: str, data) -> int:
+        return self.channel_clients[self.get_shard(channel=channel)].publish(channel, data)
+
+    def pubsub(self):
+        if len(self.channel_clients) == 1:
+            return self.client.pubsub(ignore_subscribe_messages=True)
+
+        return Sharded_pubsub(backend=self)
+
+    def numsub(self, *channels) -> list:
+        if len(self.channel_clients) == 1:
+            return self.client.pubsub_numsub(*channels)
+
+        return [self.channel_clients[self.get_shard(channel=channel)].pubsub_numsub(channel)[0] for channel in channels]
+
+    def numpat(self) -> int:
+        # (Pattern subscriptions are made on every instance)
+        return self.client.pubsub_numpat()
+
+    # ================================================================== Key-value
+    def get(self, key: str):
+        return self.client.get(key)
+
+    def set(self, key: str, value) -> None:
+        self.client.set(key, value)
+
+    def exists(self, key: str) -> bool:
+        return bool(self.client.exists(key))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self.client.incr(key, amount)
+
+    # ================================================================== Lists
+    def push(self, key: str, value, max_length: int = None) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.rpush(key, value)
+
+        if max_length is not None:
+            pipeline.ltrim(key, -max_length, -1)
+
+        pipeline.execute()
+
+    def get_list(self, key: str, start: int = 0, end: int = -1) -> list:
+        return self.client.lrange(key, start, end)
+
+    # ================================================================== Locks
+    def lock(self, name: str):
+        return Lock(redis_client=self.client, name=name)
+
+    # ================================================================== Graph registration
+    def get_comm_graph(self, comm_graph: str) -> dict:
+        return self.client.json().get(comm_graph) or {}
+
+    def declare_node(self,
+                     comm_graph: str,
+                     address: str,
+                     labels: list,
+                     properties: dict
+                     ) -> None:
+
+        with self.lock(name=comm_graph):
+            if not self.client.exists(comm_graph):
+                # -> Create comm_graph shared variable
+                self.client.json().set(comm_graph, "$", {f"{address}": []})
+
+            else:
+                # -> Get comm_graph shared variable
+                graph = self.client.json().get(comm_graph)
+
+                # -> Add node to comm_graph
+                graph[f"{address}"] = []
+
+                # -> Update comm_graph shared variable
+                self.client.json().set(comm_graph, "$", graph)
+
+            # ======================== Redis graph
+            # -> Get pubsub graph
+            redis_graph = Graph(client=self.client, name="ROS_graph")
+
+            # -> Add node
+            new_node = Node(
+                label=["node"] + labels,
+                properties=properties
+            )
+
+            redis_graph.add_node(node=new_node)
+            redis_graph.commit()
+
+    def undeclare_node(self, comm_graph: str, address: str) -> None:
+        with self.lock(name=comm_graph):
+            # -> Get comm_graph shared variable
+            graph = self.client.json().get(comm_graph)
+
+            # -> Delete node entry from comm_graph
+            del graph[f"{address}"]
+
+            # -> Update comm_graph shared variable
+            self.client.json().set(comm_graph, "$", graph)
+
+            # ======================== Redis graph
+            # -> Get pubsub graph
+            redis_graph = Graph(client=self.client, name="ROS_graph")
+
+            # -> Delete node
+            query = f"MATCH (n:node) WHERE n.name = '{address}' DELETE n"
+            redis_graph.query(query)
+
+    def declare_endpoint(self,
+                         comm_graph: str,
+                         parent_address: str,
+                         entry: dict,
+                         labels: list,
+                         properties: dict,
+                         relation: str,
+                         relation_properties: dict,
+                         outgoing: bool = True
+                         ) -> None:
+
+        label = labels[0]
+        name = properties["name"]
+
+        with self.lock(name=comm_graph):
+            # -> Get the communication graph from the redis server
+            graph = self.client.json().get(comm_graph)
+
+            # -> Declare the endpoint in the parent node
+            graph[parent_address].append(entry)
+
+            # -> Update comm_graph shared variable
+            self.client.json().set(comm_graph, "$", graph)
+
+            # ======================== Redis graph declaration
+            # -> Add edge in redis graph
+            redis_graph = Graph(client=self.client, name="ROS_graph")
+
+            # -> Check if resource node is in graph
+            query = "MATCH (n:%s {name: '%s'}) RETURN n" % (label, name)
+            resource_node = redis_graph.query(query).result_set
+
+            if len(resource_node) == 0:    # if it does not exist
+                # -> Create resource node
+                resource_node = Node(
+                    label=labels,
+                    properties=properties
+                )
+
+                # -> Add to graph
+                redis_graph.add_node(node=resource_node)
+                redis_graph.commit()
+
+            # -> Create relationship
+            edge_properties = "{" + ", ".join([f"{key}: '{value}'" for key, value in relation_properties.items()]) + "}"
+
+            if outgoing:
+                pattern = f"(p)-[r:{relation} {edge_properties}]->(n)"
+            else:
+                pattern = f"(n)-[r:{relation} {edge_properties}]->(p)"
+
+            query = f"MATCH (p:node), (n:{label}) WHERE p.name = '{parent_address}' AND n.name = '{name}' CREATE {pattern} RETURN r"
+            redis_graph.query(query)
+
+    def undeclare_endpoint(self,
+                           comm_graph: str,
+                           parent_address: str,
+                           entry: dict,
+                           label: str,
+                           name: str,
+                           relation: str,
+                           outgoing: bool = True
+                           ) -> None:
+
+        with self.lock(name=comm_graph):
+            # -> Get the communication graph from the redis server
+            graph = self.client.json().get(comm_graph)
+
+            # -> Undeclare the endpoint in the parent node
+            graph[parent_address].remove(entry)
+
+            # -> Update comm_graph shared variable
+            self.client.json().set(comm_graph, "$", graph)
+
+            # ======================== Redis graph
+            # -> Get pubsub graph
+            redis_graph = Graph(client=self.client, name="ROS_graph")
+
+            # -> Delete relation
+            if outgoing:
+                pattern = f"(p:node)-[r:{relation}]->(n:{label})"
+            else:
+                pattern = f"(n:{label})-[r:{relation}]->(p:node)"
+
+            query = f"MATCH {pattern} WHERE p.name = '{parent_address}' AND n.name = '{name}' DELETE r"
+            redis_graph.query(query)
+
+            # -> Delete resource if no relationships are left to it
+            relations_count = 0
+
+            query = f"MATCH (p)-[r]->(n:{label}) WHERE n.name = '{name}' RETURN COUNT(r)"
+            relations_count += redis_graph.query(query).result_set[0][0]
+
+            query = f"MATCH (n:{label})-[r]->(p) WHERE n.name = '{name}' RETURN COUNT(r)"
+            relations_count += redis_graph.query(query).result_set[0][0]
+
+            if relations_count == 0:
+                query = f"MATCH (n:{label}) WHERE n.name = '{name}' DELETE n"
+                redis_graph.query(query)
@@ -0,0 +1,19 @@
+
+# Import classes and functions
+from .Backend_abc import Backend_abc
+from .Redis_backend import Redis_backend
+from .Memory_backend import Memory_backend, memory_store
+from .Backend_factory import create_backend
+from .Connection_settings import get_connection_settings
+
+# Import submodules
+
+# -> Define public api
+__all__ = [
+    "Backend_abc",
+    "Redis_backend",
+    "Memory_backend",
+    "memory_store",
+    "create_backend",
+    "get_connection_settings"
+]
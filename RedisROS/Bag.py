@@ -0,0 +1,352 @@
+"""
+Bags are directories of segment files and a JSON index.
+
+Every segment starts with SEGMENT_MAGIC, followed by records made of a RECORD_HEADER (kind, receive timestamp in ns,
+topic id, data length) and their data:
+- TOPIC records name a topic id (data: the topic name)
+- PUBLISHER records register the metadata of a publisher number (data: JSON {"number", "metadata"})
+- MESSAGE records hold the messages as received from redis, undecoded (data: the serialised message or batch)
+
+Segments are self-contained: the topics and publishers are recorded again at the start of every segment.
+The index describes every segment (time range, messages per topic, topics and publishers tables), with a sparse
+time index of record offsets used to seek. Segments can be scanned to rebuild the index of an interrupted recording.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_right
+
+SEGMENT_MAGIC = b"RRBAG\x01"
+RECORD_HEADER = struct.Struct("<BQHI")
+
+TOPIC = 0
+PUBLISHER = 1
+MESSAGE = 2
+
+INDEX_FILE = "index.json"
+
+# -> Time (ns) between two entries of the time index of a segment
+INDEX_PERIOD = 1_000_000_000
+
+
+def get_segment_file(index: int) -> str:
+    return f"segment_{index:05d}.bag"
+
+
+class Bag_writer:
+    def __init__(self,
+                 path: str,
+                 segment_size: int = 64 * 1024 * 1024,
+                 buffer_size: int = 1024 * 1024
+                 ) -> None:
+        """
+        Append messages to a new bag
+
+        :param path: The directory of the bag, created if needed
+        :param segment_size: The size (bytes) after which a new segment is started
+        :param buffer_size: The size (bytes) of the write buffer of the segments
+        """
+
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise FileExistsError(f"A bag already exists in {path}")
+
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.segment_size = segment_size
+        self.buffer_size = buffer_size
+
+        # -> Topic ids and publishers metadata, recorded again in every segment
+        self.topics = {}            # topic -> id
+        self.publishers = {}        # number -> metadata
+
+        self.segments = []
+        self.file = None
+        self.__open_segment()
+
+    # ================================================================== Segments
+    def __open_segment(self) -> None:
+        self.segment = {
+            "file": get_segment_file(index=len(self.segments)),
+            "start": None,
+            "end": None,
+            "count": 0,
+            "topics": {},           # topic -> {"id", "count"}
+            "publishers": {},       # number -> metadata
+            "time_index": []        # [timestamp, offset] pairs
+        }
+
+        self.file = open(os.path.join(self.path, self.segment["file"]), "wb", buffering=self.buffer_size)
+        self.file.write(SEGMENT_MAGIC)
+        self.offset = len(SEGMENT_MAGIC)
+
+        # -> Make the segment self-contained
+        for topic, topic_id in self.topics.items():
+            self.__write_topic(topic=topic, topic_id=topic_id)
+
+        for number, metadata in self.publishers.items():
+            self.__write_publisher(number=number, metadata=metadata)
+
+    def __close_segment(self) -> None:
+        self.file.close()
+        self.segments.append(self.segment)
+
+    def __write_record(self, kind: int, timestamp: int, topic_id: int, data: bytes) -> None:
+        self.file.write(RECORD_HEADER.pack(kind, timestamp, topic_id, len(data)))
+        self.file.write(data)
+
+        self.offset += RECORD_HEADER.size + len(data)
+
+    def __write_topic(self, topic: str, topic_id: int) -> None:
+        self.__write_record(kind=TOPIC, timestamp=0, topic_id=topic_id, data=topic.encode())
+        self.segment["topics"][topic] = {"id": topic_id, "count": 0}
+
+    def __write_publisher(self, number: int, metadata: dict) -> None:
+        self.__write_record(kind=PUBLISHER, timestamp=0, topic_id=0, data=json.dumps({"number": number, "metadata": metadata}).encode())
+        self.segment["publishers"][number] = metadata
+
+    # ================================================================== Writing
+    def add_publisher(self, number: int, metadata: dict) -> None:
+        """
+        Record the metadata of a publisher, needed to decode its messages
+        """
+
+        self.publishers[number] = metadata
+        self.__write_publisher(number=number, metadata=metadata)
+
+    def write(self, topic: str, data: bytes, timestamp: int = None) -> None:
+        """
+        Record a message
+
+        :param topic: The topic the message was received from
+        :param data: The message as received from redis
+        :param timestamp: The receive time (ns since epoch). If None, the current time is used.
+        """
+
+        if timestamp is None:
+            timestamp = time.time_ns()
+
+        # -> Start a new segment once the current one is full
+        if self.offset + RECORD_HEADER.size + len(data) > self.segment_size and self.segment["count"]:
+            self.__close_segment()
+            self.__open_segment()
+
+        segment = self.segment
+
+        if topic not in self.topics:
+            self.topics[topic] = len(self.topics)
+            self.__write_topic(topic=topic, topic_id=self.topics[topic])
+
+        # -> Add an entry to the time index every INDEX_PERIOD
+        if not segment["time_index"] or timestamp - segment["time_index"][-1][0] >= INDEX_PERIOD:
+            segment["time_index"].append([timestamp, self.offset])
+
+        self.__write_record(kind=MESSAGE, timestamp=timestamp, topic_id=self.topics[topic], data=data)
+
+        if segment["start"] is None:
+            segment["start"] = timestamp
+
+        segment["end"] = timestamp
+        segment["count"] += 1
+        segment["topics"][topic]["count"] += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        Close the last segment and write the index of the bag
+        """
+
+        if self.file is None:
+            return
+
+        self.__close_segment()
+        self.file = None
+
+        with open(os.path.join(self.path, INDEX_FILE), "w") as f:
+            json.dump({"segments": self.segments}, f)
+
+
+class Bag_reader:
+    def __init__(self, path: str) -> None:
+        """
+        Read the messages of a bag, memory-mapping its segments
+
+        :param path: The directory of the bag
+        """
+
+        self.path = path
+
+        index_path = os.path.join(path, INDEX_FILE)
+
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.segments = json.load(f)["segments"]
+
+            # (JSON keys are strings)
+            for segment in self.segments:
+                segment["publishers"] = {int(number): metadata for number, metadata in segment["publishers"].items()}
+
+        else:
+            # -> Rebuild the index of an interrupted recording
+            self.segments = [self.__scan(file=file) for file in sorted(os.listdir(path)) if file.endswith(".bag")]
+
+    def __map(self, file: str) -> mmap.mmap or None:
+        with open(os.path.join(self.path, file), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __records(self, buffer, offset: int = len(SEGMENT_MAGIC)):
+        """
+        Iterate over the records of a segment, from the given offset
+
+        :return: Generator of (kind, timestamp, topic id, data start, data length, record offset) tuples
+        """
+
+        size = len(buffer)
+
+        # (The last record of an interrupted recording may be incomplete)
+        while offset + RECORD_HEADER.size <= size:
+            kind, timestamp, topic_id, length = RECORD_HEADER.unpack_from(buffer, offset)
+            start = offset + RECORD_HEADER.size
+
+            if start + length > size:
+                break
+
+            yield kind, timestamp, topic_id, start, length, offset
+
+            offset = start + length
+
+    def __scan(self, file: str) -> dict:
+        segment = {"file": file, "start": None, "end": None, "count": 0, "topics": {}, "publishers": {}, "time_index": []}
+        topic_names = {}
+
+        buffer = self.__map(file=file)
+
+        if buffer is None:
+            return segment
+
+        for kind, timestamp, topic_id, start, length, offset in self.__records(buffer=buffer):
+            if kind == TOPIC:
+                topic_names[topic_id] = buffer[start: start + length].decode()
+                segment["topics"][topic_names[topic_id]] = {"id": topic_id, "count": 0}
+
+            elif kind == PUBLISHER:
+                publisher = json.loads(buffer[start: start + length])
+                segment["publishers"][publisher["number"]] = publisher["metadata"]
+
+            else:
+                if not segment["time_index"] or timestamp - segment["time_index"][-1][0] >= INDEX_PERIOD:
+                    segment["time_index"].append([timestamp, offset])
+
+                if segment["start"] is None:
+                    segment["start"] = timestamp
+
+                segment["end"] = timestamp
+                segment["count"] += 1
+                segment["topics"][topic_names[topic_id]]["count"] += 1
+
+        buffer.close()
+
+        return segment
+
+    # ================================================================== Info
+    @property
+    def start(self) -> int or None:
+        starts = [segment["start"] for segment in self.segments if segment["start"] is not None]
+        return min(starts) if starts else None
+
+    @property
+    def end(self) -> int or None:
+        ends = [segment["end"] for segment in self.segments if segment["end"] is not None]
+        return max(ends) if ends else None
+
+    @property
+    def publishers(self) -> dict:
+        """
+        The metadata of every recorded publisher, by publisher number
+        """
+
+        publishers = {}
+
+        for segment in self.segments:
+            publishers.update(segment["publishers"])
+
+        return publishers
+
+    def get_info(self) -> dict:
+        """
+        Get the duration (s) of the bag and its number of messages, in total and per topic
+        """
+
+        topics = {}
+
+        for segment in self.segments:
+            for topic, entry in segment["topics"].items():
+                topics[topic] = topics.get(topic, 0) + entry["count"]
+
+        return {
+            "path": self.path,
+            "segments": len(self.segments),
+            "duration": (self.end - self.start) / 1e9 if self.start is not None else 0.,
+            "count": sum(segment["count"] for segment in self.segments),
+            "topics": topics
+        }
+
+    # ================================================================== Reading
+    def read(self, topics: list = None, start: int = None, end: int = None):
+        """
+        Iterate over the recorded messages in order
+
+        :param topics: The topics to read. If None, every topic is read.
+        :param start: The receive time (ns since epoch) to start from. If None, the bag is read from the start.
+        :param end: The receive time (ns since epoch) to stop at. If None, the bag is read to the end.
+        :return: Generator of (timestamp, topic, data) tuples
+        """
+
+        for segment in self.segments:
+            if segment["start"] is None:
+                continue
+
+            # -> Skip the segments out of the time range
+            if (start is not None and segment["end"] < start) or (end is not None and segment["start"] > end):
+                continue
+
+            topic_names = {entry["id"]: topic for topic, entry in segment["topics"].items()}
+            topic_ids = None if topics is None else {topic_id for topic_id, topic in topic_names.items() if topic in topics}
+
+            # -> Seek to the last time index entry before the start
+            offset = len(SEGMENT_MAGIC)
+
+            if start is not None:
+                position = bisect_right([entry[0] for entry in segment["time_index"]], start) - 1
+
+                if position >= 0:
+                    offset = segment["time_index"][position][1]
+
+            buffer = self.__map(file=segment["file"])
+
+            try:
+                for kind, timestamp, topic_id, data_start, length, _ in self.__records(buffer=buffer, offset=offset):
+                    if kind != MESSAGE:
+                        continue
+
+                    if start is not None and timestamp < start:
+                        continue
+
+                    if end is not None and timestamp > end:
+                        return
+
+                    if topic_ids is not None and topic_id not in topic_ids:
+                        continue
+
+                    yield timestamp, topic_names[topic_id], buffer[data_start: data_start + length]
+
+            finally:
+                buffer.close()
@@ -1,5 +1,8 @@
+import time
 from concurrent.futures import ThreadPoolExecutor
+from threading import Lock as ThreadLock, RLock
 from RedisROS.Config import *
+from RedisROS.Tracing import tracer, get_callback_name
 
 
 class CallbackGroup:
@@ -14,6 +17,10 @@ class CallbackGroup:
         self.name = name
         self.callbacks = []
 
+        # -> Initialise the pool running the work submitted by the endpoints (e.g. service requests), created on first use
+        self.executor = None
+        self.__executor_lock = ThreadLock()
+
     def add_callback(self, callback):
         """
         Add a callback to the callback group
@@ -35,6 +42,35 @@ class CallbackGroup:
         else:
             return False
 
+    def _get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        with self.__executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.name)
+
+            return self.executor
+
+    def submit(self, function, *args):
+        """
+        Run a function on behalf of an endpoint of the callback group, following the concurrency of the group.
+        By default the functions run one at a time, in the order they are submitted, in the group's worker thread.
+
+        :return: The future of the call
+        """
+        return self._get_executor(max_workers=1).submit(function, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the pool running the submitted work, it is recreated if more work is submitted
+
+        :param wait: Whether to wait for the submitted work to complete
+        """
+
+        with self.__executor_lock:
+            executor, self.executor = self.executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
     def get_entities(self, entity_type):
         """
         Get all the entities in the callback group of the given type
@@ -50,15 +86,34 @@ class MutuallyExclusiveCallbackGroup(CallbackGroup):
     def __init__(self, name: str = ""):
         CallbackGroup.__init__(self, name=name)
 
+        # -> Held while spinning and while running the submitted work, so only one callback of the group runs at a time
+        self.lock = RLock()
+
     def spin(self) -> None:
         """
         Spin the callbacks in the callback group in order
         """
 
-        for callback in self.callbacks:
-            # -> If callback is not flagged as manual spin, spin
-            if not callback.manual_spin:
-                callback.spin()
+        with self.lock:
+            for callback in self.callbacks:
+                # -> If callback is not flagged as manual spin, spin
+                if not callback.manual_spin:
+                    if tracer.active:
+                        tracer.call(name=get_callback_name(callback), function=callback.spin, category=self.name)
+                    else:
+                        callback.spin()
+
+    def __run_exclusive(self, function, *args):
+        with self.lock:
+            return function(*args)
+
+    def submit(self, function, *args):
+        """
+        Run a function in the group's worker thread, one at a time and never while the group is spinning
+
+        :return: The future of the call
+        """
+        return self._get_executor(max_workers=1).submit(self.__run_exclusive, function, *args)
 
 
 class ReentrantCallbackGroup(CallbackGroup):
@@ -76,4 +131,19 @@ class ReentrantCallbackGroup(CallbackGroup):
             for callback in self.callbacks:
                 # -> If callback is not flagged as manual spin, spin
                 if not callback.manual_spin:
-                    executor.submit(callback.spin)
+                    if tracer.active:
+                        executor.submit(tracer.call,
+                                        name=get_callback_name(callback),
+                                        function=callback.spin,
+                                        category=self.name,
+                                        submitted=time.perf_counter())
+                    else:
+                        executor.submit(callback.spin)
+
+    def submit(self, function, *args):
+        """
+        Run a function in the group's thread pool (Config.worker_pool_size threads), shared by its endpoints
+
+        :return: The future of the call
+        """
+        return self._get_executor(max_workers=worker_pool_size).submit(function, *args)
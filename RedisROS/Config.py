@@ -1,7 +1,57 @@
 
+# ------- Communication backend
+# "redis", or "memory" for single-process deployments
+backend = "redis"
+
+# ------- Redis connection
+# Can be overridden with the REDISROS_REDIS_<SETTING> environment variables, or per node
+redis_host = "localhost"
+redis_port = 6379
+redis_db = 0
+redis_password = None
+redis_unix_socket_path = None       # If set, connect through this unix domain socket instead of tcp
+redis_socket_timeout = None         # s
+redis_socket_connect_timeout = None # s
+redis_socket_keepalive = False
+redis_shards = []                   # Extra instances topics are hashed across: urls ("redis://host:port", "unix:///path") or settings dicts
+
 # ------- Redis locks config
 expire_time = 10
 auto_renewal = True
 
 # ------- Block threadpoolexecutor
 worker_pool_size = 100
+
+# ------- Intra-process communications
+# Hand messages over by reference between publishers and subscribers living in the same process
+intra_process_comms = False
+
+# ------- Shared memory communications
+# Exchange messages through shared memory ring buffers between endpoints of the same host
+shm_comms = False
+shm_slot_count = 16
+shm_slot_size = 256 * 1024          # Max message size (bytes) sent through shared memory, larger messages go through redis
+
+# ------- Peer-to-peer communications
+# Send messages directly from publishers to subscribers over sockets, redis is only used for discovery
+p2p_comms = False
+p2p_transport = "tcp"               # "tcp", or "unix" for same-host peers
+p2p_bind_host = "0.0.0.0"
+p2p_advertised_host = None          # Host name advertised to subscribers, if None the host name is used
+p2p_send_timeout = 1.               # Time (s) after which a subscriber not reading its messages is disconnected
+
+# ------- Endpoint metrics
+stats_period = None                 # Period (s) at which nodes publish their endpoints stats, None to disable
+stats_topic = "/metrics"            # Topic nodes publish their endpoints stats to
+
+# ------- Tracing and profiling
+# Can be switched at runtime through RedisROS.Tracing.tracer
+tracing = False                     # Record a trace event for every callback, exportable in the Chrome trace-event format
+trace_buffer_size = 100000          # Number of trace events kept, oldest events are discarded first
+profile_sample_rate = 0.            # Fraction of callbacks run under cProfile
+
+# ------- Direct communications
+# Publishers cache the subscriber counts (intra-process/shm/p2p publishers) and content filters of their topic.
+# Subscribers announce their changes to refresh the caches, the period only bounds how late pattern subscriptions are noticed.
+remote_check_period = 1.            # Period (s) at which publishers refresh their cached view of the subscribers
+filter_lease = 5.                   # Time (s) a content filter stays registered unless its subscriber renews it (every third of it)
@@ -0,0 +1,186 @@
+import json
+import operator
+import time
+
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS import Config
+
+# -> Comparison operators of the filter conditions
+operators = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, values: value in values,
+    "not in": lambda value, values: value not in values
+}
+
+# -> Field name of the message payload, payload fields are addressed as "msg.<key>.<key>..."
+PAYLOAD_FIELD = "msg"
+
+# (Marks a field missing from a message)
+MISSING = object()
+
+
+def get_filters_key(topic: str) -> str:
+    """
+    Get the key holding the content filters of the subscribers of a topic, by registration id
+    """
+    return f"{topic}/~filters"
+
+
+class Content_filter:
+    def __init__(self, conditions: list or dict) -> None:
+        """
+        Declarative filter on the envelope or payload fields of the messages of a subscription.
+        A message passes the filter if it meets every condition.
+
+        Conditions are (field, operator, value) triples, or a dictionary of {field: value} equality conditions:
+        - Envelope fields (msg_type, parent_node_ref, publisher_id, seq, timestamp, topic, ...) are checked before the
+          message is decoded
+        - Payload fields are addressed as "msg" or "msg.<key>.<key>...", the message is decoded to check them
+        Operators: ==, !=, <, <=, >, >=, in, not in. A message missing a field fails its conditions.
+
+        e.g. Content_filter([("msg.robot_id", "==", 3), ("msg.range", "<", 2.)])
+
+        :param conditions: The conditions of the filter, must be JSON serializable
+        """
+
+        if isinstance(conditions, dict):
+            conditions = [(field, "==", value) for field, value in conditions.items()]
+
+        self.conditions = [tuple(condition) for condition in conditions]
+
+        for field, op, _ in self.conditions:
+            if op not in operators:
+                raise ValueError(f"Unknown filter operator: {op}, must be one of {list(operators)}")
+
+        # -> Split the conditions checked before decoding the message from the conditions on its payload
+        self.envelope_conditions = [self.__compile(*condition) for condition in self.conditions
+                                    if condition[0].split(".", 1)[0] != PAYLOAD_FIELD]
+        self.payload_conditions = [self.__compile(*condition) for condition in self.conditions
+                                   if condition[0].split(".", 1)[0] == PAYLOAD_FIELD]
+
+    def __repr__(self):
+        return f"Content_filter({self.conditions})"
+
+    @staticmethod
+    def __compile(field: str, op: str, value):
+        """
+        Compile a condition into a (path, comparison, value) triple
+        """
+        return field.split("."), operators[op], value
+
+    @staticmethod
+    def __get(fields: dict, path: list):
+        value = fields
+
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return MISSING
+
+            value = value[key]
+
+        return value
+
+    @staticmethod
+    def __check(conditions: list, fields: dict, default: bool) -> bool:
+        """
+        :param default: The result of the conditions on fields missing from the message
+        """
+
+        for path, compare, value in conditions:
+            field = Content_filter.__get(fields=fields, path=path)
+
+            if field is MISSING:
+                if not default:
+                    return False
+                continue
+
+            try:
+                if not compare(field, value):
+                    return False
+            except TypeError:
+                return False
+
+        return True
+
+    def match_envelope(self, envelope: dict, default: bool = False) -> bool:
+        """
+        Check the envelope conditions, before decoding the message
+
+        :param envelope: The metadata of the message
+        :param default: The result of the conditions on fields missing from the envelope
+        """
+        return self.__check(conditions=self.envelope_conditions, fields=envelope, default=default)
+
+    def match_payload(self, raw_msg: dict, default: bool = False) -> bool:
+        """
+        Check the payload conditions of a decoded message
+
+        :param raw_msg: The message and its metadata
+        :param default: The result of the conditions on fields missing from the message
+        """
+        return self.__check(conditions=self.payload_conditions, fields=raw_msg, default=default)
+
+    def match(self, raw_msg: dict, default: bool = False) -> bool:
+        """
+        Check every condition on a decoded message
+
+        :param raw_msg: The message and its metadata
+        :param default: The result of the conditions on fields missing from the message
+        """
+        return self.match_envelope(envelope=raw_msg, default=default) and self.match_payload(raw_msg=raw_msg, default=default)
+
+
+# ================================================================== Registry
+def get_live_filters(backend: Backend_abc, key: str) -> dict:
+    """
+    Get the registered filters whose lease has not expired (the subscribers still renewing them)
+    """
+
+    now = time.time()
+
+    return {filter_id: entry for filter_id, entry in json.loads(backend.get(key=key) or "{}").items()
+            if entry["expires"] > now}
+
+
+def register_filter(backend: Backend_abc, topic: str, filter_id: str, content_filter: Content_filter) -> None:
+    """
+    Register (or renew) the filter of a subscriber, so the publishers of the topic skip the messages no subscriber wants.
+    The registration expires after Config.filter_lease seconds unless renewed, so the filters of crashed subscribers
+    stop filtering the messages of the topic.
+
+    :param filter_id: The id of the registration, unique across processes
+    """
+
+    key = get_filters_key(topic=topic)
+
+    with backend.lock(name=key):
+        filters = get_live_filters(backend=backend, key=key)
+        filters[filter_id] = {"conditions": content_filter.conditions, "expires": time.time() + Config.filter_lease}
+        backend.set(key=key, value=json.dumps(filters))
+
+
+def unregister_filter(backend: Backend_abc, topic: str, filter_id: str) -> None:
+    key = get_filters_key(topic=topic)
+
+    with backend.lock(name=key):
+        filters = get_live_filters(backend=backend, key=key)
+        filters.pop(filter_id, None)
+
+        if filters:
+            backend.set(key=key, value=json.dumps(filters))
+        else:
+            backend.delete(key=key)
+
+
+def get_filters(backend: Backend_abc, topic: str) -> list:
+    """
+    Get the live filters registered by the subscribers of a topic
+    """
+
+    return [Content_filter(conditions=entry["conditions"])
+            for entry in get_live_filters(backend=backend, key=get_filters_key(topic=topic)).values()]
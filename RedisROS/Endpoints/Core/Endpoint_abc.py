@@ -1,20 +1,24 @@
 from abc import ABC, abstractmethod
-import random
-import string
 
-from redis import Redis
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS.Backends.Backend_factory import create_backend
+from .Endpoint_stats import Endpoint_stats
 
 
 class Endpoint_abc(ABC):
     def __init__(self,
                  parent_node_ref: str,
                  namespace: str = "",
-                 manual_spin: bool = False
+                 manual_spin: bool = False,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
                  ):
         """
         The base class for all endpoints
 
         :param parent_node_ref: The reference of the parent node
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
         """
 
         # -> Generate a unique ID for the subscriber
@@ -36,8 +40,22 @@ class Endpoint_abc(ABC):
         if self.namespace != "":
             self.comm_graph = self.get_topic(topic_elements=[namespace, self.comm_graph])
 
-        # -> Setup endpoint redis connection
-        self.client = Redis(client_name=self.id)
+        # -> Setup endpoint backend connection
+        self.backend = create_backend(backend=backend, client_name=self.id, connection=connection)
+
+        # -> Initialise the endpoint runtime metrics
+        self.stats = Endpoint_stats()
+
+    def get_stats(self) -> dict:
+        """
+        Get a snapshot of the runtime metrics of the endpoint
+        """
+
+        return {
+            "id": self.id,
+            "type": type(self).__name__,
+            **self.stats.snapshot()
+        }
 
     @staticmethod
     def get_topic(topic_elements: list):
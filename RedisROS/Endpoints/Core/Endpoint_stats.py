@@ -0,0 +1,153 @@
+from bisect import bisect_left
+
+# -> Histogram bucket upper bounds (s): 1us to ~134s, doubling every bucket
+DURATION_BOUNDS = [1e-6 * 2 ** i for i in range(28)]
+
+
+class Histogram:
+    def __init__(self, bounds: list = DURATION_BOUNDS) -> None:
+        """
+        Fixed-bucket histogram, recording a value costs a bisection and a few additions.
+
+        :param bounds: The sorted upper bounds of the buckets, values above the last bound go in an overflow bucket
+        """
+
+        self.bounds = bounds
+        self.reset()
+
+    def reset(self) -> None:
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.
+        self.min = None
+        self.max = None
+
+    def record(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float or None:
+        """
+        Get an upper estimate of the p percentile, the upper bound of the bucket it falls in
+
+        :param p: The percentile, between 0 and 1
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = p * self.count
+        cumulated = 0
+
+        for i, bucket in enumerate(self.buckets):
+            cumulated += bucket
+
+            if cumulated >= rank and bucket:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": [[self.bounds[i] if i < len(self.bounds) else None, bucket] for i, bucket in enumerate(self.buckets) if bucket]
+        }
+
+
+class Endpoint_stats:
+    def __init__(self) -> None:
+        """
+        Runtime metrics of an endpoint.
+        Counters are plain attributes incremented by the endpoint without locking: concurrent updates can
+        occasionally be lost, which is acceptable for monitoring and keeps the hot path cheap.
+
+        Durations and latencies are in seconds. End-to-end latencies are computed from the envelope timestamp,
+        so they include the clock offset between the publishing and the receiving hosts.
+        """
+
+        self.callback_duration = Histogram()
+        self.latency = Histogram()
+        self.reset()
+
+    def reset(self) -> None:
+        # -> Messages/values sent and received
+        self.sent = 0
+        self.received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        # -> Messages lost before reaching the callback
+        self.dropped = 0
+
+        # -> Messages skipped by a content filter (by the publisher when no subscriber wants them)
+        self.filtered = 0
+
+        # -> Messages skipped by the rate limit of a publisher, or downsampled by a subscriber
+        self.throttled = 0
+
+        # -> Messages dropped once their lifespan elapsed, and periods elapsed without a message past the deadline
+        self.expired = 0
+        self.deadline_missed = 0
+
+        # -> Messages missing from, or arriving late in, the sequences of the publishers
+        self.lost = 0
+        self.reordered = 0
+
+        # -> Callbacks
+        self.callbacks = 0
+        self.callback_errors = 0
+
+        # -> Compressed messages, their sizes before and after compression, and the CPU time spent (de)compressing them
+        self.compressed = 0
+        self.bytes_uncompressed = 0
+        self.bytes_compressed = 0
+        self.compression_time = 0.
+
+        self.callback_duration.reset()
+        self.latency.reset()
+
+    def compression_snapshot(self) -> dict:
+        return {
+            "count": self.compressed,
+            "ratio": self.bytes_uncompressed / self.bytes_compressed if self.bytes_compressed else None,
+            "cpu_time": self.compression_time
+        }
+
+    @staticmethod
+    def get_counters() -> list:
+        """
+        Get the names of the counters of the snapshots
+        """
+        return [name for name, value in Endpoint_stats().snapshot().items() if isinstance(value, int)]
+
+    def snapshot(self) -> dict:
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "dropped": self.dropped,
+            "filtered": self.filtered,
+            "throttled": self.throttled,
+            "expired": self.expired,
+            "deadline_missed": self.deadline_missed,
+            "lost": self.lost,
+            "reordered": self.reordered,
+            "callbacks": self.callbacks,
+            "callback_errors": self.callback_errors,
+            "callback_duration": self.callback_duration.snapshot(),
+            "latency": self.latency.snapshot()
+        }
@@ -1,26 +1,46 @@
+import itertools
 import json
-from datetime import datetime
-
-from redis.commands.graph import Graph, Edge, Node
-from redis_lock import Lock
+import time
+from threading import Thread, Condition, Timer, Lock as ThreadLock, RLock
 
 from ..Endpoint_abc import Endpoint_abc
+from RedisROS.Transports.Intra_process_manager import intra_process_manager
+from RedisROS.Transports.Shm_ring_buffer import Shm_ring_buffer, get_shm_channel, SHM_REF_PREFIX, SHM_CLOSE_PREFIX, HOST
+from RedisROS.Transports.Socket_transport import Socket_server, get_p2p_channel
+from RedisROS.Transports.Batch_framing import pack_batch
+from RedisROS.Transports.Message_framing import pack_message, pack_chunks, get_publisher_key, get_subscribers_channel, PUBLISHER_COUNTER_KEY, FLAG_COMPRESSED
+from RedisROS.Transports.Codecs import get_codec
+from RedisROS.QoS import QoS_profile, COALESCE
+from RedisROS.Content_filter import get_filters
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS import Config
 
 
 class Publisher(Endpoint_abc):
     def __init__(self,
                  topic: str,
                  msg_type: str = "Unspecified",
-                 qos_profile=None,
+                 qos_profile: QoS_profile = None,
                  parent_node_ref: str = None,
-                 namespace: str = ""
+                 namespace: str = "",
+                 manual_spin: bool = False,
+                 intra_process: bool = False,
+                 shm: bool = False,
+                 p2p: bool = False,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
                  ) -> None:
         """
         Create a publisher endpoint for the given topic
 
         :param msg_type: The type of the message to be published
         :param topic: The topic to publish to
-        :param qos_profile: The QoS profile to use
+        :param qos_profile: The QoS profile to use (batching, chunking, compression). If None, the default QoS_profile is used.
+        :param intra_process: Whether to hand messages over by reference to the subscribers of the same process
+        :param shm: Whether to write messages to a shared memory ring read by the subscribers of the same host
+        :param p2p: Whether to send messages directly to the subscribers connected to the publisher's socket
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
 
         :param parent_node_ref: The reference of the parent node
         """
@@ -28,41 +48,399 @@ class Publisher(Endpoint_abc):
         # -> Initialise the publisher properties
         self.msg_type = msg_type
         self.topic = self.get_topic(topic_elements=[topic])
-        self.qos_profile = qos_profile
+        self.qos_profile = qos_profile if qos_profile is not None else QoS_profile()
+        self.intra_process = intra_process
+        self.shm = shm
+        self.p2p = p2p
+
+        # -> Get the compression function
+        if self.qos_profile.compression is not None:
+            self.__compress, _ = get_codec(name=self.qos_profile.compression)
+
+        # -> Setup the shared memory ring
+        if self.shm:
+            self.shm_ring = Shm_ring_buffer(slot_count=Config.shm_slot_count, slot_size=Config.shm_slot_size)
+            self.shm_channel = get_shm_channel(topic=self.topic, host=HOST)
+
+        # -> Setup the p2p socket server
+        if self.p2p:
+            self.p2p_server = Socket_server(transport=Config.p2p_transport,
+                                            bind_host=Config.p2p_bind_host,
+                                            advertised_host=Config.p2p_advertised_host,
+                                            send_timeout=Config.p2p_send_timeout)
+
+        # -> Initialise the cached count of subscribers listening through redis
+        self.__redis_subscribers_count = 0
+        self.__redis_pattern_subscribers = False
+        self.__redis_check_time = 0.
+
+        # -> Initialise the cached content filters of the subscribers, None if a subscriber wants every message
+        self.__subscriber_filters = None
+        self.__filters_check_time = 0.
+
+        # -> Initialise the token bucket of the rate limit, and the latest message waiting for a token when coalescing
+        if self.qos_profile.rate_limit is not None:
+            self.__tokens = float(self.qos_profile.rate_burst)
+            self.__tokens_time = time.monotonic()
+            self.__pending = None
+            self.__pending_timer = None
+            self.__rate_lock = ThreadLock()
 
         # -> Initialise the publisher's cache
         self.cache = []
 
+        # -> Initialise the sequence numbers of the messages
+        self.__seq = itertools.count(1)
+
+        # -> Guard the numbering, caching and sending of the messages, published from the user threads and the coalescing timer
+        self.__publish_lock = RLock()
+
+        # -> Setup the batch of serialised messages waiting to be sent, flushed by a background thread
+        self.batch_thread = None
+
+        if self.qos_profile.batch_period is not None:
+            self.__batch = []
+            self.__batch_bytes = 0
+            self.__batch_deadline = 0.
+            self.__batch_condition = Condition()
+            self.__batching = True
+
+            self.batch_thread = Thread(target=self.__batch_loop, daemon=True)
+            self.batch_thread.start()
+
         # -> Setup endpoint
         Endpoint_abc.__init__(self,
                               parent_node_ref=parent_node_ref,
-                              namespace=namespace)
+                              namespace=namespace,
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
+                              )
+
+        # -> Watch the subscribers of the topic if the publisher skips messages: direct publishers skip redis when every
+        #    subscriber is reached directly, and publishers of filtered topics skip the messages every subscriber filters out.
+        #    Other publishers send every message (filtered by the subscribers) without checking the subscribers.
+        self.__watching = self.intra_process or self.shm or self.p2p or bool(get_filters(backend=self.backend, topic=self.topic))
+        self.__announcements = None
+
+        # -> Listen for the subscribers announcing themselves, to refresh the cached subscriber counts and filters
+        if self.__watching:
+            self.__announcements = self.backend.pubsub()
+            self.__announcements.subscribe(get_subscribers_channel(topic=self.topic))
+            self.__announcements_lock = ThreadLock()
+
+        # -> Get the number identifying the publisher in the message headers
+        self.number = self.backend.incr(key=PUBLISHER_COUNTER_KEY)
 
         # -> Declare the endpoint in the comm graph
         self.declare_endpoint()
 
-    def __build_msg(self, msg) -> dict:
-        # -> Add message metadata
-        msg = {
-            "timestamp": datetime.timestamp(datetime.now()),
+    def get_metadata(self) -> dict:
+        """
+        Get the metadata of the messages of the publisher, registered once instead of being sent with every message
+        """
+
+        metadata = {
             "msg_type": self.msg_type,
             "parent_node_ref": self.parent_node_ref,
-            "publisher_id": self.id,
+            "publisher_id": self.id
+        }
+
+        # -> Declare the lifespan of the messages, enforced by the subscribers
+        if self.qos_profile.lifespan is not None:
+            metadata["lifespan"] = self.qos_profile.lifespan
+
+        # -> Name the codec of the compressed messages
+        if self.qos_profile.compression is not None:
+            metadata["codec"] = self.qos_profile.compression
+
+        # -> Tag the messages as handed over locally, so intra-process subscribers ignore their redis copy
+        if self.intra_process:
+            metadata["intra_process_id"] = intra_process_manager.process_id
+
+        # -> Tag the messages as sent through shared memory, so same-host subscribers ignore their redis copy
+        if self.shm:
+            metadata["shm_host"] = HOST
+
+        # -> Tag the messages as sent through the p2p socket, so connected subscribers ignore their redis copy
+        if self.p2p:
+            metadata["p2p"] = self.p2p_server.address
+
+        return metadata
+
+    def __build_msg(self, msg) -> dict:
+        timestamp = time.time_ns()
+
+        # -> Add message metadata
+        return {
+            "timestamp": timestamp / 1e9,
+            "timestamp_ns": timestamp,
+            "seq": next(self.__seq),
+            **self.metadata,
             "msg": msg
         }
 
-        return msg
+    def __check_announcements(self) -> None:
+        """
+        Invalidate the cached subscriber counts and filters if a subscriber of the topic announced a change
+        """
+
+        # (Another thread is already checking)
+        if not self.__announcements_lock.acquire(blocking=False):
+            return
+
+        try:
+            while self.__announcements.get_message(timeout=0.) is not None:
+                self.__redis_check_time = 0.
+                self.__filters_check_time = 0.
+        finally:
+            self.__announcements_lock.release()
+
+    def __has_redis_subscribers(self) -> bool:
+        """
+        Check whether subscribers only reachable through redis are listening to the topic.
+        The redis subscriber counts are refreshed when a subscriber of the topic announces itself, and otherwise
+        cached for Config.remote_check_period seconds (pattern subscriptions are only noticed then).
+        """
+
+        self.__check_announcements()
+
+        if time.monotonic() - self.__redis_check_time > Config.remote_check_period:
+            # -> Same-host shm subscribers listen to both the topic and the shm channel
+            if self.shm:
+                (_, topic_count), (_, shm_count) = self.backend.numsub(self.topic, self.shm_channel)
+            else:
+                (_, topic_count), = self.backend.numsub(self.topic)
+                shm_count = 0
+
+            self.__redis_subscribers_count = topic_count - shm_count
+
+            # -> Pattern subscribers are not counted per channel, and only read redis
+            self.__redis_pattern_subscribers = self.backend.numpat() > 0
+
+            self.__redis_check_time = time.monotonic()
+
+        if self.__redis_pattern_subscribers:
+            return True
+
+        count = self.__redis_subscribers_count
+
+        # -> Intra-process subscribers also listen to the topic for the publishers of other processes
+        #    (subscribers also reached through shm or p2p are already accounted for)
+        if self.intra_process:
+            count -= sum(1 for subscriber in intra_process_manager.get_subscribers(topic=self.topic)
+                         if not (self.shm and subscriber.shm) and not (self.p2p and subscriber.p2p))
+
+        # -> p2p subscribers also listen to the topic for the publishers not using p2p
+        if self.p2p:
+            return count > self.p2p_server.peer_count
+
+        return count > 0
+
+    def __is_wanted(self, msg) -> bool:
+        """
+        Check whether a subscriber of the topic wants a message, when every subscriber declared a content filter.
+        The filters and subscriber counts are refreshed when a subscriber of the topic announces a change, and otherwise
+        cached for Config.remote_check_period seconds.
+        Only direct publishers and publishers created once the topic is filtered check the filters.
+        """
+
+        if not self.__watching:
+            return True
+
+        self.__check_announcements()
+
+        if time.monotonic() - self.__filters_check_time > Config.remote_check_period:
+            filters = get_filters(backend=self.backend, topic=self.topic)
+
+            if filters:
+                (_, count), = self.backend.numsub(self.topic)
+
+                # -> Only skip messages if every subscriber filters them, pattern subscribers cannot be accounted for
+                if len(filters) < count or self.backend.numpat() > 0:
+                    filters = None
+
+            self.__subscriber_filters = filters or None
+            self.__filters_check_time = time.monotonic()
+
+        if self.__subscriber_filters is None:
+            return True
+
+        # (Fields only known once the message is built, such as seq, do not filter the message out)
+        fields = {**self.metadata, "topic": self.topic, "msg": msg}
+
+        return any(content_filter.match(raw_msg=fields, default=True) for content_filter in self.__subscriber_filters)
+
+    def __send(self, msg) -> None:
+        # -> Hand the message over to the subscribers of the same process
+        if self.intra_process:
+            intra_process_manager.publish(topic=self.topic, msg=msg)
+
+            # -> Skip serialising the message if every subscriber received it by reference
+            if not (self.shm or self.p2p) and not self.__has_redis_subscribers():
+                self.stats.sent += 1
+                return
+
+        # -> Serialise the message, the metadata is identified by the publisher number
+        payload = json.dumps(msg["msg"]).encode()
+        flags = 0
+
+        self.stats.sent += 1
+
+        # -> Compress large messages
+        if self.qos_profile.compression is not None and len(payload) > self.qos_profile.compression_threshold:
+            payload, flags = self.__compress_payload(payload=payload)
+
+        # -> Split large messages into chunks, so redis serves the other clients between them
+        if self.qos_profile.chunk_size is not None and len(payload) > self.qos_profile.chunk_size:
+            self.__send_chunks(chunks=pack_chunks(number=self.number,
+                                                  seq=msg["seq"],
+                                                  timestamp=msg["timestamp_ns"],
+                                                  payload=payload,
+                                                  chunk_size=self.qos_profile.chunk_size,
+                                                  flags=flags),
+                              seq=msg["seq"])
+            return
+
+        data = pack_message(number=self.number, seq=msg["seq"], timestamp=msg["timestamp_ns"], payload=payload, flags=flags)
+
+        self.stats.bytes_sent += len(data)
+
+        if self.batch_thread is not None:
+            self.__add_to_batch(data=data, seq=msg["seq"])
+        else:
+            self.__transmit(data=data, seqs=(msg["seq"], msg["seq"]))
+
+    def __transmit(self, data: bytes, seqs: tuple) -> None:
+        """
+        Send a serialised message or batch through the shared memory ring, the p2p socket and redis
+
+        :param seqs: The sequence numbers of the first and last messages of the data
+        """
+
+        # -> Write the message to the shared memory ring for the subscribers of the same host
+        if self.shm:
+            seq = self.shm_ring.write(data=data)
+
+            if seq is None:
+                # -> Send messages too large for a ring slot inline on the shm channel
+                self.backend.publish(self.shm_channel, data)
+            else:
+                # -> Notify the subscribers of the same host, with the messages they lose if the slot is overwritten first
+                self.backend.publish(self.shm_channel,
+                                     SHM_REF_PREFIX + f"{self.shm_ring.name}:{seq}:{self.number}:{seqs[0]}:{seqs[1]}".encode())
+
+        # -> Send the message to the subscribers connected to the p2p socket
+        if self.p2p:
+            self.p2p_server.send(data=data)
+
+        # -> Skip redis if every subscriber received the message directly
+        if (self.intra_process or self.shm or self.p2p) and not self.__has_redis_subscribers():
+            return
+
+        # -> Publish the message to the redis server for the remote subscribers
+        self.backend.publish(self.topic, data)
+
+    def __compress_payload(self, payload: bytes) -> tuple:
+        """
+        Compress a serialised message, keeping it uncompressed if compression does not make it smaller
+
+        :return: The payload and its header flags
+        """
+
+        start = time.thread_time()
+        compressed = self.__compress(payload)
+
+        stats = self.stats
+        stats.compression_time += time.thread_time() - start
+
+        if len(compressed) >= len(payload):
+            return payload, 0
+
+        stats.compressed += 1
+        stats.bytes_uncompressed += len(payload)
+        stats.bytes_compressed += len(compressed)
+
+        return compressed, FLAG_COMPRESSED
+
+    def __send_chunks(self, chunks: list, seq: int) -> None:
+        for chunk in chunks:
+            self.stats.bytes_sent += len(chunk)
+
+        # -> Chunks are never batched, so latest-only subscribers can tell them apart, send them after the pending batch
+        if self.batch_thread is not None:
+            with self.__batch_condition:
+                self.__flush_batch()
+
+                for chunk in chunks:
+                    self.__transmit(data=chunk, seqs=(seq, seq))
+
+        else:
+            for chunk in chunks:
+                self.__transmit(data=chunk, seqs=(seq, seq))
+
+    def __add_to_batch(self, data: bytes, seq: int) -> None:
+        with self.__batch_condition:
+            # -> Start the batch period with the first message
+            if not self.__batch:
+                self.__batch_deadline = time.monotonic() + self.qos_profile.batch_period
+                self.__batch_first_seq = seq
+                self.__batch_condition.notify()
+
+            self.__batch.append(data)
+            self.__batch_last_seq = seq
+            self.__batch_bytes += len(data)
+
+            # -> Send full batches right away
+            if len(self.__batch) >= self.qos_profile.batch_max_count or self.__batch_bytes >= self.qos_profile.batch_max_bytes:
+                self.__flush_batch()
+
+    def __flush_batch(self) -> None:
+        """
+        Send the pending batch, must be called with the batch condition held so batches are sent in order
+        """
+
+        if not self.__batch:
+            return
+
+        # -> Single messages are sent unframed
+        data = pack_batch(payloads=self.__batch) if len(self.__batch) > 1 else self.__batch[0]
+
+        self.__batch = []
+        self.__batch_bytes = 0
+
+        self.__transmit(data=data, seqs=(self.__batch_first_seq, self.__batch_last_seq))
+
+    def __batch_loop(self) -> None:
+        """
+        Send the pending batch once its period elapsed
+        """
+
+        with self.__batch_condition:
+            while self.__batching:
+                if not self.__batch:
+                    self.__batch_condition.wait()
+                    continue
+
+                remaining = self.__batch_deadline - time.monotonic()
+
+                if remaining > 0:
+                    self.__batch_condition.wait(timeout=remaining)
+                    continue
+
+                self.__flush_batch()
 
     def spin(self) -> None:
         """
         Publish the messages in the cache to the topic
         """
 
-        for msg in self.cache:
-            self.client.publish(self.topic, json.dumps(msg))
+        with self.__publish_lock:
+            for msg in self.cache:
+                self.__send(msg=msg)
 
-        # -> Clear the cache
-        self.cache = []
+            # -> Clear the cache
+            self.cache = []
 
     def publish(self,
                 msg,
@@ -80,100 +458,185 @@ class Publisher(Endpoint_abc):
         :param instant: Whether to publish the message instantly or to cache it
         """
 
-        # -> Add message metadata
-        msg = self.__build_msg(msg=msg)
+        # -> Skip the messages no subscriber wants, before they are numbered
+        if not self.__is_wanted(msg=msg):
+            self.stats.filtered += 1
+            return
 
-        # -> Publish the message
-        if direct:
-            self.client.publish(self.topic, json.dumps(msg))
+        # -> Enforce the rate limit, before the messages are numbered
+        if self.qos_profile.rate_limit is not None and not self.__take_token(msg=msg, direct=direct, instant=instant):
+            return
 
-        else:
-            # -> Add the msg to the cache of messages to publish
-            self.cache.append(msg)
+        self.__publish(msg=msg, direct=direct, instant=instant)
 
-            if instant:
-                self.spin()
+    def __publish(self, msg, direct: bool, instant: bool) -> None:
+        with self.__publish_lock:
+            # -> Add message metadata
+            msg = self.__build_msg(msg=msg)
 
-    def declare_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
-
-            # -> Declare the endpoint in the parent node
-            comm_graph[self.parent_address].append(
-                {"id": self.id,
-                 "type": "publisher",
-                 "msg_type": self.msg_type,
-                 "topic": self.topic}
-            )
-
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$",  comm_graph)
-
-            # ======================== Redis graph declaration
-            # -> Add edge in redis graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
-
-            # -> Check if topic node is in graph
-            query = "MATCH (n:topic {name: '%s'}) RETURN n" % (self.topic)
-            topic_node = redis_graph.query(query).result_set
-
-            # -> Get topic node
-            if len(topic_node) == 0:    # if it does not exist
-                # -> Create topic node
-                topic_node = Node(
-                    label="topic",
-                    properties={
-                        "name": self.topic,
-                        "pyROS_id": self.id,
-                        "msg_type": str(self.msg_type),
-                        "namespace": self.namespace
-                    }
-                )
-
-                # -> Add to graph
-                redis_graph.add_node(node=topic_node)
-                redis_graph.commit()
-
-            # -> Create relationship
-            edge_properties = "{" + f"namespace: '{self.namespace}', msg_type: '{str(self.msg_type)}', qos_profile: '{str(self.qos_profile)}'" + "}"
-
-            query = f"MATCH (p:node), (t:topic) WHERE p.name = '{self.parent_address}' AND t.name = '{self.topic}' CREATE (p)-[r:publish {edge_properties}]->(t) RETURN r"
-            redis_graph.query(query)
+            # -> Publish the message
+            if direct:
+                self.__send(msg=msg)
 
-    def destroy_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
+            else:
+                # -> Add the msg to the cache of messages to publish
+                self.cache.append(msg)
+
+                if instant:
+                    self.spin()
+
+    # ================================================================== Rate limit
+    def __refill(self) -> None:
+        now = time.monotonic()
 
-            # -> Undeclare the endpoint in the parent node
-            comm_graph[self.parent_address].remove(
-                {"id": self.id,
-                 "type": "publisher",
-                 "msg_type": self.msg_type,
-                 "topic": self.topic}
-            )
+        self.__tokens = min(float(self.qos_profile.rate_burst), self.__tokens + (now - self.__tokens_time) * self.qos_profile.rate_limit)
+        self.__tokens_time = now
 
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$",  comm_graph)
+    def __take_token(self, msg, direct: bool, instant: bool) -> bool:
+        """
+        Take a token from the bucket of the rate limit. Without token, the message is dropped,
+        or kept as the latest message to send once a token is available when coalescing.
+
+        :return: Whether the message can be sent
+        """
+
+        with self.__rate_lock:
+            self.__refill()
 
-            # ======================== Redis graph
-            # -> Get pubsub graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
+            # (Messages wait behind the coalesced message, to be sent in order)
+            if self.__tokens >= 1 and self.__pending is None:
+                self.__tokens -= 1
+                return True
 
-            # -> Delete relation
-            query = f"MATCH (p:node)-[r:publish]->(t:topic) WHERE p.name = '{self.parent_address}' AND t.name = '{self.topic}' DELETE r"
-            redis_graph.query(query)
+            self.stats.throttled += 1
 
-            # -> Delete topic if no relationships are left to topic
-            relations_count = 0
+            if self.qos_profile.rate_policy == COALESCE:
+                # -> Replace the message waiting for a token, which stays counted as throttled
+                self.__pending = (msg, direct, instant)
 
-            query = f"MATCH (p:node)-[r:publish]->(t:topic) WHERE t.name = '{self.topic}' RETURN COUNT(r)"
-            relations_count += redis_graph.query(query).result_set[0][0]
+                if self.__pending_timer is None:
+                    self.__pending_timer = Timer((1 - self.__tokens) / self.qos_profile.rate_limit, self.__publish_pending)
+                    self.__pending_timer.daemon = True
+                    self.__pending_timer.start()
+
+            return False
+
+    def __publish_pending(self) -> None:
+        """
+        Send the latest message coalesced while the rate limit was exceeded
+        """
 
-            query = f"MATCH (t:topic)-[r:subscribed]->(p:node) WHERE t.name = '{self.topic}' RETURN COUNT(r)"
-            relations_count += redis_graph.query(query).result_set[0][0]
+        with self.__rate_lock:
+            pending, self.__pending, self.__pending_timer = self.__pending, None, None
 
-            if relations_count == 0:
-                query = f"MATCH (t:topic) WHERE t.name = '{self.topic}' DELETE t"
-                redis_graph.query(query)
\ No newline at end of file
+            if pending is None:
+                return
+
+            self.__refill()
+            self.__tokens = max(0., self.__tokens - 1)
+
+            # -> The coalesced message is sent, it is no longer counted as throttled
+            self.stats.throttled -= 1
+
+            # -> Send it before releasing the rate limit, so the messages published meanwhile are sent after it
+            msg, direct, instant = pending
+            self.__publish(msg=msg, direct=direct, instant=instant)
+
+    def get_stats(self) -> dict:
+        return {
+            **Endpoint_abc.get_stats(self),
+            "topic": self.topic,
+            "backlog": len(self.cache),
+            "compression": self.stats.compression_snapshot()
+        }
+
+    def __comm_graph_entry(self) -> dict:
+        entry = {
+            "id": self.id,
+            "type": "publisher",
+            "msg_type": self.msg_type,
+            "topic": self.topic,
+            "number": self.number
+        }
+
+        # -> Advertise the shared memory ring of the publisher
+        if self.shm:
+            entry["shm"] = {"name": self.shm_ring.name, "host": HOST}
+
+        # -> Advertise the p2p socket of the publisher
+        if self.p2p:
+            entry["p2p"] = {"address": self.p2p_server.address, "host": HOST}
+
+        return entry
+
+    def declare_endpoint(self) -> None:
+        # -> Register the metadata of the messages of the publisher
+        self.metadata = self.get_metadata()
+        self.backend.set(key=get_publisher_key(number=self.number), value=json.dumps(self.metadata))
+
+        self.backend.declare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            labels=["topic"],
+            properties={
+                "name": self.topic,
+                "pyROS_id": self.id,
+                "msg_type": str(self.msg_type),
+                "namespace": self.namespace
+            },
+            relation="publish",
+            relation_properties={
+                "namespace": self.namespace,
+                "msg_type": str(self.msg_type),
+                "qos_profile": str(self.qos_profile)
+            },
+            outgoing=True
+        )
+
+        # -> Announce the p2p socket to the subscribers already listening
+        if self.p2p:
+            self.backend.publish(get_p2p_channel(topic=self.topic), json.dumps(self.__comm_graph_entry()))
+
+    def destroy_endpoint(self) -> None:
+        # -> Send the coalesced message
+        if self.qos_profile.rate_limit is not None:
+            with self.__rate_lock:
+                timer = self.__pending_timer
+
+            if timer is not None:
+                timer.cancel()
+                self.__publish_pending()
+
+        # -> Send the pending batch and stop the batch thread
+        if self.batch_thread is not None:
+            with self.__batch_condition:
+                self.__flush_batch()
+                self.__batching = False
+                self.__batch_condition.notify()
+
+            self.batch_thread.join()
+
+        self.backend.delete(key=get_publisher_key(number=self.number))
+
+        if self.__announcements is not None:
+            self.__announcements.close()
+
+        self.backend.undeclare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            label="topic",
+            name=self.topic,
+            relation="publish",
+            outgoing=True
+        )
+
+        # -> Release the shared memory ring, once the subscribers of the same host were told to detach from it
+        if self.shm:
+            self.backend.publish(self.shm_channel, SHM_CLOSE_PREFIX + self.shm_ring.name.encode())
+            self.shm_ring.close()
+
+        # -> Close the p2p socket
+        if self.p2p:
+            self.p2p_server.close()
@@ -29,6 +29,9 @@ class Publisher_module:
                          topic: str,
                          manual_spin: bool = False,
                          qos_profile=None,
+                         intra_process: bool = None,
+                         shm: bool = None,
+                         p2p: bool = None,
                          callback_group: MutuallyExclusiveCallbackGroup or ReentrantCallbackGroup = None
                          ) -> Publisher:
         """
@@ -37,17 +40,37 @@ class Publisher_module:
         :param msg_type: The type of the message to be published
         :param topic: The topic to publish to
         :param qos_profile: The QoS profile to use
+        :param intra_process: Whether to hand messages over by reference to the subscribers of the same process. If None, the node setting is used.
+        :param shm: Whether to write messages to a shared memory ring read by the subscribers of the same host. If None, the node setting is used.
+        :param p2p: Whether to send messages directly to the subscribers connected to the publisher's socket. If None, the node setting is used.
         :param callback_group: The callback group for the publisher. If None, use the default publisher callback group is used.
         """
 
+        # -> If intra process is not specified, use the node setting
+        if intra_process is None:
+            intra_process = self.intra_process_comms
+
+        # -> If shm is not specified, use the node setting
+        if shm is None:
+            shm = self.shm_comms
+
+        # -> If p2p is not specified, use the node setting
+        if p2p is None:
+            p2p = self.p2p_comms
+
         # -> Create a publisher for the given topic
         new_publisher = Publisher(
             msg_type=msg_type,
             topic=topic,
             qos_profile=qos_profile,
             manual_spin=manual_spin,
+            intra_process=intra_process,
+            shm=shm,
+            p2p=p2p,
             parent_node_ref=self.ref,
-            namespace=self.namespace
+            namespace=self.namespace,
+            backend=self.endpoints_backend,
+            connection=self.connection
         )
 
         # -> If not callback group is given, use the default publisher callback group
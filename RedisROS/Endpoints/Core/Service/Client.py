@@ -0,0 +1,282 @@
+import itertools
+import json
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, TimeoutError
+from threading import Thread, Lock as ThreadLock
+
+from ..Endpoint_abc import Endpoint_abc
+from RedisROS.Backends.Backend_abc import Backend_abc
+
+# -> Time (s) the reader thread waits for a response before checking whether it should stop
+READER_POLL_TIMEOUT = 0.05
+
+
+class Service_unavailable(Exception):
+    """
+    Raised by the calls made while no service answers the service name
+    """
+    pass
+
+
+class Service_error(Exception):
+    """
+    Raised by the calls whose service callback crashed
+    """
+    pass
+
+
+class Client(Endpoint_abc):
+    def __init__(self,
+                 srv_type,
+                 name: str,
+                 parent_node_ref: str = None,
+                 namespace: str = "",
+                 manual_spin: bool = False,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
+                 ) -> None:
+        """
+        Create a client endpoint calling the service of the given service name.
+        Every request is tagged with an id and the reply channel of the client, whose responses are read by a dedicated
+        thread and matched to the futures of the pending calls.
+
+        :param srv_type: The type of the service
+        :param name: The name of the service
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
+
+        :param parent_node_ref: The reference of the parent node
+        """
+
+        # -> Setup endpoint
+        Endpoint_abc.__init__(self,
+                              parent_node_ref=parent_node_ref,
+                              namespace=namespace,
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
+                              )
+
+        # -> Initialise the client properties
+        self.srv_type = srv_type
+        self.name = self.get_topic(topic_elements=[name])
+
+        # -> Identify the client across processes (endpoint ids are only unique within a process),
+        #    so no other client shares its reply channel or its request ids
+        self.client_id = uuid.uuid4().hex
+        self.reply_channel = self.get_topic(topic_elements=[name, "replies", self.client_id])
+
+        # -> Initialise the pending calls, as (future, send time) pairs by request id
+        self.pending = {}
+        self.__pending_lock = ThreadLock()
+        self.__ids = itertools.count(1)
+
+        # -> Setup the client's pubsub connection, drained by the reader thread
+        self.pubsub = self.backend.pubsub()
+        self.pubsub.subscribe(**{self.reply_channel: self.__reply_callback})
+
+        self.__reading = True
+        self.reader_thread = Thread(target=self.__read_loop, daemon=True)
+        self.reader_thread.start()
+
+        # -> Declare the endpoint in the comm graph
+        self.declare_endpoint()
+
+    def __str__(self):
+        return f"{self.parent_node_ref} - Client ({self.id}) of {self.name}"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def spin(self) -> None:
+        """
+        Responses are read as they arrive, the client does not need to be spun
+        """
+        pass
+
+    def __read_loop(self) -> None:
+        while self.__reading:
+            try:
+                self.pubsub.get_message(timeout=READER_POLL_TIMEOUT)
+            except Exception:
+                if not self.__reading:
+                    break
+
+                traceback.print_exc()
+                time.sleep(READER_POLL_TIMEOUT)
+
+    def __reply_callback(self, message) -> None:
+        """
+        Complete the future of the call a response answers
+        """
+
+        data = message["data"]
+        reply = json.loads(data)
+
+        with self.__pending_lock:
+            pending = self.pending.pop(reply["id"], None)
+
+        # -> Late responses of cancelled or timed out calls, or responses of other instances of the service
+        if pending is None:
+            return
+
+        future, sent = pending
+
+        stats = self.stats
+        stats.received += 1
+        stats.bytes_received += len(data)
+        stats.latency.record(time.perf_counter() - sent)
+
+        if "error" in reply:
+            future.set_exception(Service_error(f"Service {self.name} failed: {reply['error']}"))
+        else:
+            future.set_result(reply["response"])
+
+    def call_async(self, request) -> Future:
+        """
+        Send a request to the service
+
+        :param request: The request, must be JSON serializable
+        :return: The future of the response
+        """
+
+        request_id = f"{self.client_id}:{next(self.__ids)}"
+
+        # (Calls cannot be cancelled once sent, late responses are ignored)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        future.request_id = request_id
+
+        data = json.dumps({
+            "id": request_id,
+            "reply_to": self.reply_channel,
+            "timestamp": time.time(),
+            "request": request
+        })
+
+        # (Registered before sending, as the response may arrive before publish returns)
+        with self.__pending_lock:
+            self.pending[request_id] = (future, time.perf_counter())
+
+        if not self.backend.publish(self.name, data):
+            with self.__pending_lock:
+                self.pending.pop(request_id, None)
+
+            future.set_exception(Service_unavailable(f"No service answers {self.name}"))
+            return future
+
+        stats = self.stats
+        stats.sent += 1
+        stats.bytes_sent += len(data)
+
+        return future
+
+    def call(self, request, timeout: float = None):
+        """
+        Send a request to the service and wait for its response
+
+        :param request: The request, must be JSON serializable
+        :param timeout: The time (s) to wait for the response. If None, waits indefinitely.
+        :return: The response
+        :raises Service_unavailable: If no service answers the service name
+        :raises Service_error: If the service callback crashed
+        :raises TimeoutError: If no response was received in time
+        """
+
+        future = self.call_async(request=request)
+
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # -> Forget the call, its response is ignored if it arrives later
+            with self.__pending_lock:
+                self.pending.pop(future.request_id, None)
+
+            self.stats.lost += 1
+            raise
+
+    def service_is_ready(self) -> bool:
+        """
+        Check whether a service answers the service name
+        """
+        return any(count > 0 for _, count in self.backend.numsub(self.name))
+
+    def wait_for_service(self, timeout_sec: float = None, period: float = 0.1) -> bool:
+        """
+        Wait for a service to answer the service name
+
+        :param timeout_sec: The time (s) to wait for. If None, waits indefinitely.
+        :param period: The period (s) at which the service is checked
+        :return: Whether a service is ready
+        """
+
+        deadline = None if timeout_sec is None else time.monotonic() + timeout_sec
+
+        while not self.service_is_ready():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+
+            time.sleep(period)
+
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            **Endpoint_abc.get_stats(self),
+            "service": self.name,
+            "pending": len(self.pending)
+        }
+
+    def __comm_graph_entry(self) -> dict:
+        return {
+            "id": self.id,
+            "type": "client",
+            "srv_type": self.srv_type,
+            "service": self.name
+        }
+
+    def declare_endpoint(self) -> None:
+        self.backend.declare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            labels=["service"],
+            properties={
+                "name": self.name,
+                "pyROS_id": self.id,
+                "srv_type": str(self.srv_type),
+                "namespace": self.namespace
+            },
+            relation="call",
+            relation_properties={
+                "namespace": self.namespace,
+                "srv_type": str(self.srv_type)
+            },
+            outgoing=True
+        )
+
+    def destroy_endpoint(self) -> None:
+        self.__reading = False
+        self.reader_thread.join()
+
+        self.pubsub.unsubscribe()
+
+        # -> Fail the calls left pending
+        with self.__pending_lock:
+            pending, self.pending = self.pending, {}
+
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(Service_unavailable(f"Client of {self.name} destroyed"))
+
+        self.backend.undeclare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            label="service",
+            name=self.name,
+            relation="call",
+            outgoing=True
+        )
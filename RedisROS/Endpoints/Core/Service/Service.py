@@ -0,0 +1,225 @@
+import json
+import time
+import traceback
+from concurrent.futures import wait
+from threading import Thread, Lock as ThreadLock
+
+from ..Endpoint_abc import Endpoint_abc
+from RedisROS.Callback_groups import CallbackGroup, ReentrantCallbackGroup
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS.Tracing import tracer
+
+# -> Time (s) the reader thread waits for a request before checking whether it should stop
+READER_POLL_TIMEOUT = 0.05
+
+
+class Service(Endpoint_abc):
+    def __init__(self,
+                 srv_type,
+                 name: str,
+                 callback,
+                 parent_node_ref: str = None,
+                 namespace: str = "",
+                 manual_spin: bool = False,
+                 callback_group: CallbackGroup = None,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
+                 ) -> None:
+        """
+        Create a service endpoint answering the requests of the clients of the given service name.
+        Service names are global like topics, the namespace only scopes the comm graph.
+        Requests are read by a dedicated thread and handled by the callback group of the service (in parallel in a
+        reentrant group, one at a time in a mutually exclusive group), and every response is sent on the reply channel
+        of the client, tagged with the id of its request.
+
+        :param srv_type: The type of the service
+        :param name: The name of the service, a ValueError is raised if another service already answers it
+        :param callback: The callback function called with every request, returning the response
+        :param callback_group: The callback group handling the requests. If None, a reentrant group is created.
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
+
+        :param parent_node_ref: The reference of the parent node
+        """
+
+        # -> Setup endpoint
+        Endpoint_abc.__init__(self,
+                              parent_node_ref=parent_node_ref,
+                              namespace=namespace,
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
+                              )
+
+        # -> Initialise the service properties
+        self.srv_type = srv_type
+        self.name = self.get_topic(topic_elements=[name])
+        self.callback = callback
+        self.callback_group = callback_group if callback_group is not None else ReentrantCallbackGroup(name=f"Service {self.name}")
+
+        # -> Initialise the requests being handled, waited for when the service is destroyed
+        self.pending = set()
+        self.__pending_lock = ThreadLock()
+
+        # -> Setup the service's pubsub connection, drained by the reader thread
+        self.pubsub = self.backend.pubsub()
+
+        # -> Two services answering the same name would both reply to every request
+        with self.backend.lock(name=f"{self.name}/~service"):
+            if any(count > 0 for _, count in self.backend.numsub(self.name)):
+                self.pubsub.close()
+                raise ValueError(f"Service {self.name} is already served")
+
+            self.pubsub.subscribe(**{self.name: self.__request_callback})
+
+        self.__reading = True
+        self.reader_thread = Thread(target=self.__read_loop, daemon=True)
+        self.reader_thread.start()
+
+        # -> Declare the endpoint in the comm graph
+        self.declare_endpoint()
+
+    def __str__(self):
+        return f"{self.parent_node_ref} - Service ({self.id}) {self.name}"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def spin(self) -> None:
+        """
+        Requests are handled as they arrive, the service does not need to be spun
+        """
+        pass
+
+    def __read_loop(self) -> None:
+        while self.__reading:
+            try:
+                self.pubsub.get_message(timeout=READER_POLL_TIMEOUT)
+            except Exception:
+                if not self.__reading:
+                    break
+
+                traceback.print_exc()
+                time.sleep(READER_POLL_TIMEOUT)
+
+    def __request_callback(self, message: dict) -> None:
+        future = self.callback_group.submit(self.__handle, message["data"], time.perf_counter())
+
+        with self.__pending_lock:
+            self.pending.add(future)
+
+        future.add_done_callback(self.__handled)
+
+    def __handled(self, future) -> None:
+        with self.__pending_lock:
+            self.pending.discard(future)
+
+    def __handle(self, data: bytes, submitted: float) -> None:
+        """
+        Call the service's callback function with a request and send the response to the client
+
+        :param data: The serialised request
+        :param submitted: The time.perf_counter() time the request was queued at
+        """
+
+        stats = self.stats
+        stats.received += 1
+        stats.bytes_received += len(data)
+
+        request = json.loads(data)
+        stats.latency.record(time.time() - request["timestamp"])
+
+        reply = {"id": request["id"]}
+        start = time.perf_counter()
+
+        try:
+            if tracer.active:
+                reply["response"] = tracer.call(name=f"Service {self.name}",
+                                                function=self.callback,
+                                                args=(request["request"],),
+                                                category="service",
+                                                submitted=submitted,
+                                                msg_id=f"{request['reply_to']}:{request['id']}")
+            else:
+                reply["response"] = self.callback(request["request"])
+        except Exception as e:
+            stats.callback_errors += 1
+
+            # -> Fail the call of the client instead of leaving it waiting
+            reply["error"] = f"{type(e).__name__}: {e}"
+
+            print("=============================================================")
+            print(f"ERROR:: {self.parent_address}: Service {self.name} callback crashed")
+            print("-------------------------------------------------------------")
+            traceback.print_exc()
+            print("=============================================================")
+
+        stats.callbacks += 1
+        stats.callback_duration.record(time.perf_counter() - start)
+
+        try:
+            data = json.dumps(reply)
+        except TypeError as e:
+            stats.callback_errors += 1
+            data = json.dumps({"id": request["id"], "error": f"Response is not JSON serializable: {e}"})
+
+        self.backend.publish(request["reply_to"], data)
+
+        stats.sent += 1
+        stats.bytes_sent += len(data)
+
+    def get_stats(self) -> dict:
+        return {
+            **Endpoint_abc.get_stats(self),
+            "service": self.name
+        }
+
+    def __comm_graph_entry(self) -> dict:
+        return {
+            "id": self.id,
+            "type": "service",
+            "srv_type": self.srv_type,
+            "service": self.name
+        }
+
+    def declare_endpoint(self) -> None:
+        self.backend.declare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            labels=["service"],
+            properties={
+                "name": self.name,
+                "pyROS_id": self.id,
+                "srv_type": str(self.srv_type),
+                "namespace": self.namespace
+            },
+            relation="serve",
+            relation_properties={
+                "namespace": self.namespace,
+                "srv_type": str(self.srv_type)
+            },
+            outgoing=True
+        )
+
+    def destroy_endpoint(self) -> None:
+        # -> Stop reading requests, and answer the requests already received
+        self.__reading = False
+        self.reader_thread.join()
+
+        self.pubsub.unsubscribe()
+
+        with self.__pending_lock:
+            pending = list(self.pending)
+
+        wait(pending)
+
+        self.backend.undeclare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            label="service",
+            name=self.name,
+            relation="serve",
+            outgoing=True
+        )
@@ -0,0 +1,137 @@
+from RedisROS.Endpoints import Service, Client
+from RedisROS.Callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
+
+
+class Service_module:
+    def __init__(self):
+        pass
+
+    @property
+    def services(self):
+        """
+        Get services that have been created on this node in every callback groups.
+        """
+        # -> Get all the services in every callback group
+        services = []
+
+        for callback_group in self.callbackgroups.values():
+            for callback in callback_group.callbacks:
+                if isinstance(callback, Service):
+                    services.append(callback)
+
+        # -> Return the list of services
+        return services
+
+    @property
+    def clients(self):
+        """
+        Get clients that have been created on this node in every callback groups.
+        """
+        # -> Get all the clients in every callback group
+        clients = []
+
+        for callback_group in self.callbackgroups.values():
+            for callback in callback_group.callbacks:
+                if isinstance(callback, Client):
+                    clients.append(callback)
+
+        # -> Return the list of clients
+        return clients
+
+    # ----------------- Factory
+    def create_service(self,
+                       srv_type,
+                       srv_name: str,
+                       callback,
+                       callback_group: MutuallyExclusiveCallbackGroup or ReentrantCallbackGroup = None
+                       ) -> Service:
+        """
+        Create a service answering the requests sent to the given service name.
+        The callback is called with every request in the callback group of the service, and returns the response:
+        requests are handled in parallel in a reentrant group, one at a time in a mutually exclusive group.
+
+        :param srv_type: The type of the service
+        :param srv_name: The name of the service, a ValueError is raised if another service already answers it
+        :param callback: The callback function called with every request, returning the response
+        :param callback_group: The callback group for the service. If None, the default service callback group is used.
+        """
+
+        # -> If not callback group is given, use the default service callback group
+        if callback_group is None:
+            callback_group = self.callbackgroups["default_service_callback_group"]
+
+        # -> Create a service for the given service name
+        new_service = Service(
+            srv_type=srv_type,
+            name=srv_name,
+            callback=callback,
+            callback_group=callback_group,
+            parent_node_ref=self.ref,
+            namespace=self.namespace,
+            backend=self.endpoints_backend,
+            connection=self.connection
+        )
+
+        callback_group.add_callback(new_service)
+
+        # -> Return the service object
+        return new_service
+
+    def create_client(self,
+                      srv_type,
+                      srv_name: str,
+                      callback_group: MutuallyExclusiveCallbackGroup or ReentrantCallbackGroup = None
+                      ) -> Client:
+        """
+        Create a client of the given service name
+
+        :param srv_type: The type of the service
+        :param srv_name: The name of the service
+        :param callback_group: The callback group for the client. If None, the default service callback group is used.
+        """
+
+        # -> Create a client for the given service name
+        new_client = Client(
+            srv_type=srv_type,
+            name=srv_name,
+            parent_node_ref=self.ref,
+            namespace=self.namespace,
+            backend=self.endpoints_backend,
+            connection=self.connection
+        )
+
+        # -> If not callback group is given, use the default service callback group
+        if callback_group is None:
+            self.callbackgroups["default_service_callback_group"].add_callback(new_client)
+        else:
+            callback_group.add_callback(new_client)
+
+        # -> Return the client object
+        return new_client
+
+    # ----------------- Destroyer
+    def destroy_service(self, service: Service) -> None:
+        """
+        Destroy the given service.
+        """
+        # -> Destroy service endpoint
+        service.destroy_endpoint()
+
+        # -> Remove the service from its callback group
+        for callback_group in self.callbackgroups.values():
+            if callback_group.has_entity(service):
+                callback_group.remove_callback(service)
+                break
+
+    def destroy_client(self, client: Client) -> None:
+        """
+        Destroy the given client.
+        """
+        # -> Destroy client endpoint
+        client.destroy_endpoint()
+
+        # -> Remove the client from its callback group
+        for callback_group in self.callbackgroups.values():
+            if callback_group.has_entity(client):
+                callback_group.remove_callback(client)
+                break
@@ -0,0 +1,3 @@
+# from .Service import Service
+# from .Client import Client
+# from .Service_module import Service_module
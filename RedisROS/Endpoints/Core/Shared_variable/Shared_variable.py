@@ -2,10 +2,8 @@ import warnings
 from datetime import datetime
 import json
 
-from redis.commands.graph import Graph, Edge, Node
-from redis_lock import Lock
-
 from ..Endpoint_abc import Endpoint_abc
+from RedisROS.Backends.Backend_abc import Backend_abc
 
 
 class Shared_variable(Endpoint_abc):
@@ -17,7 +15,10 @@ class Shared_variable(Endpoint_abc):
                  descriptor: str = "",
                  ignore_override: bool = False,
                  parent_node_ref: str = None,
-                 namespace: str = ""
+                 namespace: str = "",
+                 manual_spin: bool = False,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
                  ) -> None:
         """
         Create a iteration2 shared_variable endpoint
@@ -28,6 +29,8 @@ class Shared_variable(Endpoint_abc):
         :param variable_type: The type of the shared_variable, must be JSON serializable
         :param descriptor: A description of the shared_variable
         :param ignore_override: If True, ignore any existing shared_variables with the same name.
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
 
         :param parent_node_ref: The reference of the parent node
         """
@@ -35,7 +38,11 @@ class Shared_variable(Endpoint_abc):
         # -> Setup endpoint
         Endpoint_abc.__init__(self,
                               parent_node_ref=parent_node_ref,
-                              namespace=namespace)
+                              namespace=namespace,
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
+                              )
 
         # -> Initialise the shared_variable properties
         self.scope = scope
@@ -52,9 +59,9 @@ class Shared_variable(Endpoint_abc):
         self.__cached_value = None  # Raw value format
 
         # -> Check whether the shared_variable exists
-        if not self.client.exists(self.name) or ignore_override:
+        if not self.backend.exists(key=self.name) or ignore_override:
             # -> Update the shared_variable shared value
-            self.client.set(self.name, json.dumps(self.__raw_value))
+            self.__write(raw_value=self.__raw_value)
 
         # -> Perform initial spin to get the value if shared_variable already exists
         self.spin()
@@ -86,24 +93,43 @@ class Shared_variable(Endpoint_abc):
 
     @property
     def shared_value(self):
-        raw_value = self.client.get(self.name)
+        raw_value = self.backend.get(key=self.name)
+
+        self.stats.received += 1
+        self.stats.bytes_received += len(raw_value)
+
         raw_value = json.loads(raw_value)
 
         return raw_value
 
+    def __write(self, raw_value: dict) -> None:
+        """
+        Write a raw value to the shared_variable shared value
+        """
+
+        data = json.dumps(raw_value)
+
+        self.stats.sent += 1
+        self.stats.bytes_sent += len(data)
+
+        self.backend.set(key=self.name, value=data)
+
     def spin(self, non_blocking: bool = False) -> None:
         """
         Update the value of the shared_variable to the latest value
         """
 
         def spin_logic():
+            # -> Read the shared value once
+            shared_value = self.shared_value
+
             # ----- Update the shared value
             if self.__cached_value is not None:
 
                 # -> Update the shared value with the cached value if the cached value is newer than the shared value
-                if float(self.__cached_value["timestamp"]) > float(self.shared_value["timestamp"]):
+                if float(self.__cached_value["timestamp"]) > float(shared_value["timestamp"]):
                     # -> Update the shared_variable shared value
-                    self.client.set(self.name, json.dumps(self.__cached_value))
+                    self.__write(raw_value=self.__cached_value)
 
                     # -> Set local value to cached value
                     self.__raw_value = self.__cached_value
@@ -121,17 +147,17 @@ class Shared_variable(Endpoint_abc):
                     self.__cached_value = None
 
             # ----- Set local value to shared value
-            self.__raw_value = self.shared_value
-            self.__value = self.shared_value["value"]
+            self.__raw_value = shared_value
+            self.__value = shared_value["value"]
 
         # -> Get local client lock
         if non_blocking:
             spin_logic()
 
         else:
-            with Lock(redis_client=self.client, name=self.id):
+            with self.backend.lock(name=self.id):
                 # -> Get shared value lock
-                with Lock(redis_client=self.client, name=self.name):
+                with self.backend.lock(name=self.name):
                     spin_logic()
 
     def get_value(self, spin: bool = True, non_blocking: bool = False):
@@ -203,7 +229,7 @@ class Shared_variable(Endpoint_abc):
 
         if direct:
             # -> Update the shared_variable value
-            self.client.set(name=self.name, value=json.dumps(new_value))
+            self.__write(raw_value=new_value)
 
             # -> Cache the cache value
             self.__cached_value = None
@@ -240,8 +266,8 @@ class Shared_variable(Endpoint_abc):
                     f"Trying to set a value of incorrect type to {self.name} shared_variable, expected bool, got {type(value)}")
                 return self
 
-        with Lock(redis_client=self.client, name=self.id):
-            with Lock(redis_client=self.client, name=self.name):
+        with self.backend.lock(name=self.id):
+            with self.backend.lock(name=self.name):
                 # -> Get current value
                 current_value = self.get_value(
                     spin=True,  # Spin the shared_variable to get the latest value
@@ -257,87 +283,52 @@ class Shared_variable(Endpoint_abc):
         # -> Return self
         return self
 
-    def declare_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
-
-            # -> Declare the endpoint in the parent node
-            comm_graph[self.parent_address].append(
-                {"id": self.id,
-                 "type": "shared_variable",
-                 "name": self.name,
-                 "scope": self.scope,
-                 "variable_type": self.variable_type,
-                 "descriptor": self.descriptor}
-            )
-
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$", comm_graph)
-
-            # ======================== Redis graph declaration
-            # -> Add edge in redis graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
-
-            # -> Check if topic node is in graph
-            query = "MATCH (n:shared_variable {name: '%s'}) RETURN n" % (self.node_name)
-            topic_node = redis_graph.query(query).result_set
-
-            if len(topic_node) == 0:  # if it does not exist
-                # -> Create topic node
-                topic_node = Node(
-                    label=["shared_variable", self.scope],
-                    properties={
-                        "name": self.node_name,
-                        "scope": self.scope,
-                        "variable_type": self.variable_type,
-                        "descriptor": self.descriptor,
-                        "pyROS_id": self.id,
-                        "namespace": self.namespace
-                    }
-                )
-
-                # -> Add to graph
-                redis_graph.add_node(node=topic_node)
-                redis_graph.commit()
+    def get_stats(self) -> dict:
+        return {
+            **Endpoint_abc.get_stats(self),
+            "name": self.name,
+            "scope": self.scope
+        }
 
-            # -> Create relationship
-            edge_properties = "{" + f"namespace: '{self.namespace}', variable_type: '{str(self.variable_type)}'" + "}"
+    def __comm_graph_entry(self) -> dict:
+        return {
+            "id": self.id,
+            "type": "shared_variable",
+            "name": self.name,
+            "scope": self.scope,
+            "variable_type": self.variable_type,
+            "descriptor": self.descriptor
+        }
 
-            query = f"MATCH (p:node), (v:shared_variable) WHERE p.name = '{self.parent_address}' AND v.name = '{self.node_name}' CREATE (p)-[r:uses {edge_properties}] -> (v) RETURN r"
-            redis_graph.query(query)
+    def declare_endpoint(self) -> None:
+        self.backend.declare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            labels=["shared_variable", self.scope],
+            properties={
+                "name": self.node_name,
+                "scope": self.scope,
+                "variable_type": self.variable_type,
+                "descriptor": self.descriptor,
+                "pyROS_id": self.id,
+                "namespace": self.namespace
+            },
+            relation="uses",
+            relation_properties={
+                "namespace": self.namespace,
+                "variable_type": str(self.variable_type)
+            },
+            outgoing=True
+        )
 
     def destroy_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
-
-            # -> Undeclare the endpoint in the parent node
-            comm_graph[self.parent_address].remove(
-                {"id": self.id,
-                 "type": "shared_variable",
-                 "name": self.name,
-                 "scope": self.scope,
-                 "variable_type": self.variable_type,
-                 "descriptor": self.descriptor}
-            )
-
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$", comm_graph)
-
-            # ======================== Redis graph
-            # -> Get pubsub graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
-
-            # -> Delete relation
-            query = f"MATCH (p:node)-[r:uses]->(v:shared_variable) WHERE p.name = '{self.parent_address}' AND v.name = '{self.node_name}' DELETE r"
-            redis_graph.query(query)
-
-            # -> Delete shared variable node if no relationships are left to it
-            query = f"MATCH (p:node)-[r:uses]->(v:shared_variable) WHERE v.name = '{self.node_name}' RETURN COUNT(r)"
-            relations_count = redis_graph.query(query).result_set[0][0]
-
-            if relations_count == 0:
-                query = f"MATCH (v:shared_variable) WHERE v.name = '{self.node_name}' DELETE v"
-                redis_graph.query(query)
-
+        self.backend.undeclare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            label="shared_variable",
+            name=self.node_name,
+            relation="uses",
+            outgoing=True
+        )
@@ -64,7 +64,9 @@ class Shared_variable_module:
             ignore_override=ignore_override,
             manual_spin=manual_spin,
             parent_node_ref=self.ref,
-            namespace=self.namespace
+            namespace=self.namespace,
+            backend=self.endpoints_backend,
+            connection=self.connection
             )
 
         # -> Add the shared_variable to the default shared_variable callback group
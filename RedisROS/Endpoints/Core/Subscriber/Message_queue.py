@@ -0,0 +1,163 @@
+from collections import deque
+from threading import Condition, Lock as ThreadLock
+
+from RedisROS.QoS import DROP_OLDEST, DROP_NEWEST, BLOCK, overflow_policies
+
+
+class Message_queue:
+    def __init__(self,
+                 depth: int = None,
+                 overflow_policy: str = DROP_OLDEST,
+                 block_timeout: float = 1.,
+                 on_drop=None
+                 ) -> None:
+        """
+        Thread-safe FIFO of the messages received by a subscriber and waiting to be dispatched
+
+        :param depth: The maximum number of queued messages. If None, the queue is unbounded.
+        :param overflow_policy: "drop_oldest", "drop_newest" or "block" (see QoS_profile)
+        :param block_timeout: The maximum time (s) put waits for room with the "block" policy
+        :param on_drop: Function called with no argument every time a message is dropped
+        """
+
+        if overflow_policy not in overflow_policies:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}, must be one of {overflow_policies}")
+
+        self.depth = depth
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.on_drop = on_drop
+
+        self.items = deque()
+        self.condition = Condition(ThreadLock())
+
+        # -> Depth gauges
+        self.high_watermark = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __drop(self) -> None:
+        self.dropped += 1
+
+        if self.on_drop is not None:
+            self.on_drop()
+
+    def put(self, item) -> bool:
+        """
+        Queue an item, applying the overflow policy if the queue is full
+
+        :return: Whether the item was queued
+        """
+
+        with self.condition:
+            if self.depth is not None and len(self.items) >= self.depth:
+                if self.overflow_policy == BLOCK:
+                    if not self.condition.wait_for(lambda: len(self.items) < self.depth, timeout=self.block_timeout):
+                        self.__drop()
+                        return False
+
+                elif self.overflow_policy == DROP_NEWEST:
+                    self.__drop()
+                    return False
+
+                else:
+                    self.items.popleft()
+                    self.__drop()
+
+            self.items.append(item)
+
+            if len(self.items) > self.high_watermark:
+                self.high_watermark = len(self.items)
+
+            return True
+
+    def get(self):
+        """
+        Get the oldest queued item without waiting
+
+        :return: The item, None if the queue is empty
+        """
+
+        with self.condition:
+            if not self.items:
+                return None
+
+            item = self.items.popleft()
+
+            # -> Wake up a producer waiting for room
+            if self.overflow_policy == BLOCK:
+                self.condition.notify()
+
+            return item
+
+    def clear(self) -> None:
+        with self.condition:
+            self.items.clear()
+            self.condition.notify_all()
+
+
+class Conflating_queue:
+    def __init__(self, key=None) -> None:
+        """
+        Thread-safe latest-only queue: a new item replaces the queued item with the same key,
+        and items are returned in the order their latest version arrived.
+        Replaced items are never processed, so they do not need to be decoded.
+
+        :param key: Function giving the key of an item, items with a None key are never replaced.
+                    If None, every item has the same key.
+        """
+
+        self.key = key
+        self.items = {}
+        self.lock = ThreadLock()
+
+        # -> Depth gauges
+        self.high_watermark = 0
+        self.dropped = 0
+        self.conflated = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def put(self, item) -> bool:
+        """
+        Queue an item, replacing the queued item with the same key
+
+        :return: Whether the item was queued (always True)
+        """
+
+        key = self.key(item) if self.key is not None else 0
+
+        if key is None:
+            key = object()
+
+        with self.lock:
+            # -> Remove the replaced item so the key moves to the end of the arrival order
+            if self.items.pop(key, None) is not None:
+                self.conflated += 1
+
+            self.items[key] = item
+
+            if len(self.items) > self.high_watermark:
+                self.high_watermark = len(self.items)
+
+            return True
+
+    def get(self):
+        """
+        Get the item whose latest version arrived first, without waiting
+
+        :return: The item, None if the queue is empty
+        """
+
+        with self.lock:
+            if not self.items:
+                return None
+
+            return self.items.pop(next(iter(self.items)))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
@@ -1,10 +1,28 @@
 import json
+import time
 import traceback
-
-from redis.commands.graph import Graph, Edge, Node
-from redis_lock import Lock
+import uuid
+from threading import Thread, Event, Lock as ThreadLock, local
 
 from ..Endpoint_abc import Endpoint_abc
+from .Message_queue import Message_queue, Conflating_queue
+from RedisROS.QoS import QoS_profile
+from RedisROS.Content_filter import Content_filter, register_filter, unregister_filter
+from RedisROS.Transports.Intra_process_manager import intra_process_manager
+from RedisROS.Transports.Shm_ring_buffer import Shm_ring_buffer, get_shm_channel, SHM_REF_PREFIX, SHM_CLOSE_PREFIX, HOST
+from RedisROS.Transports.Socket_transport import Socket_client, get_p2p_channel
+from RedisROS.Transports.Batch_framing import is_batch, unpack_batch
+from RedisROS.Transports.Message_framing import is_message, unpack_message, is_chunk, unpack_chunk, get_publisher_key, get_subscribers_channel, FLAG_CHUNK, FLAG_COMPRESSED
+from RedisROS.Transports.Codecs import get_codec
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS.Tracing import tracer
+from RedisROS import Config
+
+# -> Time (s) the reader thread waits for a redis message before checking whether it should stop
+READER_POLL_TIMEOUT = 0.05
+
+# -> Number of large messages reassembled at once, the oldest incomplete message is discarded beyond it
+MAX_PARTIAL_MESSAGES = 16
 
 
 class Subscriber(Endpoint_abc):
@@ -12,10 +30,18 @@ class Subscriber(Endpoint_abc):
                  topic: str,
                  callback,
                  msg_type: str = "Unspecified",
-                 qos_profile=None,
+                 qos_profile: QoS_profile = None,
                  parent_node_ref: str = None,
                  namespace: str = "",
-                 manual_spin: bool = False
+                 manual_spin: bool = False,
+                 intra_process: bool = False,
+                 shm: bool = False,
+                 p2p: bool = False,
+                 pattern: bool = False,
+                 content_filter: Content_filter or list or dict = None,
+                 deadline_callback=None,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
                  ) -> None:
         """
         Create a subscriber endpoint for the given topic
@@ -23,7 +49,20 @@ class Subscriber(Endpoint_abc):
         :param msg_type: The type of the message to be published
         :param topic: The topic to publish to
         :param callback: The callback function to call when a message is received
-        :param qos_profile: The QoS profile to use
+        :param qos_profile: The QoS profile to use. If None, the default QoS_profile (unbounded queue) is used.
+        :param intra_process: Whether to receive messages by reference from the publishers of the same process
+        :param shm: Whether to read the messages of same-host publishers from their shared memory ring
+        :param p2p: Whether to connect directly to the sockets of the p2p publishers
+        :param pattern: Whether the topic is a glob-style pattern (*, ?, [...]), subscribing to every matching topic
+                        through a single connection. Messages are received through redis only, and their topic is
+                        passed to the callbacks accepting a second argument.
+        :param content_filter: The filter (or its conditions, see Content_filter) the messages must pass to be dispatched.
+                               Envelope conditions are checked before decoding the messages, and the publishers skip
+                               the messages filtered out by every subscriber of the topic.
+        :param deadline_callback: The function called from the deadline thread with every missed deadline of the QoS profile,
+                                  with the event {"topic", "total_count", "silence"}
+        :param backend: The communication backend name or instance. If None, Config.backend is used.
+        :param connection: The redis connection settings, overriding the Config and environment settings
 
         :param parent_node_ref: The reference of the parent node
         """
@@ -32,26 +71,143 @@ class Subscriber(Endpoint_abc):
         self.msg_type = msg_type
         self.topic = self.get_topic(topic_elements=[topic])
         self.callback = callback
-        self.qos_profile = qos_profile
+        self.qos_profile = qos_profile if qos_profile is not None else QoS_profile()
+        self.pattern = pattern
+
+        if content_filter is not None and not isinstance(content_filter, Content_filter):
+            content_filter = Content_filter(conditions=content_filter)
+
+        self.content_filter = content_filter
+
+        # -> Direct transports are discovered per topic, pattern subscriptions read redis only
+        self.intra_process = intra_process and not pattern
+        self.shm = shm and not pattern
+        self.p2p = p2p and not pattern
+
+        # -> Initialise the queue of received messages waiting to be dispatched,
+        #    as (handler, message, time.perf_counter() time queued at) items
+        if self.qos_profile.conflate:
+            # -> Keep the latest message of every source (handler)
+            self.queue = Conflating_queue(key=self.__conflation_key)
+            self.__latest_timestamps = {}       # topic (None for a single topic) -> timestamp
+        else:
+            self.queue = Message_queue(
+                depth=self.qos_profile.depth,
+                overflow_policy=self.qos_profile.overflow_policy,
+                block_timeout=self.qos_profile.block_timeout,
+                on_drop=self.__on_drop
+            )
+
+        # -> Bounded and conflating queues are filled from the redis connection by a reader thread
+        self.reader_thread = None
+        self.__reading = self.qos_profile.depth is not None or self.qos_profile.conflate
+
+        # -> Initialise the callback lock
+        self.__callback_lock = ThreadLock()
+
+        # -> Initialise the time the message being handled by a spinning thread was queued at, for the trace of its queue wait
+        self.__spin_state = local()
+
+        # -> Initialise the cache of the metadata of the publishers, by publisher number
+        self.publishers_metadata = {}
+
+        # -> Initialise the last sequence number received from every publisher, by publisher id
+        self.sequences = {}
+
+        # -> Initialise the large messages being reassembled, by (publisher number, sequence number)
+        self.partial_messages = {}
+
+        # -> Initialise the downsampling state, by topic (None for a single topic)
+        self.__received_counts = {}
+        self.__dispatch_times = {}
+
+        # -> Setup the deadline monitor, counting the periods elapsed without a message being dispatched
+        self.deadline_callback = deadline_callback
+        self.deadline_thread = None
+        self.__last_dispatch_time = time.monotonic()
+
+        if self.qos_profile.deadline is not None:
+            self.__deadline_stop = Event()
+            self.deadline_thread = Thread(target=self.__deadline_loop, daemon=True)
+
+        # -> Setup the renewal of the content filter registration, which expires if the subscriber crashes
+        #    (registered under an id unique across processes, endpoint ids are only unique within a process)
+        self.filter_thread = None
+
+        if self.content_filter is not None and not self.pattern:
+            self.filter_id = uuid.uuid4().hex
+            self.__filter_stop = Event()
+            self.filter_thread = Thread(target=self.__filter_loop, daemon=True)
 
         # -> Setup endpoint
         Endpoint_abc.__init__(self,
                               parent_node_ref=parent_node_ref,
                               namespace=namespace,
-                              manual_spin=manual_spin
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
                               )
 
         # -> Setup the subscriber's pubsub connection
-        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub = self.backend.pubsub()
+
+        # -> Subscribe to the topic, or to the topics matching the pattern
+        if self.pattern:
+            self.pubsub.psubscribe(**{self.topic: self.__queued(handler=self.__callback)})
+        else:
+            self.pubsub.subscribe(**{self.topic: self.__queued(handler=self.__callback)})
+
+        # -> Subscribe to the notifications of the same-host shm publishers
+        if self.shm:
+            self.shm_channel = get_shm_channel(topic=self.topic, host=HOST)
+            self.shm_rings = {}
+
+            self.pubsub.subscribe(**{self.shm_channel: self.__queued(handler=self.__shm_callback)})
 
-        # -> Subscribe to the topic
-        self.pubsub.subscribe(**{self.topic: self.__callback})
+        # -> Listen for p2p publishers announcements, and connect to the p2p publishers already declared
+        if self.p2p:
+            self.p2p_connections = {}
+
+            # -> Sequence number of the first message received through every connection, and the last sequence number
+            #    received through redis before it: the messages sent before connecting only come through redis
+            self.p2p_first_seqs = {}
+            self.p2p_redis_seqs = {}
+
+            self.pubsub.subscribe(**{get_p2p_channel(topic=self.topic): self.__p2p_callback})
+
+            for endpoints in self.backend.get_comm_graph(comm_graph=self.comm_graph).values():
+                for endpoint in endpoints:
+                    if endpoint["type"] == "publisher" and endpoint["topic"] == self.topic:
+                        self.__p2p_connect(publisher_entry=endpoint)
+
+        # -> Register the subscriber as an intra-process recipient of the topic
+        if self.intra_process:
+            intra_process_manager.register_subscriber(topic=self.topic, subscriber=self)
+
+        # -> Start draining the redis connection into the bounded queue
+        if self.__reading:
+            self.reader_thread = Thread(target=self.__read_loop, daemon=True)
+            self.reader_thread.start()
+
+        # -> Start monitoring the deadline once subscribed
+        if self.deadline_thread is not None:
+            self.__last_dispatch_time = time.monotonic()
+            self.deadline_thread.start()
+
+        # -> Let the publishers of the topic skip the messages filtered out
+        if self.filter_thread is not None:
+            register_filter(backend=self.backend, topic=self.topic, filter_id=self.filter_id, content_filter=self.content_filter)
+            self.filter_thread.start()
+
+        # -> Let the publishers of the topic refresh their view of the subscribers
+        if not self.pattern:
+            self.backend.publish(get_subscribers_channel(topic=self.topic), self.id)
 
         # -> Declare the endpoint in the comm graph
         self.declare_endpoint()
 
     def __str__(self):
-        return f"{self.parent_node_ref} - Subscriber ({self.id}) to {self.topic}"
+        return f"{self.parent_node_ref} - Subscriber ({self.id}) to {self.topic}{' (pattern)' if self.pattern else ''}"
 
     def __repr__(self):
         return self.__str__()
@@ -62,115 +218,766 @@ class Subscriber(Endpoint_abc):
         and call the subscriber's callback function
         """
 
-        self.pubsub.get_message()
+        # -> Dispatch the messages queued before the spin
+        for _ in range(len(self.queue)):
+            item = self.queue.get()
 
-    def __callback(self, raw_msg):
+            if item is None:
+                break
+
+            handler, msg, self.__spin_state.submitted = item
+            handler(msg)
+
+        # -> Read a message from the redis connection, if not drained by the reader thread (not queued, no queue wait)
+        if self.reader_thread is None:
+            self.__spin_state.submitted = None
+            self.pubsub.get_message()
+
+    def __queued(self, handler):
         """
-        Call the subscriber's callback function
+        Get the pubsub handler of a channel: the handler itself when the redis connection is read when spinning,
+        or a function queueing the messages for the handler when it is drained by the reader thread
         """
 
-        with Lock(redis_client=self.client, name=self.id):
-            # -> Convert raw message to dictionary
-            raw_msg = json.loads(raw_msg["data"])
+        if not self.__reading:
+            return handler
 
-            # -> Call the subscriber's callback function
-            # Attempt to provide both message and msg meta in callback
+        return lambda message: self.queue.put((handler, message, time.perf_counter()))
+
+    @staticmethod
+    def __conflation_key(item):
+        """
+        Conflate the messages by source (handler) and topic, except the chunks of large messages which are all needed
+        """
+
+        handler, message, _ = item
+
+        # (p2p frames are bytes, redis messages dictionaries, intra-process messages are never chunked)
+        data = message if isinstance(message, bytes) else message.get("data")
+
+        if isinstance(data, bytes) and is_chunk(data):
+            return None
+
+        # -> The topics matching a pattern are conflated separately
+        if isinstance(message, dict) and message.get("type") == "pmessage":
+            return handler, message["channel"]
+
+        return handler
+
+    def __read_loop(self) -> None:
+        """
+        Drain the redis connection into the bounded queue, applying the overflow policy
+        """
+
+        while self.__reading:
             try:
-                try:
-                    self.callback(raw_msg["msg"], raw_msg)
-                # Only provide msg
-                except TypeError:
-                    self.callback(raw_msg["msg"])
+                self.pubsub.get_message(timeout=READER_POLL_TIMEOUT)
+            except Exception:
+                if not self.__reading:
+                    break
+
+                traceback.print_exc()
+                time.sleep(READER_POLL_TIMEOUT)
+
+    def __on_drop(self) -> None:
+        self.stats.dropped += 1
+
+    def hand_over(self, msg: dict) -> None:
+        """
+        Queue a message handed over by reference by an intra-process publisher
+        """
+
+        if self.content_filter is not None and not self.content_filter.match(raw_msg={**msg, "topic": self.topic}):
+            self.stats.filtered += 1
+            self.__skip(publisher_id=msg["publisher_id"], seq=msg.get("seq"))
+            return
+
+        if self.__is_throttled(topic=None):
+            self.stats.throttled += 1
+            self.__skip(publisher_id=msg["publisher_id"], seq=msg.get("seq"))
+            return
+
+        self.queue.put((self.__dispatch_handed_over, msg, time.perf_counter()))
+
+    def __dispatch_handed_over(self, msg: dict) -> None:
+        """
+        Dispatch a message handed over by an intra-process publisher, unless it expired while queued
+        """
+
+        if "lifespan" in msg and self.__is_expired(metadata=msg, timestamp=msg["timestamp_ns"]):
+            self.stats.expired += 1
+            self.__skip(publisher_id=msg["publisher_id"], seq=msg.get("seq"))
+            return
+
+        self.__dispatch(raw_msg=msg)
+
+    def __skip(self, publisher_id: str, seq: int = None) -> None:
+        """
+        Skip a message filtered out, throttled or expired, following the sequence of its publisher so it is not counted as lost
+        """
+
+        if seq is not None and not self.qos_profile.conflate:
+            with self.__callback_lock:
+                self.__check_sequence(publisher_id=publisher_id, seq=seq)
+
+    def __get_publisher_metadata(self, number: int) -> dict:
+        """
+        Get the metadata registered by a publisher, cached on first use
+        """
+
+        metadata = self.backend.get(key=get_publisher_key(number=number))
+
+        # -> The publisher was destroyed before its message was read
+        if metadata is None:
+            return {"msg_type": "Unspecified", "parent_node_ref": None, "publisher_id": None}
+
+        metadata = self.publishers_metadata[number] = json.loads(metadata)
+
+        return metadata
+
+    def __reassemble(self, key: tuple, chunk: bytes) -> bytearray or None:
+        """
+        Copy a chunk into the large message it belongs to
+
+        :param key: The publisher number and sequence number of the message
+        :return: The serialised message once every chunk was received, None otherwise
+        """
+
+        offset, total, data = unpack_chunk(chunk)
+
+        partial = self.partial_messages.get(key)
+
+        if partial is None:
+            # -> Discard the oldest incomplete message, its missing chunks were lost
+            if len(self.partial_messages) >= MAX_PARTIAL_MESSAGES:
+                del self.partial_messages[next(iter(self.partial_messages))]
+                self.stats.dropped += 1
+
+            partial = self.partial_messages[key] = [bytearray(total), 0]
+
+        partial[0][offset: offset + len(data)] = data
+        partial[1] += len(data)
+
+        if partial[1] < total:
+            return None
+
+        del self.partial_messages[key]
+
+        return partial[0]
+
+    def __is_duplicate(self, metadata: dict, redis_copy: bool, seq: int = None, p2p_copy: bool = False) -> bool:
+        """
+        Check whether a message was already received through a faster transport
+
+        :param metadata: The metadata of the message
+        :param redis_copy: Whether the message was received from the redis topic
+        :param seq: The sequence number of the message
+        :param p2p_copy: Whether the message was received from a p2p connection
+        """
+
+        # -> Messages handed over by an intra-process publisher
+        if self.intra_process and metadata.get("intra_process_id") == intra_process_manager.process_id:
+            return True
+
+        # -> Messages already received through redis before the p2p connection delivered its first message
+        if p2p_copy:
+            address = metadata.get("p2p")
+
+            if address not in self.p2p_first_seqs:
+                self.p2p_first_seqs[address] = seq
+
+            return seq is not None and seq <= self.p2p_redis_seqs.get(address, 0)
+
+        if not redis_copy:
+            return False
+
+        # -> Redis copy of messages already read from a same-host shared memory ring
+        if self.shm and metadata.get("shm_host") == HOST:
+            return True
+
+        # -> Redis copy of messages already received from a connected p2p publisher
+        if self.p2p and metadata.get("p2p") in self.p2p_connections:
+            address = metadata["p2p"]
+            first_seq = self.p2p_first_seqs.get(address)
+
+            # (Until the connection delivers a message, the messages are received through redis)
+            if first_seq is None:
+                if seq is not None:
+                    self.p2p_redis_seqs[address] = max(seq, self.p2p_redis_seqs.get(address, 0))
+                return False
+
+            return seq is None or seq >= first_seq
+
+        return False
+
+    def __unpack(self, data: bytes, redis_copy: bool = False, topic: str = None, p2p_copy: bool = False) -> tuple or None:
+        """
+        Convert a serialised message to a dictionary, restoring the metadata of its publisher
+
+        :param redis_copy: Whether the message was received from the redis topic
+        :param topic: The topic the message was received from, if matching the pattern of the subscriber
+        :param p2p_copy: Whether the message was received from a p2p connection
+        :return: The message and its serialised size, None for duplicates, the messages filtered out
+                 and the chunks of an incomplete large message
+        """
+
+        content_filter = self.content_filter
+
+        # (Messages without header carry their metadata)
+        if not is_message(data):
+            raw_msg = json.loads(str(data, "utf-8") if isinstance(data, memoryview) else data)
+
+            if self.__is_duplicate(metadata=raw_msg, redis_copy=redis_copy, seq=raw_msg.get("seq"), p2p_copy=p2p_copy):
+                return None
+
+            if "lifespan" in raw_msg and self.__is_expired(metadata=raw_msg, timestamp=raw_msg.get("timestamp_ns", raw_msg["timestamp"] * 1e9)):
+                self.stats.expired += 1
+                self.__skip(publisher_id=raw_msg.get("publisher_id"), seq=raw_msg.get("seq"))
+                return None
+
+            if content_filter is not None and not content_filter.match(raw_msg={**raw_msg, "topic": topic or self.topic}):
+                self.stats.filtered += 1
+                self.__skip(publisher_id=raw_msg.get("publisher_id"), seq=raw_msg.get("seq"))
+                return None
+
+            if self.__is_throttled(topic=topic):
+                self.stats.throttled += 1
+                self.__skip(publisher_id=raw_msg.get("publisher_id"), seq=raw_msg.get("seq"))
+                return None
+
+            return raw_msg, len(data)
+
+        flags, number, seq, timestamp, payload = unpack_message(data)
+
+        metadata = self.publishers_metadata.get(number)
+
+        if metadata is None:
+            metadata = self.__get_publisher_metadata(number=number)
+
+        # -> Skip duplicates before decoding them
+        if self.__is_duplicate(metadata=metadata, redis_copy=redis_copy, seq=seq, p2p_copy=p2p_copy):
+            return None
+
+        # -> Skip the messages filtered out on their envelope before decoding them
+        if content_filter is not None and content_filter.envelope_conditions:
+            envelope = {**metadata, "seq": seq, "timestamp": timestamp / 1e9, "topic": topic or self.topic}
+
+            if not content_filter.match_envelope(envelope=envelope):
+                # (The sequence is followed on the first chunk of large messages only)
+                if not flags & FLAG_CHUNK or unpack_chunk(payload)[0] == 0:
+                    self.stats.filtered += 1
+                    self.__skip(publisher_id=metadata["publisher_id"], seq=seq)
+
+                return None
+
+        if flags & FLAG_CHUNK:
+            payload = self.__reassemble(key=(number, seq), chunk=payload)
+
+            if payload is None:
+                return None
+
+        size = len(payload) if flags & FLAG_CHUNK else len(data)
+
+        # -> Drop the expired messages before decoding them
+        if "lifespan" in metadata and self.__is_expired(metadata=metadata, timestamp=timestamp):
+            self.stats.expired += 1
+            self.__skip(publisher_id=metadata["publisher_id"], seq=seq)
+            return None
+
+        # -> Downsample before decoding
+        if self.__is_throttled(topic=topic):
+            self.stats.throttled += 1
+            self.__skip(publisher_id=metadata["publisher_id"], seq=seq)
+            return None
+
+        if flags & FLAG_COMPRESSED:
+            payload = self.__decompress(codec=metadata.get("codec"), payload=payload)
+
+            if payload is None:
+                return None
+
+        raw_msg = {
+            "timestamp": timestamp / 1e9,
+            "timestamp_ns": timestamp,
+            "seq": seq,
+            **metadata,
+            "msg": json.loads(str(payload, "utf-8") if isinstance(payload, memoryview) else payload)
+        }
+
+        # -> Skip the messages filtered out on their payload before dispatching them
+        if content_filter is not None and content_filter.payload_conditions and not content_filter.match_payload(raw_msg=raw_msg):
+            self.stats.filtered += 1
+            self.__skip(publisher_id=metadata["publisher_id"], seq=seq)
+            return None
+
+        return raw_msg, size
+
+    @staticmethod
+    def __is_expired(metadata: dict, timestamp: int) -> bool:
+        """
+        Check whether the lifespan declared by the publisher of a message elapsed
+
+        :param timestamp: The publish time (ns) of the message
+        """
+        return time.time_ns() - timestamp > metadata["lifespan"] * 1e9
+
+    def __deadline_loop(self) -> None:
+        """
+        Count a missed deadline for every deadline elapsed without a message being dispatched
+        """
+
+        deadline = self.qos_profile.deadline
+        checkpoint = self.__last_dispatch_time
+
+        while True:
+            start = max(checkpoint, self.__last_dispatch_time)
+            remaining = start + deadline - time.monotonic()
+
+            if remaining > 0:
+                if self.__deadline_stop.wait(timeout=remaining):
+                    return
+                continue
+
+            checkpoint = start + deadline
+            self.stats.deadline_missed += 1
+
+            if self.deadline_callback is None:
+                continue
+
+            try:
+                self.deadline_callback({
+                    "topic": self.topic,
+                    "total_count": self.stats.deadline_missed,
+                    "silence": time.monotonic() - self.__last_dispatch_time
+                })
             except:
                 print("=============================================================")
-                print(f"ERROR:: {self.parent_address}: Subscriber to {self.topic} callback crashed")
+                print(f"ERROR:: {self.parent_address}: Subscriber to {self.topic} deadline callback crashed")
                 print("-------------------------------------------------------------")
                 traceback.print_exc()
                 print("=============================================================")
 
-    def declare_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
-
-            # -> Declare the endpoint in the parent node
-            comm_graph[self.parent_address].append(
-                {"id": self.id,
-                 "type": "subscriber",
-                 "msg_type": self.msg_type,
-                 "topic": self.topic}
-            )
+    def __filter_loop(self) -> None:
+        """
+        Renew the content filter registration before its lease expires
+        """
+
+        while not self.__filter_stop.wait(timeout=Config.filter_lease / 3):
+            try:
+                register_filter(backend=self.backend, topic=self.topic, filter_id=self.filter_id, content_filter=self.content_filter)
+            except:
+                print(f"ERROR:: {self.parent_address}: Subscriber to {self.topic} failed to renew its content filter")
+                traceback.print_exc()
 
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$",  comm_graph)
+    def __is_throttled(self, topic: str = None) -> bool:
+        """
+        Check whether a message is skipped to keep every keep_every-th message, or to stay under max_rate
 
-            # ======================== Redis graph
-            # -> Add edge in redis graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
+        :param topic: The topic of the message, if matching the pattern of the subscriber
+        """
 
-            # -> Check if topic node is in graph
-            query = "MATCH (n:topic {name: '%s'}) RETURN n" % (self.topic)
-            topic_node = redis_graph.query(query).result_set
+        qos_profile = self.qos_profile
 
-            # -> Get topic node
-            if len(topic_node) == 0:    # if it does not exist
-                # -> Create topic node
-                topic_node = Node(
-                    label="topic",
-                    properties={
-                        "name": self.topic,
-                        "pyROS_id": self.id,
-                        "msg_type": str(self.msg_type),
-                        "namespace": self.namespace
-                    }
-                )
+        if qos_profile.keep_every is not None:
+            count = self.__received_counts.get(topic, 0)
+            self.__received_counts[topic] = count + 1
 
-                # -> Add to graph
-                redis_graph.add_node(node=topic_node)
-                redis_graph.commit()
+            if count % qos_profile.keep_every:
+                return True
 
-            # -> Create relationship
-            edge_properties = "{" + f"namespace: '{self.namespace}', msg_type: '{str(self.msg_type)}', qos_profile: '{str(self.qos_profile)}'" + "}"
+        if qos_profile.max_rate is not None:
+            now = time.monotonic()
 
-            query = f"MATCH (p:node), (t:topic) WHERE p.name = '{self.parent_address}' AND t.name = '{self.topic}' CREATE (t)-[r:subscribed {edge_properties}]->(p) RETURN r"
-            redis_graph.query(query)
+            if now - self.__dispatch_times.get(topic, float("-inf")) < 1 / qos_profile.max_rate:
+                return True
 
-    def destroy_endpoint(self) -> None:
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get the communication graph from the redis server
-            comm_graph = self.client.json().get(self.comm_graph)
-
-            # -> Undeclare the endpoint in the parent node
-            comm_graph[self.parent_address].remove(
-                {"id": self.id,
-                 "type": "subscriber",
-                 "msg_type": self.msg_type,
-                 "topic": self.topic}
+            self.__dispatch_times[topic] = now
+
+        return False
+
+    def __decompress(self, codec: str, payload: bytes) -> bytes or None:
+        """
+        Decompress a message compressed by its publisher
+
+        :return: The serialised message, None if the codec is not registered in the process
+        """
+
+        try:
+            _, decompress = get_codec(name=codec)
+        except ValueError:
+            self.stats.dropped += 1
+            return None
+
+        start = time.thread_time()
+        decompressed = decompress(payload)
+
+        stats = self.stats
+        stats.compression_time += time.thread_time() - start
+        stats.compressed += 1
+        stats.bytes_uncompressed += len(decompressed)
+        stats.bytes_compressed += len(payload)
+
+        return decompressed
+
+    def __decode(self, data: bytes, redis_copy: bool = False, topic: str = None, p2p_copy: bool = False) -> list:
+        """
+        Convert a serialised message or batch of messages to dictionaries
+
+        :param redis_copy: Whether the data was received from the redis topic
+        :param topic: The topic the data was received from, if matching the pattern of the subscriber
+        :param p2p_copy: Whether the data was received from a p2p connection
+        :return: The messages and their serialised sizes, as (raw_msg, size) pairs
+        """
+
+        payloads = unpack_batch(data) if is_batch(data) else [data]
+
+        # -> Only the latest message of a batch is delivered in latest-only mode
+        if self.qos_profile.conflate and len(payloads) > 1:
+            self.queue.conflated += len(payloads) - 1
+            payloads = payloads[-1:]
+
+        messages = []
+
+        for payload in payloads:
+            message = self.__unpack(payload, redis_copy=redis_copy, topic=topic, p2p_copy=p2p_copy)
+
+            if message is not None:
+                messages.append(message)
+
+        return messages
+
+    def __p2p_receive(self, data: bytes) -> None:
+        for raw_msg, size in self.__decode(data, p2p_copy=True):
+            self.__receive(raw_msg=raw_msg, size=size)
+
+    def __callback(self, raw_msg):
+        """
+        Convert a message received from redis and dispatch it
+        """
+
+        # -> Name the topic matching the pattern
+        topic = raw_msg["channel"].decode() if self.pattern else None
+
+        # -> Convert raw message to dictionary
+        for raw_msg, size in self.__decode(raw_msg["data"], redis_copy=True, topic=topic):
+            if topic is not None:
+                raw_msg["topic"] = topic
+
+            self.__receive(raw_msg=raw_msg, size=size)
+
+    def __p2p_callback(self, announcement):
+        """
+        Connect to a newly announced p2p publisher
+        """
+        self.__p2p_connect(publisher_entry=json.loads(announcement["data"]))
+
+    def __p2p_connect(self, publisher_entry: dict):
+        """
+        Connect to the socket of a p2p publisher
+
+        :param publisher_entry: The comm graph entry of the publisher
+        """
+
+        p2p = publisher_entry.get("p2p")
+
+        if p2p is None or p2p["address"] in self.p2p_connections:
+            return
+
+        # -> Unix sockets are only reachable from the same host
+        if p2p["address"].startswith("unix://") and p2p["host"] != HOST:
+            return
+
+        # -> Same-host shm publishers are read from shared memory instead
+        if self.shm and (publisher_entry.get("shm") or {}).get("host") == HOST:
+            return
+
+        try:
+            self.p2p_connections[p2p["address"]] = Socket_client(
+                address=p2p["address"],
+                on_frame=lambda data: self.queue.put((self.__p2p_receive, data, time.perf_counter())),
+                on_close=self.__p2p_disconnected
             )
+        except OSError:
+            # -> Fall back to redis if the publisher is unreachable
+            pass
 
-            # -> Unsubscribe the end point from the topic
-            self.pubsub.unsubscribe()
+    def __p2p_disconnected(self, address: str) -> None:
+        """
+        Forget a closed p2p connection, the messages of its publisher are received through redis again
+        """
+
+        self.p2p_connections.pop(address, None)
+        self.p2p_first_seqs.pop(address, None)
+        self.p2p_redis_seqs.pop(address, None)
 
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$",  comm_graph)
+    def __shm_callback(self, notification):
+        """
+        Read a message notified by a same-host shm publisher and dispatch it
+        """
+
+        data = notification["data"]
+
+        # -> Detach from the rings of the destroyed publishers
+        if data.startswith(SHM_CLOSE_PREFIX):
+            shm_ring = self.shm_rings.pop(data[len(SHM_CLOSE_PREFIX):].decode(), None)
+
+            if shm_ring is not None:
+                shm_ring.close()
+            return
+
+        # (Messages too large for the ring are sent inline)
+        if not data.startswith(SHM_REF_PREFIX):
+            for raw_msg, size in self.__decode(data):
+                self.__receive(raw_msg=raw_msg, size=size)
+            return
+
+        # -> Read the message from the shared memory ring referenced by the notification
+        name, seq, number, first_seq, last_seq = data[len(SHM_REF_PREFIX):].decode().split(":")
+        seq = int(seq)
+
+        # -> Attach to the ring of the publisher on first use
+        shm_ring = self.shm_rings.get(name)
+
+        if shm_ring is None:
+            try:
+                shm_ring = self.shm_rings[name] = Shm_ring_buffer(name=name, create=False)
+            except FileNotFoundError:
+                return
+
+        view = shm_ring.view(seq=seq)
+
+        # -> Decode the messages straight from the shared memory, then check the slot was not overwritten meanwhile
+        if view is not None:
+            try:
+                messages = self.__decode(view)
+            except Exception:
+                # (Overwritten content can fail to decode)
+                if shm_ring.is_valid(seq=seq):
+                    raise
+                messages = None
+            finally:
+                view.release()
+
+            if messages is not None and shm_ring.is_valid(seq=seq):
+                for raw_msg, size in messages:
+                    self.__receive(raw_msg=raw_msg, size=size)
+                return
+
+        self.__skip_overrun(number=int(number), first_seq=int(first_seq), last_seq=int(last_seq))
+
+    def __skip_overrun(self, number: int, first_seq: int, last_seq: int) -> None:
+        """
+        Count the messages of a ring slot overwritten before it could be read as lost,
+        following the sequence of their publisher so they are not counted again
+        """
+
+        # -> Latest-only subscribers skip messages by design
+        if self.qos_profile.conflate:
+            self.stats.dropped += 1
+            return
+
+        metadata = self.publishers_metadata.get(number)
+
+        if metadata is None:
+            metadata = self.__get_publisher_metadata(number=number)
+
+        publisher_id = metadata["publisher_id"]
+
+        with self.__callback_lock:
+            last = self.sequences.get(publisher_id)
+
+            if last is None:
+                self.stats.lost += last_seq - first_seq + 1
+            elif last_seq > last:
+                self.stats.lost += last_seq - last
+            else:
+                return
+
+            self.sequences[publisher_id] = last_seq
+
+    def __receive(self, raw_msg: dict, size: int = 0):
+        """
+        Dispatch a converted message
+
+        :param size: The size of the serialised message
+        """
+
+        self.stats.bytes_received += size
+
+        self.__dispatch(raw_msg=raw_msg)
+
+    def __invoke(self, raw_msg: dict):
+        # Attempt to provide both message and msg meta in callback
+        try:
+            self.callback(raw_msg["msg"], raw_msg)
+        # Only provide msg
+        except TypeError:
+            self.callback(raw_msg["msg"])
+
+    def __check_sequence(self, publisher_id: str, seq: int) -> None:
+        """
+        Count the messages skipped in the sequence of a publisher as lost, and the late messages as reordered
+        """
 
-            # ======================== Redis graph
-            # -> Get pubsub graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
+        last = self.sequences.get(publisher_id)
 
-            # -> Delete relation
-            query = f"MATCH (t:topic)-[r:subscribed]->(p:node) WHERE p.name = '{self.parent_address}' AND t.name = '{self.topic}' DELETE r"
-            redis_graph.query(query)
+        # -> The messages published before the first message received were not meant for the subscriber
+        if last is None or seq > last:
+            if last is not None:
+                self.stats.lost += seq - last - 1
 
-            # -> Delete topic if no relationships are left to topic
-            relations_count = 0
+            self.sequences[publisher_id] = seq
 
-            query = f"MATCH (p:node)-[r:publish]->(t:topic) WHERE t.name = '{self.topic}' RETURN COUNT(r)"
-            relations_count += redis_graph.query(query).result_set[0][0]
+        else:
+            # -> Late messages were counted as lost when the messages following them arrived
+            self.stats.reordered += 1
 
-            query = f"MATCH (t:topic)-[r:subscribed]->(p:node) WHERE t.name = '{self.topic}' RETURN COUNT(r)"
-            relations_count += redis_graph.query(query).result_set[0][0]
+            if self.stats.lost > 0:
+                self.stats.lost -= 1
+
+    def __dispatch(self, raw_msg: dict):
+        """
+        Call the subscriber's callback function
+        """
+
+        # -> Discard messages superseded by an already delivered message
+        if self.qos_profile.conflate:
+            topic = raw_msg.get("topic")
+
+            if raw_msg["timestamp"] < self.__latest_timestamps.get(topic, 0.):
+                self.queue.conflated += 1
+                return
+
+            self.__latest_timestamps[topic] = raw_msg["timestamp"]
+
+        stats = self.stats
+        stats.received += 1
+        stats.latency.record(time.time() - raw_msg["timestamp"])
+
+        if self.deadline_thread is not None:
+            self.__last_dispatch_time = time.monotonic()
+
+        with self.__callback_lock:
+            # -> Latest-only subscribers skip messages by design
+            if "seq" in raw_msg and not self.qos_profile.conflate:
+                self.__check_sequence(publisher_id=raw_msg["publisher_id"], seq=raw_msg["seq"])
+
+            start = time.perf_counter()
+
+            # -> Call the subscriber's callback function
+            try:
+                if tracer.active:
+                    tracer.call(name=f"Subscriber {self.topic}",
+                                function=self.__invoke,
+                                args=(raw_msg,),
+                                category="dispatch",
+                                submitted=getattr(self.__spin_state, "submitted", None),
+                                msg_id=f"{raw_msg['publisher_id']}:{raw_msg.get('seq', raw_msg['timestamp'])}")
+                else:
+                    self.__invoke(raw_msg=raw_msg)
+            except:
+                stats.callback_errors += 1
+
+                print("=============================================================")
+                print(f"ERROR:: {self.parent_address}: Subscriber to {self.topic} callback crashed")
+                print("-------------------------------------------------------------")
+                traceback.print_exc()
+                print("=============================================================")
+
+            stats.callbacks += 1
+            stats.callback_duration.record(time.perf_counter() - start)
+
+    def get_stats(self) -> dict:
+        stats = {
+            **Endpoint_abc.get_stats(self),
+            "topic": self.topic,
+            "backlog": len(self.queue),
+            "queue_high_watermark": self.queue.high_watermark,
+            "compression": self.stats.compression_snapshot()
+        }
+
+        if self.qos_profile.conflate:
+            stats["conflated"] = self.queue.conflated
+
+        return stats
+
+    def __comm_graph_entry(self) -> dict:
+        return {
+            "id": self.id,
+            "type": "subscriber",
+            "msg_type": self.msg_type,
+            "topic": self.topic,
+            "pattern": self.pattern
+        }
+
+    def declare_endpoint(self) -> None:
+        self.backend.declare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            labels=["topic_pattern" if self.pattern else "topic"],
+            properties={
+                "name": self.topic,
+                "pyROS_id": self.id,
+                "msg_type": str(self.msg_type),
+                "namespace": self.namespace
+            },
+            relation="subscribed",
+            relation_properties={
+                "namespace": self.namespace,
+                "msg_type": str(self.msg_type),
+                "qos_profile": str(self.qos_profile)
+            },
+            outgoing=False
+        )
+
+    def destroy_endpoint(self) -> None:
+        # -> Stop monitoring the deadline
+        if self.deadline_thread is not None:
+            self.__deadline_stop.set()
+            self.deadline_thread.join()
+
+        # -> Stop the reader thread before releasing the redis connection
+        if self.reader_thread is not None:
+            self.__reading = False
+            self.queue.clear()
+            self.reader_thread.join()
+
+        # -> Stop renewing the content filter, and unregister it
+        if self.filter_thread is not None:
+            self.__filter_stop.set()
+            self.filter_thread.join()
+
+            unregister_filter(backend=self.backend, topic=self.topic, filter_id=self.filter_id)
+
+        # -> Unsubscribe the end point from the topic
+        if self.pattern:
+            self.pubsub.punsubscribe()
+        else:
+            self.pubsub.unsubscribe()
 
-            if relations_count == 0:
-                query = f"MATCH (t:topic) WHERE t.name = '{self.topic}' DELETE t"
-                redis_graph.query(query)
\ No newline at end of file
+        if self.intra_process:
+            intra_process_manager.unregister_subscriber(topic=self.topic, subscriber=self)
+
+        # -> Detach from the shared memory rings
+        if self.shm:
+            for shm_ring in self.shm_rings.values():
+                shm_ring.close()
+
+        # -> Disconnect from the p2p publishers
+        if self.p2p:
+            for connection in list(self.p2p_connections.values()):
+                connection.close()
+
+        if not self.pattern:
+            self.backend.publish(get_subscribers_channel(topic=self.topic), self.id)
+
+        self.backend.undeclare_endpoint(
+            comm_graph=self.comm_graph,
+            parent_address=self.parent_address,
+            entry=self.__comm_graph_entry(),
+            label="topic_pattern" if self.pattern else "topic",
+            name=self.topic,
+            relation="subscribed",
+            outgoing=False
+        )
@@ -1,5 +1,6 @@
 from RedisROS.Endpoints import Subscriber
 from RedisROS.Callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
+from RedisROS.QoS import QoS_profile
 
 
 class Subscriber_module:
@@ -28,7 +29,13 @@ class Subscriber_module:
                             topic: str,
                             callback,
                             manual_spin: bool = False,
-                            qos_profile=None,
+                            qos_profile: QoS_profile = None,
+                            intra_process: bool = None,
+                            shm: bool = None,
+                            p2p: bool = None,
+                            pattern: bool = False,
+                            content_filter=None,
+                            deadline_callback=None,
                             callback_group: MutuallyExclusiveCallbackGroup or ReentrantCallbackGroup = None) -> Subscriber:
         """
         Create a subscription for the given topic.
@@ -37,10 +44,31 @@ class Subscriber_module:
         :param msg_type: The type of the message to be received.
         :param topic: The topic to subscribe to.
         :param callback: The callback function to call when a message is received.
-        :param qos_profile: The QoS profile to use.
+        :param qos_profile: The QoS profile to use (queue depth and overflow policy). If None, the default QoS_profile is used.
+        :param intra_process: Whether to receive messages by reference from the publishers of the same process. If None, the node setting is used.
+        :param shm: Whether to read the messages of same-host publishers from their shared memory ring. If None, the node setting is used.
+        :param p2p: Whether to connect directly to the sockets of the p2p publishers. If None, the node setting is used.
+        :param pattern: Whether the topic is a glob-style pattern (e.g. "/robot_*/pose"), subscribing to every matching topic
+                        through a single connection. The matching topic is passed to the callbacks as raw_msg["topic"].
+        :param content_filter: The filter (Content_filter, or its conditions) the messages must pass to be dispatched,
+                               e.g. [("msg.robot_id", "==", 3)]. The publishers skip the messages no subscriber wants.
+        :param deadline_callback: The function called with every missed deadline of the QoS profile, with the event
+                                  {"topic", "total_count", "silence"}
         :param callback_group: The callback group for the subscription. If None, the default callback group is used.
         """
 
+        # -> If intra process is not specified, use the node setting
+        if intra_process is None:
+            intra_process = self.intra_process_comms
+
+        # -> If shm is not specified, use the node setting
+        if shm is None:
+            shm = self.shm_comms
+
+        # -> If p2p is not specified, use the node setting
+        if p2p is None:
+            p2p = self.p2p_comms
+
         # -> Create a subscription for the given topic
         new_subscription = Subscriber(
             msg_type=msg_type,
@@ -49,7 +77,15 @@ class Subscriber_module:
             qos_profile=qos_profile,
             parent_node_ref=self.ref,
             namespace=self.namespace,
-            manual_spin=manual_spin
+            manual_spin=manual_spin,
+            intra_process=intra_process,
+            shm=shm,
+            p2p=p2p,
+            pattern=pattern,
+            content_filter=content_filter,
+            deadline_callback=deadline_callback,
+            backend=self.endpoints_backend,
+            connection=self.connection
         )
 
         # -> If not callback group is given, use the default publisher callback group
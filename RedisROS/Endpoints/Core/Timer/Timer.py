@@ -1,12 +1,9 @@
-import json
-from datetime import datetime
+import time
 import random
 import string
 
-from redis.commands.graph import Graph, Edge, Node
-from redis_lock import Lock
-
 from ..Endpoint_abc import Endpoint_abc
+from RedisROS.Backends.Backend_abc import Backend_abc
 
 
 class Timer(Endpoint_abc):
@@ -16,7 +13,9 @@ class Timer(Endpoint_abc):
                 ref: str = None,
                 parent_node_ref: str = None,
                 namespace: str = "",
-                 manual_spin: bool = False
+                manual_spin: bool = False,
+                backend: str or Backend_abc = None,
+                connection: dict = None
                 ):
 
         # -> Create a unique ID for the timer
@@ -33,7 +32,9 @@ class Timer(Endpoint_abc):
         Endpoint_abc.__init__(self,
                               parent_node_ref=parent_node_ref,
                               namespace=namespace,
-                              manual_spin=manual_spin
+                              manual_spin=manual_spin,
+                              backend=backend,
+                              connection=connection
                               )
 
         # TODO: Couple timer with run clock to ensure the desired timer_period is achieved
@@ -45,7 +46,24 @@ class Timer(Endpoint_abc):
         # if spin_rate > self.timer_period:
 
         # -> Call callback
-        self.callback()
+        start = time.perf_counter()
+
+        try:
+            self.callback()
+        except Exception:
+            self.stats.callback_errors += 1
+            raise
+
+        finally:
+            self.stats.callbacks += 1
+            self.stats.callback_duration.record(time.perf_counter() - start)
+
+    def get_stats(self) -> dict:
+        return {
+            **Endpoint_abc.get_stats(self),
+            "ref": self.ref,
+            "timer_period": self.timer_period
+        }
 
     # Placeholder methods
     def declare_endpoint(self) -> None:
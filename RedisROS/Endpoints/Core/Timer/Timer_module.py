@@ -42,7 +42,9 @@ class Timer_module:
             timer_period=timer_period_sec,
             callback=callback,
             manual_spin=manual_spin,
-            ref=ref
+            ref=ref,
+            backend=self.endpoints_backend,
+            connection=self.connection
             )
 
         # -> Add the timer to the node dictionary timers
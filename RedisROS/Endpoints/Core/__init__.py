@@ -4,8 +4,11 @@ from .Publisher.Publisher import Publisher
 from .Subscriber.Subscriber import Subscriber
 from .Shared_variable.Shared_variable import Shared_variable
 from .Timer.Timer import Timer
+from .Service.Service import Service
+from .Service.Client import Client, Service_unavailable, Service_error
 
 from .Endpoint_abc import Endpoint_abc
+from .Endpoint_stats import Endpoint_stats, Histogram
 
 # Import submodules
 
@@ -14,5 +17,11 @@ __all__ = [
     "Publisher",
     "Subscriber",
     "Shared_variable",
-    "Timer"
+    "Timer",
+    "Service",
+    "Client",
+    "Service_unavailable",
+    "Service_error",
+    "Endpoint_stats",
+    "Histogram"
 ]
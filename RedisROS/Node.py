@@ -5,11 +5,9 @@ import string
 import json
 import time
 
-from redis import Redis
-from redis.commands.graph import Graph, Edge
-from redis.commands.graph import Node as Redis_node
-
-from redis_lock import Lock
+from RedisROS import Config
+from RedisROS.Backends.Backend_abc import Backend_abc
+from RedisROS.Backends.Backend_factory import create_backend
 
 # -> Import endpoint modules
 # Core
@@ -17,6 +15,7 @@ from RedisROS.Endpoints.Core.Publisher.Publisher_module import Publisher_module
 from RedisROS.Endpoints.Core.Subscriber.Subscriber_module import Subscriber_module
 from RedisROS.Endpoints.Core.Shared_variable.Shared_variable_module import Shared_variable_module
 from RedisROS.Endpoints.Core.Timer.Timer_module import Timer_module
+from RedisROS.Endpoints.Core.Service.Service_module import Service_module
 
 # Custom
 
@@ -24,6 +23,7 @@ from RedisROS.Endpoints.Core.Timer.Timer_module import Timer_module
 from RedisROS.Endpoints import Publisher
 from RedisROS.Endpoints import Subscriber
 from RedisROS.Endpoints import Shared_variable
+from RedisROS.Endpoints import Service, Client
 from RedisROS.Async_timer import Async_timer
 from RedisROS.Callback_groups import ReentrantCallbackGroup, MutuallyExclusiveCallbackGroup
 
@@ -47,6 +47,7 @@ class Node(
     Subscriber_module,
     Shared_variable_module,
     Timer_module,
+    Service_module,
 
     # Custom
     # ROS_publisher_module,
@@ -55,10 +56,29 @@ class Node(
     def __init__(self,
                  ref: str = None,
                  namespace: str = "",
-                 labels: list = []
+                 labels: list = [],
+                 intra_process_comms: bool = None,
+                 shm_comms: bool = None,
+                 p2p_comms: bool = None,
+                 backend: str or Backend_abc = None,
+                 connection: dict = None
                  ) -> None:
-        # -> Setup endpoint redis connection
-        self.client = Redis()
+        """
+        Initialise the node
+
+        :param ref: The reference of the node
+        :param namespace: The namespace of the node
+        :param labels: The labels of the node in the redis graph
+        :param intra_process_comms: Whether endpoints of the node exchange messages by reference with endpoints of the same process. If None, the Config setting is used.
+        :param shm_comms: Whether endpoints of the node exchange messages through shared memory with endpoints of the same host. If None, the Config setting is used.
+        :param p2p_comms: Whether endpoints of the node exchange messages directly over sockets, using the backend for discovery only. If None, the Config setting is used.
+        :param backend: The communication backend name or instance, shared by the endpoints of the node if an instance is given. If None, Config.backend is used.
+        :param connection: The redis connection settings of the node and its endpoints (host, port, unix_socket_path, shards, ...), overriding the Config and environment settings
+        """
+        # -> Setup node backend connection
+        self.backend = create_backend(backend=backend, connection=connection)
+        self.endpoints_backend = backend
+        self.connection = connection
 
         # ---- Initialise the node
         # -> Set id
@@ -66,6 +86,24 @@ class Node(
         self.namespace = namespace
         self.labels = labels
 
+        # -> Set intra-process communications
+        if intra_process_comms is None:
+            intra_process_comms = Config.intra_process_comms
+
+        self.intra_process_comms = intra_process_comms
+
+        # -> Set shared memory communications
+        if shm_comms is None:
+            shm_comms = Config.shm_comms
+
+        self.shm_comms = shm_comms
+
+        # -> Set p2p communications
+        if p2p_comms is None:
+            p2p_comms = Config.p2p_comms
+
+        self.p2p_comms = p2p_comms
+
         # -> Get comm_graph
         self.comm_graph = "Comm_graph"
 
@@ -87,38 +125,17 @@ class Node(
         # -> Declare node
         self.declared_node = False
 
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            if not self.client.exists(self.comm_graph):
-                # -> Create comm_graph shared variable
-                self.client.json().set(self.comm_graph, "$", {f"{self.address}": []})
-
-            else:
-                # -> Get comm_graph shared variable
-                comm_graph = self.client.json().get(self.comm_graph)
-
-                # -> Add node to comm_graph
-                comm_graph[f"{self.address}"] = []
-
-                # -> Update comm_graph shared variable
-                self.client.json().set(self.comm_graph, "$", comm_graph)
-
-            # ======================== Redis graph
-            # -> Get pubsub graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
-
-            # -> Add node
-            new_node = Redis_node(
-                label=["node"] + self.labels,
-                properties={
-                    "name": self.address,
-                    "pyROS_id": self.id,
-                    "ref": self.ref,
-                    "namespace": self.namespace
-                }
-            )
-
-            redis_graph.add_node(node=new_node)
-            redis_graph.commit()
+        self.backend.declare_node(
+            comm_graph=self.comm_graph,
+            address=self.address,
+            labels=self.labels,
+            properties={
+                "name": self.address,
+                "pyROS_id": self.id,
+                "ref": self.ref,
+                "namespace": self.namespace
+            }
+        )
 
         self.declared_node = True
 
@@ -140,6 +157,7 @@ class Node(
             "default_shared_variable_callback_group": ReentrantCallbackGroup(
                 name="default_shared_variable_callback_group"),
             "default_timer_callback_group": ReentrantCallbackGroup(name="default_timer_callback_group"),
+            "default_service_callback_group": ReentrantCallbackGroup(name="default_service_callback_group"),
 
             # Custom
             "ros_callback_group": ReentrantCallbackGroup(name="ros_callback_group"),
@@ -168,11 +186,19 @@ class Node(
         Subscriber_module.__init__(self)
         Shared_variable_module.__init__(self)
         Timer_module.__init__(self)
+        Service_module.__init__(self)
 
         # Custom
         # ROS_publisher_module.__init__(self)
         # ROS_subscriber_module.__init__(self)
 
+        # -> Publish periodic stats snapshots if enabled
+        self.stats_timer = None
+        self.stats_publisher = None
+
+        if Config.stats_period is not None:
+            self.start_stats_publisher()
+
     # ================================================================== Spin logics
     def spin(self,
              spin_rate: float = 0.01,
@@ -194,7 +220,7 @@ class Node(
         :param threaded: If True, spin in a separate thread.
         """
         if not self.spin_state.get_value(spin=True):
-            with Lock(redis_client=self.client, name=self.ref):
+            with self.backend.lock(name=self.ref):
                 # -> Reset spin control variable
                 self.spin_state.set_value(value=True, instant=True)
 
@@ -288,9 +314,13 @@ class Node(
         """
         Destroy the node by removing all the publishers, subscribers, timers, etc...
         """
+        # -> Stop publishing stats snapshots
+        self.stop_stats_publisher()
+
         # -> Destroy every publisher and subscriber in every callback group
         for callback_group in self.callbackgroups.values():
-            for callback in callback_group.callbacks:
+            # -> Iterate over a copy as destroying an endpoint removes it from its callback group
+            for callback in list(callback_group.callbacks):
                 # -> Destroy all the publishers in the callback
                 if isinstance(callback, Publisher):
                     self.destroy_publisher(publisher=callback)
@@ -303,29 +333,93 @@ class Node(
                 elif isinstance(callback, Shared_variable):
                     self.undeclare_shared_variable(shared_variable=callback)
 
+                # -> Destroy all the services in the callback
+                elif isinstance(callback, Service):
+                    self.destroy_service(service=callback)
+
+                # -> Destroy all the clients in the callback
+                elif isinstance(callback, Client):
+                    self.destroy_client(client=callback)
+
+            # -> Stop the pool running the work submitted by the endpoints of the group
+            callback_group.shutdown()
+
         # -> Destroy every timer in the node
-        timer_lst = self._node_dict["async_timers"]
-        for timer in timer_lst:
-            self.destroy_timer(timer=timer)
+        for timer in list(self._node_dict["async_timers"].values()):
+            self.destroy_async_timer(timer=timer)
 
         # -> Remove node from comm graph
-        with Lock(redis_client=self.client, name=self.comm_graph):
-            # -> Get comm_graph shared variable
-            comm_graph = self.client.json().get(self.comm_graph)
+        self.backend.undeclare_node(comm_graph=self.comm_graph, address=self.address)
+        self.declared_node = False
 
-            # -> Delete node entry from comm_graph
-            del comm_graph[f"{self.address}"]
+    # ================================================================== Stats
+    @property
+    def endpoints(self) -> list:
+        """
+        Get the endpoints of the node in every callback group
+        """
+        return [callback for callback_group in self.callbackgroups.values() for callback in callback_group.callbacks]
+
+    def get_stats(self) -> dict:
+        """
+        Get a snapshot of the runtime metrics of every endpoint of the node
+        """
+
+        return {
+            "node": self.ref,
+            "namespace": self.namespace,
+            "timestamp": time.time(),
+            "endpoints": [endpoint.get_stats() for endpoint in self.endpoints]
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Reset the runtime metrics of every endpoint of the node
+        """
+
+        for endpoint in self.endpoints:
+            endpoint.stats.reset()
 
-            # -> Update comm_graph shared variable
-            self.client.json().set(self.comm_graph, "$", comm_graph)
+    def start_stats_publisher(self, period: float = None, topic: str = None) -> None:
+        """
+        Periodically publish the node stats snapshot to a metrics topic, from a background timer
+
+        :param period: The period (s) at which snapshots are published. If None, Config.stats_period is used, or 1s if it is not set.
+        :param topic: The topic snapshots are published to. If None, Config.stats_topic is used.
+        """
+
+        # -> Restart the publisher if already running
+        self.stop_stats_publisher()
+
+        if period is None:
+            period = Config.stats_period if Config.stats_period is not None else 1.
+
+        if topic is None:
+            topic = Config.stats_topic
+
+        self.stats_publisher = self.create_publisher(msg_type="stats", topic=topic, manual_spin=True)
+
+        # (The timer is kept out of the node async timers, which are only started when spinning)
+        self.stats_timer = Async_timer(
+            timer_period=period,
+            callback=lambda: self.stats_publisher.publish(msg=self.get_stats()),
+            ref=self.ref + "_stats_timer"
+        )
+        self.stats_timer.daemon = True
+        self.stats_timer.start()
+
+    def stop_stats_publisher(self) -> None:
+        """
+        Stop publishing the node stats snapshots
+        """
 
-            # ======================== Redis graph
-            # -> Get pubsub graph
-            redis_graph = Graph(client=self.client, name="ROS_graph")
+        if self.stats_timer is not None:
+            self.stats_timer.cancel()
+            self.stats_timer = None
 
-            # -> Delete node
-            query = f"MATCH (n:node) WHERE n.name = '{self.address}' DELETE n"
-            redis_graph.query(query)
+        if self.stats_publisher is not None:
+            self.destroy_publisher(publisher=self.stats_publisher)
+            self.stats_publisher = None
 
     # ================================================================== Misc
     # ---------------------------------------------- Timer
@@ -1,9 +1,88 @@
-from tracemalloc import start
-from datetime import datetime
+import json
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from threading import Thread, Event
 from RedisROS import Node
+from RedisROS.Endpoints.Core.Endpoint_abc import Endpoint_abc
 
 zero_datetime = datetime(year=1, month=1, day=1)
 
+# -> Time (s) the lockstep waits for a notification before checking whether it should stop
+POLL_TIMEOUT = 0.05
+
+# -> Time (s) a node stays registered to a lockstep unless it renews its registration (every third of it)
+PARTICIPANT_LEASE = 3.
+
+# -> Period (s) at which the clock checks the barrier counters, in case a notification was missed or a node expired
+BARRIER_CHECK_PERIOD = 1.
+
+
+def get_anchor_name(clock_ref: str) -> str:
+    """
+    Get the name of the shared variable holding the sim time anchor of a clock
+    """
+    return f"{clock_ref}_anchor"
+
+
+def get_lockstep_keys(clock_ref: str, namespace: str = "") -> dict:
+    """
+    Get the keys and channels of the lockstep barrier of a clock:
+    - participants: Registry of the nodes registered to the lockstep, with the expiry time of their registration
+    - acks: Prefix of the per-step counters of the nodes having acknowledged the step
+    - step: Channel on which the clock notifies the new steps
+    - barrier: Channel on which the last node to acknowledge a step notifies the clock
+    """
+
+    return {
+        name: Endpoint_abc.get_topic(topic_elements=[namespace, f"{clock_ref}_lockstep", name])
+        for name in ["participants", "acks", "step", "barrier"]
+    }
+
+
+def register_participant(backend, key: str, participant_id: str) -> None:
+    """
+    Register (or renew) a node to a lockstep, for PARTICIPANT_LEASE seconds
+    """
+
+    with backend.lock(name=key):
+        participants = get_participants(backend=backend, key=key)
+        participants[participant_id] = time.time() + PARTICIPANT_LEASE
+        backend.set(key=key, value=json.dumps(participants))
+
+
+def unregister_participant(backend, key: str, participant_id: str) -> None:
+    with backend.lock(name=key):
+        participants = get_participants(backend=backend, key=key)
+        participants.pop(participant_id, None)
+        backend.set(key=key, value=json.dumps(participants))
+
+
+def get_participants(backend, key: str) -> dict:
+    """
+    Get the nodes registered to a lockstep whose registration has not expired, with its expiry time
+    """
+
+    now = time.time()
+
+    return {participant_id: expires for participant_id, expires in json.loads(backend.get(key=key) or "{}").items()
+            if expires > now}
+
+
+def get_sim_datetime(anchor: dict, real_time: float = None) -> datetime:
+    """
+    Compute the sim time from a clock anchor
+
+    :param anchor: The anchor: real start time (s since epoch), sim start datetime (ISO format) and time factor
+    :param real_time: The real time (s since epoch). If None, the current time is used.
+    """
+
+    if real_time is None:
+        real_time = time.time()
+
+    return datetime.fromisoformat(anchor["sim_start"]) + timedelta(seconds=(real_time - anchor["real_start"]) * anchor["time_factor"])
+
 
 class Clock(Node):
     def __init__(self,
@@ -11,7 +90,26 @@ class Clock(Node):
                  namespace: str = "",
                  start_datetime: datetime = zero_datetime,
                  clock_rate: float = 0.01,
-                 time_factor=1):
+                 time_factor=1,
+                 publish_datetime: bool = False,
+                 step_size: float = None):
+        """
+        Share the sim time through an anchor (real start time, sim start time and time factor) stored in a shared variable,
+        from which the nodes compute the sim time locally (see Sim_clock). The anchor is only updated when the time factor changes.
+
+        In lockstep (step_size given), the sim time advances by step_size at every step, once every node registered to the
+        lockstep (see Sim_clock) has acknowledged the previous step. The sim time then runs as fast as the slowest node allows.
+        The barrier counters are also checked every BARRIER_CHECK_PERIOD seconds, so the lockstep resumes once the
+        registration of a crashed node expires.
+
+        :param start_datetime: The sim time at the start of the clock
+        :param clock_rate: The period (s) at which the sim time is published as a string, if publish_datetime is True
+        :param time_factor: The speed of the sim time relative to the real time
+        :param publish_datetime: Whether to also publish the formatted sim time on the ref topic every clock_rate,
+                                 for the nodes subscribing to the clock topic
+        :param step_size: The sim time (s) of a lockstep step. If None, the sim time follows the real time.
+        """
+
         Node.__init__(
             self,
             ref=ref,
@@ -24,24 +122,71 @@ class Clock(Node):
 
         self.clock_rate = clock_rate
         self.time_factor = time_factor
+        self.publish_datetime = publish_datetime
+
+        # -> Setup lockstep
+        self.step_size = step_size
+        self.step = 0
+
+        self.lockstep_keys = get_lockstep_keys(clock_ref=ref, namespace=namespace)
+        self.stepping_thread = None
+        self.__stepping = False
+
+        if step_size is not None:
+            self.time_factor = 0
+
+            # (Subscribed before any step is notified, so no acknowledgement is missed)
+            self.barrier_pubsub = self.backend.pubsub()
+            self.barrier_pubsub.subscribe(self.lockstep_keys["barrier"])
+
+        self.anchor_variable = self.declare_shared_variable(
+            name=get_anchor_name(clock_ref=ref),
+            value=self.anchor,
+            descriptor=f"Sim time anchor of clock {ref}",
+            ignore_override=True,
+            manual_spin=True
+        )
 
         self.datetime_publisher = self.create_publisher(
             msg_type=None,
             topic=ref
         )
 
-        # self.create_timer(
-        #     timer_period_sec=0.01,
-        #     callback=self.datetime_callback,
-        #     ref="Clock timer"
-        # )
+    @property
+    def anchor(self) -> dict:
+        anchor = {
+            "real_start": self.real_start_datetime.timestamp(),
+            "sim_start": self.sim_start_datetime.isoformat(),
+            "time_factor": self.time_factor
+        }
 
-    def datetime_callback(self):
-        # -> Get real elapsed time
-        delta_t = datetime.now() - self.real_start_datetime
+        if self.step_size is not None:
+            anchor["step"] = self.step
+
+        return anchor
+
+    def get_sim_datetime(self) -> datetime:
+        return get_sim_datetime(anchor=self.anchor)
+
+    def set_time_factor(self, time_factor: float) -> None:
+        """
+        Change the speed of the sim time, re-anchoring the sim time at the current time
+        """
+
+        if self.step_size is not None:
+            raise ValueError("The time factor of a lockstep clock cannot be set, the sim time advances with the steps")
+
+        now = datetime.now()
 
+        self.sim_start_datetime = get_sim_datetime(anchor=self.anchor, real_time=now.timestamp())
+        self.real_start_datetime = now
+        self.time_factor = time_factor
+
+        self.anchor_variable.set_value(value=self.anchor, direct=True)
+
+    def datetime_callback(self):
         # -> Determine sim time
-        sim_datetime = self.sim_start_datetime + delta_t * self.time_factor
+        sim_datetime = self.get_sim_datetime()
 
         # -> Convert datetime to string
         sim_datetime_string = sim_datetime.strftime('%04d-%02d-%02d %02d:%02d:%02d.%06d' % (
@@ -51,8 +196,87 @@ class Clock(Node):
         # -> Publish sim time
         self.datetime_publisher.publish(msg=sim_datetime_string)
 
+    # ================================================================== Lockstep
+    def __notify_step(self) -> None:
+        """
+        Share the anchor of the current step and notify the registered nodes
+        """
+
+        self.real_start_datetime = datetime.now()
+        anchor = self.anchor
+
+        self.anchor_variable.set_value(value=anchor, direct=True)
+        self.backend.publish(self.lockstep_keys["step"], json.dumps(anchor))
+
+    def __is_step_acknowledged(self) -> bool:
+        """
+        Check the barrier counters of the current step, in case its notification was missed
+        """
+
+        acks = self.backend.get(key=f"{self.lockstep_keys['acks']}/{self.step}")
+        participants = get_participants(backend=self.backend, key=self.lockstep_keys["participants"])
+
+        return 0 < len(participants) <= int(acks or 0)
+
+    def __step_loop(self) -> None:
+        while self.__stepping:
+            self.__notify_step()
+            check_time = time.monotonic()
+
+            # -> Wait for the last node to acknowledge the step
+            while self.__stepping:
+                message = self.barrier_pubsub.get_message(timeout=POLL_TIMEOUT)
+
+                if message is not None and message["type"] == "message":
+                    if int(message["data"]) >= self.step:
+                        break
+
+                elif time.monotonic() - check_time > BARRIER_CHECK_PERIOD:
+                    if self.__is_step_acknowledged():
+                        break
+
+                    check_time = time.monotonic()
+
+            else:
+                return
+
+            # -> Advance the sim time
+            self.backend.delete(key=f"{self.lockstep_keys['acks']}/{self.step}")
+
+            self.step += 1
+            self.sim_start_datetime += timedelta(seconds=self.step_size)
+
+    def stop(self) -> None:
+        """
+        Stop stepping
+        """
+
+        if self.stepping_thread is not None:
+            self.__stepping = False
+            self.stepping_thread.join()
+            self.stepping_thread = None
+
+    def destroy_node(self):
+        self.stop()
+
+        if self.step_size is not None:
+            self.barrier_pubsub.unsubscribe()
+
+        Node.destroy_node(self)
+
     def run(self):
-        # self.spin()
+        # -> Share the anchor
+        self.anchor_variable.set_value(value=self.anchor, direct=True)
+
+        # -> Step from a background thread
+        if self.step_size is not None and self.stepping_thread is None:
+            self.__stepping = True
+
+            self.stepping_thread = Thread(target=self.__step_loop, daemon=True)
+            self.stepping_thread.start()
+
+        if not self.publish_datetime:
+            return
 
         timer = self.create_async_timer(
             timer_period_sec=self.clock_rate,
@@ -62,3 +286,191 @@ class Clock(Node):
 
         timer.start()
 
+
+class Sim_clock:
+    def __init__(self,
+                 node: Node,
+                 clock_ref: str = "Clock",
+                 refresh_period: float = 1.,
+                 lockstep: bool = False):
+        """
+        Compute the sim time of a Clock locally from its anchor, without exchanging messages
+
+        With lockstep, the node is registered to the lockstep of the clock, which only advances once every registered node
+        has acknowledged the current step:
+            while ...:
+                sim_clock.wait_step()
+                ... (sim_clock.now() is the sim time of the step)
+                sim_clock.ack()
+
+        The registration is renewed by a background thread every third of PARTICIPANT_LEASE, and expires if the node
+        crashes: the clock then stops waiting for the node within PARTICIPANT_LEASE + BARRIER_CHECK_PERIOD seconds.
+        Expiry times are compared across hosts, their clocks must be synchronised well within PARTICIPANT_LEASE.
+        close() unregisters the node at once.
+
+        :param node: The node reading the anchor
+        :param clock_ref: The reference of the clock
+        :param refresh_period: The period (s) at which the anchor is read again, to follow the time factor changes
+        :param lockstep: Whether to register the node to the lockstep of the clock
+        """
+
+        self.backend = node.backend
+        self.refresh_period = refresh_period
+        self.lockstep = lockstep
+
+        self.anchor = None
+        self.__sim_start = None
+        self.__refresh_time = None
+
+        # -> Setup lockstep
+        self.lockstep_keys = get_lockstep_keys(clock_ref=clock_ref, namespace=node.namespace)
+        self.step = None
+        self.acknowledged_step = None
+
+        if lockstep:
+            # (Subscribed before registering, so no step is missed)
+            self.step_pubsub = self.backend.pubsub()
+            self.step_pubsub.subscribe(self.lockstep_keys["step"])
+
+            # -> Register, and renew the registration until closed
+            self.participant_id = uuid.uuid4().hex
+            register_participant(backend=self.backend, key=self.lockstep_keys["participants"], participant_id=self.participant_id)
+
+            self.__heartbeat_stop = Event()
+            self.heartbeat_thread = Thread(target=self.__heartbeat_loop, daemon=True)
+            self.heartbeat_thread.start()
+
+        self.anchor_variable = node.declare_shared_variable(
+            name=get_anchor_name(clock_ref=clock_ref),
+            manual_spin=True
+        )
+
+        # -> Start from the current step, if the clock is already stepping
+        if lockstep:
+            anchor = self.anchor_variable.get_value(spin=True, non_blocking=True)
+
+            if anchor is not None and "step" in anchor:
+                self.__set_anchor(anchor=anchor)
+
+    def __set_anchor(self, anchor: dict) -> None:
+        if anchor != self.anchor:
+            self.__sim_start = datetime.fromisoformat(anchor["sim_start"])
+
+        self.anchor = anchor
+
+        if "step" in anchor and (self.step is None or anchor["step"] > self.step):
+            self.step = anchor["step"]
+
+    def get_anchor(self) -> dict or None:
+        """
+        Get the anchor of the clock, read again if older than the refresh period
+
+        :return: The anchor, None if the clock was not started
+        """
+
+        # (In lockstep, the anchor is received with the step notifications)
+        if self.lockstep:
+            return self.anchor
+
+        if self.__refresh_time is None or time.monotonic() - self.__refresh_time > self.refresh_period:
+            anchor = self.anchor_variable.get_value(spin=True, non_blocking=True)
+            self.__refresh_time = time.monotonic()
+
+            if anchor is not None:
+                self.__set_anchor(anchor=anchor)
+            else:
+                self.anchor = None
+
+        return self.anchor
+
+    def now(self) -> datetime or None:
+        """
+        Get the current sim time
+
+        :return: The sim time, None if the clock was not started
+        """
+
+        anchor = self.get_anchor()
+
+        if anchor is None:
+            return None
+
+        return self.__sim_start + timedelta(seconds=(time.time() - anchor["real_start"]) * anchor["time_factor"])
+
+    # ================================================================== Lockstep
+    def wait_step(self, timeout: float = None) -> int or None:
+        """
+        Wait for the clock to advance past the last step acknowledged
+
+        :param timeout: The time (s) to wait for. If None, waits indefinitely.
+        :return: The current step, None if the timeout expired
+        """
+
+        if not self.lockstep:
+            raise ValueError("Only nodes registered to the lockstep of the clock can wait for the steps")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self.step is None or (self.acknowledged_step is not None and self.step <= self.acknowledged_step):
+            remaining = None if deadline is None else deadline - time.monotonic()
+
+            if remaining is not None and remaining <= 0:
+                return None
+
+            message = self.step_pubsub.get_message(timeout=remaining)
+
+            if message is not None and message["type"] == "message":
+                self.__set_anchor(anchor=json.loads(message["data"]))
+
+        return self.step
+
+    def ack(self) -> None:
+        """
+        Acknowledge the current step. The last registered node to acknowledge it notifies the clock.
+        """
+
+        if self.step is None or self.step == self.acknowledged_step:
+            return
+
+        acks = self.backend.incr(key=f"{self.lockstep_keys['acks']}/{self.step}")
+        self.acknowledged_step = self.step
+
+        self.__notify_barrier(acks=acks)
+
+    def __notify_barrier(self, acks: int) -> None:
+        participants = get_participants(backend=self.backend, key=self.lockstep_keys["participants"])
+
+        if acks >= len(participants):
+            self.backend.publish(self.lockstep_keys["barrier"], str(self.step))
+
+    def __heartbeat_loop(self) -> None:
+        """
+        Renew the registration to the lockstep before it expires
+        """
+
+        while not self.__heartbeat_stop.wait(timeout=PARTICIPANT_LEASE / 3):
+            try:
+                register_participant(backend=self.backend, key=self.lockstep_keys["participants"], participant_id=self.participant_id)
+            except:
+                print(f"ERROR:: Failed to renew the registration to the lockstep {self.lockstep_keys['participants']}")
+                traceback.print_exc()
+
+    def close(self) -> None:
+        """
+        Unregister the node from the lockstep, releasing the step if the other nodes already acknowledged it
+        """
+
+        if not self.lockstep:
+            return
+
+        self.lockstep = False
+        self.step_pubsub.unsubscribe()
+
+        self.__heartbeat_stop.set()
+        self.heartbeat_thread.join()
+
+        unregister_participant(backend=self.backend, key=self.lockstep_keys["participants"], participant_id=self.participant_id)
+
+        if self.step is not None and self.step != self.acknowledged_step:
+            acks = self.backend.get(key=f"{self.lockstep_keys['acks']}/{self.step}")
+            self.__notify_barrier(acks=int(acks or 0))
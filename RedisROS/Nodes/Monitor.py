@@ -0,0 +1,316 @@
+import json
+import time
+from collections import deque
+
+from RedisROS import Config
+from RedisROS import Node
+from RedisROS.Endpoints.Core.Endpoint_stats import Endpoint_stats
+
+# -> Counters of the endpoint stats snapshots aggregated over the rolling window
+COUNTERS = Endpoint_stats.get_counters()
+
+# -> Counters reported as rates, the others are reported as totals over the window (drops, losses, ...)
+RATE_COUNTERS = ["sent", "received", "bytes_sent", "bytes_received", "callbacks"]
+EVENT_COUNTERS = [counter for counter in COUNTERS if counter not in RATE_COUNTERS]
+
+# -> Fields of the time-series samples, stored as compact arrays
+TOPIC_FIELDS = ["timestamp", "publish_rate", "receive_rate", "bandwidth", "latency_p50", "latency_p99"] + EVENT_COUNTERS
+NODE_FIELDS = ["timestamp", "publish_rate", "receive_rate", "callback_load", "backlog", "dropped", "callback_errors"]
+
+
+def bucket_percentile(buckets: dict, p: float) -> float or None:
+    """
+    Get an upper estimate of the p percentile of merged histogram buckets
+
+    :param buckets: The bucket counts, by bucket upper bound (None for the overflow bucket)
+    :param p: The percentile, between 0 and 1
+    """
+
+    count = sum(buckets.values())
+
+    if count == 0:
+        return None
+
+    bounds = sorted(bound for bound in buckets if bound is not None)
+    cumulated = 0
+
+    for bound in bounds:
+        cumulated += buckets[bound]
+
+        if cumulated >= p * count:
+            return bound
+
+    # -> The percentile falls in the overflow bucket
+    return bounds[-1] if bounds else None
+
+
+class Monitor(Node):
+    def __init__(self,
+                 ref: str = "Monitor",
+                 namespace: str = "",
+                 window: float = 10.,
+                 sample_period: float = 1.,
+                 retention: int = 3600,
+                 overload_threshold: float = 0.8,
+                 stats_topic: str = None):
+        """
+        Aggregate the stats snapshots published by the nodes (see Node.start_stats_publisher) into rolling windows,
+        and store the per-topic and per-node aggregates in compact time-series lists.
+
+        :param window: The duration (s) of the rolling windows
+        :param sample_period: The period (s) at which the aggregates are computed and stored
+        :param retention: The number of samples kept in every time series
+        :param overload_threshold: The fraction of time spent in callbacks above which a node is flagged as overloaded
+        :param stats_topic: The topic the nodes publish their snapshots to. If None, Config.stats_topic is used.
+        """
+
+        Node.__init__(
+            self,
+            ref=ref,
+            namespace=namespace,
+        )
+
+        # ----- Setup monitor
+        self.window = window
+        self.sample_period = sample_period
+        self.retention = retention
+        self.overload_threshold = overload_threshold
+
+        # -> Time-series keys prefix
+        self.series_prefix = f"{ref}_series"
+
+        if self.namespace != "":
+            self.series_prefix = self.get_topic(topic_elements=[namespace, self.series_prefix])
+
+        # -> Initialise the rolling windows
+        self.last_snapshots = {}        # (node, endpoint id) -> last endpoint snapshot and its timestamp
+        self.windows = {}               # (node, endpoint id) -> deque of (timestamp, interval, endpoint info, deltas)
+
+        self.stats_subscriber = self.create_subscription(
+            msg_type="stats",
+            topic=stats_topic if stats_topic is not None else Config.stats_topic,
+            callback=self.stats_callback,
+            manual_spin=True
+        )
+
+        # -> Describe the time-series samples fields
+        self.backend.set(key=f"{self.series_prefix}/fields", value=json.dumps({"topic": TOPIC_FIELDS, "node": NODE_FIELDS}))
+
+        self.sample_timer = None
+
+    # ================================================================== Collection
+    def stats_callback(self, msg):
+        """
+        Add the difference between a node snapshot and its previous snapshot to the rolling windows
+        """
+
+        timestamp = msg["timestamp"]
+
+        for endpoint in msg["endpoints"]:
+            key = (msg["node"], endpoint["id"])
+            previous = self.last_snapshots.get(key)
+            self.last_snapshots[key] = (timestamp, endpoint)
+
+            # -> The first snapshot of an endpoint only sets the baseline
+            if previous is None:
+                continue
+
+            previous_timestamp, previous = previous
+
+            # -> Counters decreasing means the stats were reset, count from zero
+            if endpoint["sent"] < previous["sent"] or endpoint["received"] < previous["received"]:
+                previous = None
+
+            deltas = {counter: endpoint.get(counter, 0) - (previous.get(counter, 0) if previous else 0) for counter in COUNTERS}
+            deltas["callback_time"] = endpoint["callback_duration"]["total"] - (previous["callback_duration"]["total"] if previous else 0)
+
+            # -> Latency histogram over the interval
+            latency = {bound: count for bound, count in endpoint["latency"]["buckets"]}
+
+            if previous:
+                for bound, count in previous["latency"]["buckets"]:
+                    latency[bound] -= count
+
+            deltas["latency"] = latency
+
+            info = {
+                "node": msg["node"],
+                "type": endpoint["type"],
+                "topic": endpoint.get("topic", endpoint.get("service")),
+                "backlog": endpoint.get("backlog", 0)
+            }
+
+            self.windows.setdefault(key, deque()).append((timestamp, timestamp - previous_timestamp, info, deltas))
+
+    def collect(self) -> None:
+        """
+        Process the snapshots received since the last collection, and drop the samples older than the window
+        """
+
+        # -> Spin the stats subscriber until no more snapshots are received
+        while True:
+            received = self.stats_subscriber.stats.received
+            self.stats_subscriber.spin()
+
+            if self.stats_subscriber.stats.received == received:
+                break
+
+        # -> Trim the rolling windows
+        horizon = time.time() - self.window
+
+        for key, samples in list(self.windows.items()):
+            while samples and samples[0][0] < horizon:
+                samples.popleft()
+
+            if not samples:
+                del self.windows[key]
+                self.last_snapshots.pop(key, None)
+
+    # ================================================================== Aggregation
+    def __endpoint_aggregates(self) -> list:
+        """
+        Sum the deltas of every endpoint over its window, and convert them to rates
+        """
+
+        aggregates = []
+
+        for samples in list(self.windows.values()):
+            duration = sum(interval for _, interval, _, _ in samples)
+
+            if duration <= 0:
+                continue
+
+            latency = {}
+            totals = dict.fromkeys(COUNTERS + ["callback_time"], 0)
+
+            for _, _, _, deltas in samples:
+                for counter in totals:
+                    totals[counter] += deltas[counter]
+
+                for bound, count in deltas["latency"].items():
+                    latency[bound] = latency.get(bound, 0) + count
+
+            aggregates.append({
+                **samples[-1][2],
+                "publish_rate": totals["sent"] / duration,
+                "receive_rate": totals["received"] / duration,
+                "bandwidth": totals["bytes_sent"] / duration,
+                "callback_load": totals["callback_time"] / duration,
+                **{counter: totals[counter] for counter in EVENT_COUNTERS},
+                "latency": latency
+            })
+
+        return aggregates
+
+    def get_summary(self) -> dict:
+        """
+        Get the per-topic and per-node aggregates over the rolling window
+
+        - topics: publish and receive rates (msg/s), bandwidth (bytes/s), latency p50/p99 (s), and the totals of the other
+                  counters of the endpoint stats (drops, filtered, throttled and expired messages, sequence losses, ...)
+        - nodes: publish and receive rates (msg/s), callback load (fraction of time spent in callbacks), backlog, drops and errors
+        - hot_topics: the topics sorted by decreasing bandwidth
+        - overloaded_nodes: the nodes with a callback load above the overload threshold
+        """
+
+        topics = {}
+        nodes = {}
+
+        for aggregate in self.__endpoint_aggregates():
+            # -> Topics
+            if aggregate["topic"] is not None:
+                topic = topics.setdefault(aggregate["topic"], {"publish_rate": 0., "receive_rate": 0., "bandwidth": 0.,
+                                                               **dict.fromkeys(EVENT_COUNTERS, 0), "latency": {}})
+
+                for field in ["publish_rate", "receive_rate", "bandwidth"] + EVENT_COUNTERS:
+                    topic[field] += aggregate[field]
+
+                for bound, count in aggregate["latency"].items():
+                    topic["latency"][bound] = topic["latency"].get(bound, 0) + count
+
+            # -> Nodes
+            node = nodes.setdefault(aggregate["node"], dict.fromkeys(NODE_FIELDS[1:], 0))
+
+            for field in NODE_FIELDS[1:]:
+                node[field] += aggregate[field]
+
+        for topic in topics.values():
+            latency = topic.pop("latency")
+            topic["latency_p50"] = bucket_percentile(buckets=latency, p=0.5)
+            topic["latency_p99"] = bucket_percentile(buckets=latency, p=0.99)
+
+        return {
+            "timestamp": time.time(),
+            "window": self.window,
+            "topics": topics,
+            "nodes": nodes,
+            "hot_topics": sorted(topics, key=lambda topic: topics[topic]["bandwidth"], reverse=True),
+            "overloaded_nodes": [ref for ref, node in nodes.items() if node["callback_load"] > self.overload_threshold]
+        }
+
+    # ================================================================== Time series
+    def get_series_key(self, kind: str, name: str) -> str:
+        """
+        Get the key of the time series of a topic or a node
+
+        :param kind: "topic" or "node"
+        :param name: The topic or the node ref
+        """
+        return f"{self.series_prefix}/{kind}/{name.lstrip('/')}"
+
+    def sample(self) -> dict:
+        """
+        Collect the latest snapshots, and append the window aggregates to the time series
+
+        :return: The window summary
+        """
+
+        self.collect()
+        summary = self.get_summary()
+
+        timestamp = round(summary["timestamp"], 3)
+
+        for topic, aggregates in summary["topics"].items():
+            self.backend.push(
+                key=self.get_series_key(kind="topic", name=topic),
+                value=json.dumps([timestamp] + [aggregates[field] for field in TOPIC_FIELDS[1:]], separators=(",", ":")),
+                max_length=self.retention
+            )
+
+        for ref, aggregates in summary["nodes"].items():
+            self.backend.push(
+                key=self.get_series_key(kind="node", name=ref),
+                value=json.dumps([timestamp] + [aggregates[field] for field in NODE_FIELDS[1:]], separators=(",", ":")),
+                max_length=self.retention
+            )
+
+        return summary
+
+    def get_series(self, kind: str, name: str, count: int = None) -> list:
+        """
+        Get the samples of the time series of a topic or a node
+
+        :param kind: "topic" or "node"
+        :param name: The topic or the node ref
+        :param count: The number of most recent samples to get. If None, every sample is returned.
+        :return: The samples, as dictionaries
+        """
+
+        fields = TOPIC_FIELDS if kind == "topic" else NODE_FIELDS
+
+        samples = self.backend.get_list(key=self.get_series_key(kind=kind, name=name), start=-count if count else 0)
+
+        return [dict(zip(fields, json.loads(sample))) for sample in samples]
+
+    def run(self):
+        """
+        Sample the aggregates periodically from a background timer
+        """
+
+        self.sample_timer = self.create_async_timer(
+            timer_period_sec=self.sample_period,
+            callback=self.sample,
+            ref="Monitor timer"
+        )
+
+        self.sample_timer.start()
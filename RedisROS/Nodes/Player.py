@@ -0,0 +1,183 @@
+import json
+import time
+from threading import Thread
+
+from RedisROS import Node
+from RedisROS.Endpoints.Core.Endpoint_abc import Endpoint_abc
+from RedisROS.Bag import Bag_reader
+from RedisROS.Transports.Batch_framing import is_batch, pack_batch, unpack_batch
+from RedisROS.Transports.Message_framing import is_message, pack_message, unpack_message, get_publisher_key, PUBLISHER_COUNTER_KEY
+
+# -> Metadata tagging messages as sent through a faster transport, which do not apply to replayed messages
+TRANSPORT_TAGS = ["intra_process_id", "shm_host", "p2p"]
+
+# -> Metadata stripped from the replayed messages: the transport tags, and the lifespan which would expire the messages
+#    replayed with their original timestamps
+REPLAY_STRIPPED_TAGS = TRANSPORT_TAGS + ["lifespan"]
+
+
+class Player(Node):
+    def __init__(self,
+                 path: str,
+                 ref: str = "Player",
+                 namespace: str = ""):
+        """
+        Republish the messages of a bag (see RedisROS.Bag), memory-mapping its segments.
+        Messages are republished as recorded, with their original timestamps and sequence numbers,
+        under new publisher numbers registered for the replay. Their lifespan is not enforced.
+
+        :param path: The directory of the bag
+        """
+
+        Node.__init__(
+            self,
+            ref=ref,
+            namespace=namespace,
+        )
+
+        # ----- Setup player
+        self.reader = Bag_reader(path=path)
+
+        # -> Replay publisher numbers of the current playback, by recorded publisher number
+        self.numbers = {}
+
+        # -> Replay publisher numbers registered, released when the node is destroyed
+        self.registered_numbers = []
+
+        self.playing_thread = None
+        self.__playing = False
+
+    def __get_number(self, number: int) -> int:
+        """
+        Get the replay number of a recorded publisher, registering its metadata on first use
+        """
+
+        if number not in self.numbers:
+            replay_number = self.backend.incr(key=PUBLISHER_COUNTER_KEY)
+
+            metadata = dict(self.reader.publishers.get(number) or {"msg_type": "Unspecified", "parent_node_ref": None, "publisher_id": None})
+            metadata["publisher_id"] = f"{metadata['publisher_id']}/{replay_number}"
+
+            for tag in REPLAY_STRIPPED_TAGS:
+                metadata.pop(tag, None)
+
+            self.backend.set(key=get_publisher_key(number=replay_number), value=json.dumps(metadata))
+            self.numbers[number] = replay_number
+            self.registered_numbers.append(replay_number)
+
+        return self.numbers[number]
+
+    def __renumber(self, data: bytes) -> bytes:
+        """
+        Replace the publisher number of a recorded message or batch by its replay number
+        """
+
+        if is_batch(data):
+            return pack_batch(payloads=[self.__renumber(frame) for frame in unpack_batch(data)])
+
+        # (Messages without header carry their metadata)
+        if not is_message(data):
+            if not any(f'"{tag}"'.encode() in data for tag in REPLAY_STRIPPED_TAGS):
+                return data
+
+            raw_msg = json.loads(data)
+
+            for tag in REPLAY_STRIPPED_TAGS:
+                raw_msg.pop(tag, None)
+
+            return json.dumps(raw_msg).encode()
+
+        flags, number, seq, timestamp, payload = unpack_message(data)
+
+        return pack_message(number=self.__get_number(number=number), seq=seq, timestamp=timestamp, payload=payload, flags=flags)
+
+    def play(self,
+             topics: list = None,
+             start: float = None,
+             end: float = None,
+             time_factor: float or None = 1.) -> int:
+        """
+        Republish the messages of the bag, blocking until the end of the bag or until stopped
+
+        :param topics: The topics to republish. If None, every topic is republished.
+        :param start: The time (s) from the beginning of the bag to start at. If None, the bag is played from the start.
+        :param end: The time (s) from the beginning of the bag to stop at. If None, the bag is played to the end.
+        :param time_factor: The playback speed, 2 plays twice as fast as recorded. If None, messages are republished as fast as possible.
+        :return: The number of messages republished
+        """
+
+        if self.reader.start is None:
+            return 0
+
+        self.__playing = True
+
+        # -> Every playback uses new publisher numbers, so subscribers see new sequences
+        self.numbers = {}
+
+        if topics is not None:
+            topics = [Endpoint_abc.get_topic(topic_elements=[topic]) for topic in topics]
+
+        count = 0
+        first_timestamp = None
+        first_time = None
+
+        try:
+            for timestamp, topic, data in self.reader.read(
+                    topics=topics,
+                    start=self.reader.start + int(start * 1e9) if start is not None else None,
+                    end=self.reader.start + int(end * 1e9) if end is not None else None):
+
+                if not self.__playing:
+                    break
+
+                # -> Wait until the message is due
+                if time_factor is not None:
+                    if first_timestamp is None:
+                        first_timestamp = timestamp
+                        first_time = time.monotonic()
+
+                    delay = first_time + (timestamp - first_timestamp) / 1e9 / time_factor - time.monotonic()
+
+                    if delay > 0:
+                        time.sleep(delay)
+
+                self.backend.publish(topic, self.__renumber(data=data))
+                count += 1
+
+        finally:
+            self.__playing = False
+
+        return count
+
+    def run(self, **kwargs):
+        """
+        Play the bag from a background thread
+
+        :param kwargs: The arguments of play
+        """
+
+        if self.playing_thread is not None and self.playing_thread.is_alive():
+            return
+
+        self.playing_thread = Thread(target=self.play, kwargs=kwargs, daemon=True)
+        self.playing_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop playing
+        """
+
+        self.__playing = False
+
+        if self.playing_thread is not None:
+            self.playing_thread.join()
+            self.playing_thread = None
+
+    def destroy_node(self):
+        self.stop()
+
+        # -> Release the metadata of the replay publishers
+        for replay_number in self.registered_numbers:
+            self.backend.delete(key=get_publisher_key(number=replay_number))
+
+        Node.destroy_node(self)
@@ -0,0 +1,198 @@
+import json
+import time
+import traceback
+from collections import deque
+from fnmatch import fnmatch
+from threading import Thread, Lock as ThreadLock
+
+from RedisROS import Node
+from RedisROS.Endpoints.Core.Endpoint_abc import Endpoint_abc
+from RedisROS.Bag import Bag_writer
+from RedisROS.Transports.Batch_framing import is_batch, unpack_batch
+from RedisROS.Transports.Message_framing import is_message, unpack_message, get_publisher_key
+
+# -> Time (s) the recording thread waits for a message before checking whether it should stop
+POLL_TIMEOUT = 0.05
+
+
+class Recorder(Node):
+    def __init__(self,
+                 path: str,
+                 topics: list = [],
+                 patterns: list = [],
+                 ref: str = "Recorder",
+                 namespace: str = "",
+                 segment_size: int = 64 * 1024 * 1024,
+                 discovery_period: float = 1.,
+                 flush_period: float = 1.):
+        """
+        Record topics to a bag (see RedisROS.Bag). Messages are written as received from redis, without being decoded,
+        from a dedicated thread draining the redis connection.
+
+        :param path: The directory of the bag
+        :param topics: The topics to record
+        :param patterns: Shell-style patterns (fnmatch) of the topics to record, matched against the topics of the
+                         publishers declared in the comm graph every discovery_period
+        :param segment_size: The size (bytes) after which a new segment is started
+        :param discovery_period: The period (s) at which the comm graph is checked for new topics matching the patterns
+        :param flush_period: The period (s) at which the recorded messages are flushed to disk
+        """
+
+        Node.__init__(
+            self,
+            ref=ref,
+            namespace=namespace,
+        )
+
+        # ----- Setup recorder
+        self.patterns = patterns
+        self.discovery_period = discovery_period
+        self.flush_period = flush_period
+
+        self.writer = Bag_writer(path=path, segment_size=segment_size)
+
+        # -> Setup the recorder's pubsub connection, only used from the recording thread once recording
+        self.pubsub = self.backend.pubsub()
+        self.topics = set()
+
+        # -> Initialise the topics to subscribe to, queued for the recording thread
+        self.__new_topics = deque()
+        self.__topics_lock = ThreadLock()
+
+        for topic in topics:
+            self.record_topic(topic=topic)
+
+        self.__subscribe_new_topics()
+
+        self.recording_thread = None
+        self.__recording = False
+
+    def record_topic(self, topic: str) -> None:
+        """
+        Start recording a topic, subscribed to by the recording thread (or when the recording starts)
+        """
+
+        topic = Endpoint_abc.get_topic(topic_elements=[topic])
+
+        with self.__topics_lock:
+            if topic in self.topics:
+                return
+
+            self.topics.add(topic)
+
+        self.__new_topics.append(topic)
+
+    def __subscribe_new_topics(self) -> None:
+        while self.__new_topics:
+            topic = self.__new_topics.popleft()
+            self.pubsub.subscribe(**{topic: lambda message, topic=topic: self.__write(topic=topic, data=message["data"])})
+
+    def discover_topics(self) -> None:
+        """
+        Start recording the topics of the declared publishers matching the patterns
+        """
+
+        for endpoints in self.backend.get_comm_graph(comm_graph=self.comm_graph).values():
+            for endpoint in endpoints:
+                if endpoint["type"] != "publisher" or endpoint["topic"] in self.topics:
+                    continue
+
+                if any(fnmatch(endpoint["topic"], pattern) for pattern in self.patterns):
+                    self.record_topic(topic=endpoint["topic"])
+
+    def __write(self, topic: str, data: bytes) -> None:
+        timestamp = time.time_ns()
+
+        # -> Record the metadata of the new publishers (batches hold the messages of a single publisher)
+        frame = unpack_batch(data)[0] if is_batch(data) else data
+
+        if is_message(frame):
+            _, number, _, _, _ = unpack_message(frame)
+
+            if number not in self.writer.publishers:
+                metadata = self.backend.get(key=get_publisher_key(number=number))
+
+                self.writer.add_publisher(
+                    number=number,
+                    metadata=json.loads(metadata) if metadata is not None else {"msg_type": "Unspecified", "parent_node_ref": None, "publisher_id": None}
+                )
+
+        self.writer.write(topic=topic, data=data, timestamp=timestamp)
+
+    def __record_loop(self) -> None:
+        last_discovery = 0.
+        last_flush = time.monotonic()
+
+        while self.__recording:
+            try:
+                if self.patterns and time.monotonic() - last_discovery > self.discovery_period:
+                    self.discover_topics()
+                    last_discovery = time.monotonic()
+
+                self.__subscribe_new_topics()
+
+                self.pubsub.get_message(timeout=POLL_TIMEOUT)
+
+                if time.monotonic() - last_flush > self.flush_period:
+                    self.writer.flush()
+                    last_flush = time.monotonic()
+
+            except Exception:
+                if not self.__recording:
+                    break
+
+                traceback.print_exc()
+                time.sleep(POLL_TIMEOUT)
+
+    def get_info(self) -> dict:
+        """
+        Get the number of messages recorded, in total and per topic
+        """
+
+        topics = {}
+        segments = self.writer.segments if self.writer.file is None else self.writer.segments + [self.writer.segment]
+
+        for segment in segments:
+            for topic, entry in segment["topics"].items():
+                topics[topic] = topics.get(topic, 0) + entry["count"]
+
+        return {
+            "path": self.writer.path,
+            "segments": len(segments),
+            "count": sum(topics.values()),
+            "topics": topics
+        }
+
+    def run(self):
+        """
+        Start recording from a background thread
+        """
+
+        if self.recording_thread is not None:
+            return
+
+        # -> Subscribe to the topics recorded so far, before any message is read
+        self.__subscribe_new_topics()
+
+        self.__recording = True
+
+        self.recording_thread = Thread(target=self.__record_loop, daemon=True)
+        self.recording_thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop recording and write the index of the bag
+        """
+
+        if self.recording_thread is not None:
+            self.__recording = False
+            self.recording_thread.join()
+            self.recording_thread = None
+
+        self.writer.close()
+
+    def destroy_node(self):
+        self.stop()
+        self.pubsub.unsubscribe()
+
+        Node.destroy_node(self)
@@ -1,10 +1,17 @@
 
 # Import classes and functions
-from .Clock import Clock
+from .Clock import Clock, Sim_clock
+from .Monitor import Monitor
+from .Recorder import Recorder
+from .Player import Player
 
 # Import submodules
 
 # -> Define public api
 __all__ = [
-    "Clock"
+    "Clock",
+    "Sim_clock",
+    "Monitor",
+    "Recorder",
+    "Player"
 ]
@@ -0,0 +1,118 @@
+
+# -> Subscriber queue overflow policies
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+overflow_policies = [DROP_OLDEST, DROP_NEWEST, BLOCK]
+
+# -> Publisher rate limit policies
+DROP = "drop"
+COALESCE = "coalesce"
+
+rate_policies = [DROP, COALESCE]
+
+
+class QoS_profile:
+    def __init__(self,
+                 depth: int = None,
+                 overflow_policy: str = DROP_OLDEST,
+                 block_timeout: float = 1.,
+                 conflate: bool = False,
+                 batch_period: float = None,
+                 batch_max_bytes: int = 64 * 1024,
+                 batch_max_count: int = 1000,
+                 chunk_size: int = 1024 * 1024,
+                 compression: str = None,
+                 compression_threshold: int = 1024,
+                 rate_limit: float = None,
+                 rate_burst: int = 1,
+                 rate_policy: str = DROP,
+                 max_rate: float = None,
+                 keep_every: int = None,
+                 lifespan: float = None,
+                 deadline: float = None
+                 ) -> None:
+        """
+        Quality of service settings of an endpoint
+
+        :param depth: The number of messages a subscriber queues before applying the overflow policy.
+                      If None, the queue is unbounded and the redis connection is only read when spinning.
+                      If set, a reader thread drains the redis connection into the bounded queue, so slow callbacks
+                      do not leave messages piling up in the redis client output buffer.
+        :param overflow_policy: What to do when a message arrives on a full queue:
+                                "drop_oldest" discards the oldest queued message,
+                                "drop_newest" discards the arriving message,
+                                "block" waits for the queue to have room, up to block_timeout, then discards the arriving message
+        :param block_timeout: The maximum time (s) a message waits for room in the queue with the "block" policy
+        :param conflate: Latest-only mode, for high-rate topics where only the newest message matters (poses, odometry, ...).
+                         A reader thread drains the redis connection, and every message replaces the undecoded message
+                         waiting from the same source, so superseded messages are never decoded nor passed to the callback.
+                         Messages older than the last delivered one are discarded. depth and overflow_policy are ignored.
+        :param max_rate: Downsample the messages to at most max_rate (Hz), skipping the messages received sooner before decoding them
+        :param keep_every: Downsample the messages to every keep_every-th message, skipping the others before decoding them
+        :param deadline: The maximum period (s) expected between two messages. Every deadline elapsed without a message
+                         being dispatched is counted as a missed deadline, and reported to the deadline callback.
+
+        Publisher settings:
+        :param batch_period: Coalesce the messages published within batch_period (s) into a single payload, unpacked
+                             transparently by the subscribers. Trades up to batch_period of latency for throughput on
+                             small high-rate messages. If None, messages are sent one by one.
+        :param batch_max_bytes: Send the batch before the period elapses once it reaches this size (bytes)
+        :param batch_max_count: Send the batch before the period elapses once it holds this many messages
+        :param chunk_size: Split messages larger than chunk_size (bytes) into chunks of chunk_size bytes, reassembled by
+                           the subscribers, so redis serves the other clients between the chunks. If None, messages are never split.
+        :param compression: The codec compressing the messages, "zlib", "lzma" or a codec registered with
+                            RedisROS.Transports.register_codec. Subscribers decompress the messages transparently.
+                            If None, messages are not compressed.
+        :param compression_threshold: Only compress the messages larger than compression_threshold (bytes)
+        :param rate_limit: The maximum rate (msg/s) of the publisher, enforced by a token bucket. If None, the rate is not limited.
+        :param rate_burst: The number of messages the publisher can send at once above the rate limit
+        :param rate_policy: What to do with the messages published above the rate limit:
+                            "drop" discards them,
+                            "coalesce" keeps the latest one, sent as soon as the rate limit allows
+        :param lifespan: The time (s) the messages stay valid after being published. Subscribers drop the expired messages
+                         before decoding them. The clocks of the hosts must be synchronised. If None, messages never expire.
+        """
+
+        if depth is not None and depth < 1:
+            raise ValueError(f"QoS depth must be at least 1, got {depth}")
+
+        if overflow_policy not in overflow_policies:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}, must be one of {overflow_policies}")
+
+        if rate_policy not in rate_policies:
+            raise ValueError(f"Unknown rate policy: {rate_policy}, must be one of {rate_policies}")
+
+        if keep_every is not None and keep_every < 1:
+            raise ValueError(f"QoS keep_every must be at least 1, got {keep_every}")
+
+        if lifespan is not None and lifespan <= 0:
+            raise ValueError(f"QoS lifespan must be positive, got {lifespan}")
+
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f"QoS deadline must be positive, got {deadline}")
+
+        self.depth = depth
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.conflate = conflate
+        self.max_rate = max_rate
+        self.keep_every = keep_every
+        self.deadline = deadline
+        self.batch_period = batch_period
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_max_count = batch_max_count
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.rate_policy = rate_policy
+        self.lifespan = lifespan
+
+    def __repr__(self):
+        return f"QoS_profile(depth={self.depth}, overflow_policy={self.overflow_policy}, block_timeout={self.block_timeout}, " \
+               f"conflate={self.conflate}, batch_period={self.batch_period}, chunk_size={self.chunk_size}, " \
+               f"compression={self.compression}, max_rate={self.max_rate}, keep_every={self.keep_every}, " \
+               f"rate_limit={self.rate_limit}, rate_policy={self.rate_policy}, lifespan={self.lifespan}, deadline={self.deadline})"
@@ -0,0 +1,214 @@
+from bisect import bisect_left, bisect_right
+from threading import Lock as ThreadLock
+
+from RedisROS.QoS import QoS_profile
+
+
+def get_publish_stamp(msg, raw_msg: dict) -> int:
+    """
+    Default stamp of the synchronized messages: the publish time (ns) of their envelope
+    """
+    return raw_msg["timestamp_ns"]
+
+
+class Time_synchronizer:
+    def __init__(self,
+                 node,
+                 topics: list,
+                 callback,
+                 msg_types: list or str = "Unspecified",
+                 queue_size: int = 10,
+                 slop: float = None,
+                 stamp=get_publish_stamp,
+                 qos_profile: QoS_profile = None,
+                 manual_spin: bool = False
+                 ) -> None:
+        """
+        Combine the subscriptions of several topics, calling the callback once per set of messages with matching stamps,
+        with the messages in the order of the topics: callback(msg_1, msg_2, ...)
+
+        Every topic keeps its messages sorted by stamp in a buffer of queue_size messages, the oldest message being
+        dropped when the buffer is full. When a set is matched, the messages up to the matched ones are discarded.
+        - Exact policy (slop None): a set is matched when every topic holds a message with the same stamp
+        - Approximate policy: every new message is matched with the closest message of every other topic,
+          provided all the stamps of the set are within slop of each other
+
+        :param node: The node creating the subscriptions
+        :param topics: The topics to synchronize
+        :param callback: The callback function called with every matched set
+        :param msg_types: The message type of every topic, or of all of them
+        :param queue_size: The number of messages buffered per topic
+        :param slop: The maximum time difference (s) of the messages of a set. If None, the stamps must be equal.
+        :param stamp: Function getting the stamp (int, ns) of a message from the message and its metadata (msg, raw_msg).
+                      The publish time is used by default, the exact policy requires stamps set by the application.
+        :param qos_profile: The QoS profile of the subscriptions
+        :param manual_spin: Whether the subscriptions are spun manually
+        """
+
+        if len(topics) < 2:
+            raise ValueError(f"At least two topics are needed to synchronize, got {topics}")
+
+        if isinstance(msg_types, str):
+            msg_types = [msg_types] * len(topics)
+
+        self.node = node
+        self.callback = callback
+        self.queue_size = queue_size
+        self.slop = int(slop * 1e9) if slop is not None else None
+        self.stamp = stamp
+
+        # -> Initialise the buffers of every topic, as lists of stamps and messages sorted by stamp
+        self.stamps = [[] for _ in topics]
+        self.msgs = [[] for _ in topics]
+        self.__lock = ThreadLock()
+
+        # -> Initialise the counts of matched sets and of messages discarded without being matched
+        self.matched = 0
+        self.dropped = 0
+
+        self.subscriptions = [
+            node.create_subscription(
+                msg_type=msg_type,
+                topic=topic,
+                callback=self.__get_callback(index=index),
+                qos_profile=qos_profile,
+                manual_spin=manual_spin
+            )
+            for index, (topic, msg_type) in enumerate(zip(topics, msg_types))
+        ]
+
+    def __get_callback(self, index: int):
+        return lambda msg, raw_msg: self.add(index=index, msg=msg, stamp=self.stamp(msg, raw_msg))
+
+    def spin(self) -> None:
+        """
+        Spin the subscriptions, if spun manually
+        """
+
+        for subscription in self.subscriptions:
+            subscription.spin()
+
+    def add(self, index: int, msg, stamp: int) -> None:
+        """
+        Add a message to the buffer of a topic, and call the callback if it completes a set
+
+        :param index: The index of the topic of the message
+        :param stamp: The stamp (ns) of the message
+        """
+
+        with self.__lock:
+            stamps, msgs = self.stamps[index], self.msgs[index]
+
+            # -> Find the position of the message, after the messages with the same stamp (messages mostly arrive in order)
+            if not stamps or stamp >= stamps[-1]:
+                position = len(stamps)
+            else:
+                position = bisect_right(stamps, stamp)
+
+            # -> Drop the oldest message of a full buffer, the new message itself if it is the oldest
+            if len(stamps) >= self.queue_size:
+                self.dropped += 1
+
+                if position == 0:
+                    return
+
+                del stamps[0], msgs[0]
+                position -= 1
+
+            stamps.insert(position, stamp)
+            msgs.insert(position, msg)
+
+            if self.slop is None:
+                matched = self.__match_exact(index=index, inserted=position, stamp=stamp)
+            else:
+                matched = self.__match_approximate(index=index, inserted=position, stamp=stamp)
+
+            if matched is None:
+                return
+
+            matched_msgs = [self.msgs[i][position] for i, position in enumerate(matched)]
+
+            # -> Discard the messages up to the matched ones, which can no longer be part of a set
+            for i, position in enumerate(matched):
+                self.dropped += position
+                del self.stamps[i][:position + 1], self.msgs[i][:position + 1]
+
+            self.matched += 1
+
+        self.callback(*matched_msgs)
+
+    def __match_exact(self, index: int, inserted: int, stamp: int) -> list or None:
+        """
+        :param index: The index of the topic of the new message
+        :param inserted: The position of the new message in its buffer
+        :return: The position of the message with the given stamp in every buffer, None if a buffer has none
+        """
+
+        matched = []
+
+        for i, stamps in enumerate(self.stamps):
+            if i == index:
+                matched.append(inserted)
+                continue
+
+            position = bisect_left(stamps, stamp)
+
+            if position == len(stamps) or stamps[position] != stamp:
+                return None
+
+            matched.append(position)
+
+        return matched
+
+    def __match_approximate(self, index: int, inserted: int, stamp: int) -> list or None:
+        """
+        :param index: The index of the topic of the new message
+        :param inserted: The position of the new message in its buffer
+        :return: The position of the closest message to the stamp in every buffer,
+                 None if the stamps of the set span more than slop
+        """
+
+        matched = []
+        earliest = latest = stamp
+
+        for i, stamps in enumerate(self.stamps):
+            if i == index:
+                matched.append(inserted)
+                continue
+
+            if not stamps:
+                return None
+
+            # -> The closest stamp is on either side of the insertion point
+            position = bisect_left(stamps, stamp)
+
+            if position == len(stamps) or (position > 0 and stamp - stamps[position - 1] <= stamps[position] - stamp):
+                position -= 1
+
+            # -> Stamps on both sides of the new message can each be within slop of it, but not of each other
+            earliest = min(earliest, stamps[position])
+            latest = max(latest, stamps[position])
+
+            if latest - earliest > self.slop:
+                return None
+
+            matched.append(position)
+
+        return matched
+
+    def get_stats(self) -> dict:
+        return {
+            "matched": self.matched,
+            "dropped": self.dropped,
+            "buffered": [len(stamps) for stamps in self.stamps]
+        }
+
+    def destroy(self) -> None:
+        """
+        Destroy the subscriptions of the synchronizer
+        """
+
+        for subscription in self.subscriptions:
+            self.node.destroy_subscription(subscriber=subscription)
+
+        self.subscriptions = []
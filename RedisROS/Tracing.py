@@ -0,0 +1,241 @@
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from threading import Lock as ThreadLock
+
+from RedisROS import Config
+
+
+def get_callback_name(callback) -> str:
+    """
+    Get a readable name for an endpoint spun by a callback group
+    """
+
+    for attribute in ("topic", "name", "ref"):
+        value = getattr(callback, attribute, None)
+
+        if value:
+            return f"{type(callback).__name__} {value}"
+
+    return type(callback).__name__
+
+
+class Tracer:
+    def __init__(self) -> None:
+        """
+        Process-wide callback tracer and sampling profiler, hooked into the callback groups and the subscribers dispatch.
+        Both are opt-in (see Config.tracing and Config.profile_sample_rate) and can be switched at runtime.
+        """
+
+        self.enabled = Config.tracing
+        self.profile_sample_rate = Config.profile_sample_rate
+
+        # -> Trace events, oldest events are discarded once the buffer is full
+        self.events = deque(maxlen=Config.trace_buffer_size)
+
+        # -> Profiles accumulated per callback name
+        self.profiles = {}
+        self.__profiles_lock = ThreadLock()
+        self.__local = threading.local()
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether callbacks need to go through the tracer, checked by the hooks before anything else
+        """
+        return self.enabled or self.profile_sample_rate > 0
+
+    # ================================================================== Control
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def set_profile_sample_rate(self, rate: float) -> None:
+        """
+        Set the fraction of callbacks run under cProfile, 0 to disable profiling
+
+        :param rate: The sampling rate, between 0 and 1
+        """
+
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Profile sample rate must be between 0 and 1, got {rate}")
+
+        self.profile_sample_rate = rate
+
+    def clear(self) -> None:
+        """
+        Discard the recorded events and profiles
+        """
+
+        self.events.clear()
+
+        with self.__profiles_lock:
+            self.profiles = {}
+
+    # ================================================================== Hooks
+    def call(self,
+             name: str,
+             function,
+             args: tuple = (),
+             category: str = "callback",
+             submitted: float = None,
+             wait: float = None,
+             msg_id: str = None):
+        """
+        Call a function, recording a trace event and sampling a profile if enabled
+
+        :param name: The name of the callback
+        :param function: The function to call
+        :param args: The arguments of the function
+        :param category: The category of the event, the callback group name or "dispatch"
+        :param submitted: The time.perf_counter() time the call was queued at, used to compute the queue wait time
+        :param wait: The queue wait time (s), if known by the caller
+        :param msg_id: The id of the message causing the call
+        :return: The return value of the function
+        """
+
+        start = time.perf_counter()
+
+        if submitted is not None:
+            wait = start - submitted
+
+        try:
+            if self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate:
+                return self.__profile(name=name, function=function, args=args)
+
+            return function(*args)
+
+        finally:
+            if self.enabled:
+                self.record(name=name, category=category, start=start, duration=time.perf_counter() - start, wait=wait, msg_id=msg_id)
+
+    def __profile(self, name: str, function, args: tuple):
+        # -> Only one profiler can be active per thread, nested callbacks are covered by the outer profile
+        if getattr(self.__local, "profiling", False):
+            return function(*args)
+
+        profiler = cProfile.Profile()
+
+        try:
+            profiler.enable()
+        except ValueError:
+            # -> Another profiling tool is active
+            return function(*args)
+
+        self.__local.profiling = True
+
+        try:
+            return function(*args)
+
+        finally:
+            profiler.disable()
+            self.__local.profiling = False
+
+            with self.__profiles_lock:
+                if name in self.profiles:
+                    self.profiles[name].add(profiler)
+                else:
+                    self.profiles[name] = pstats.Stats(profiler)
+
+    def record(self,
+               name: str,
+               category: str,
+               start: float,
+               duration: float,
+               wait: float = None,
+               msg_id: str = None) -> None:
+        """
+        Record a trace event
+
+        :param start: The time.perf_counter() start time of the event
+        :param duration: The duration of the event (s)
+        """
+
+        thread = threading.current_thread()
+
+        self.events.append({
+            "name": name,
+            "category": category,
+            "start": start,
+            "duration": duration,
+            "wait": wait,
+            "msg_id": msg_id,
+            "thread_id": thread.ident,
+            "thread_name": thread.name
+        })
+
+    # ================================================================== Export
+    def get_chrome_trace(self) -> dict:
+        """
+        Get the recorded events in the Chrome trace-event format, viewable in chrome://tracing or Perfetto
+        """
+
+        pid = os.getpid()
+        trace_events = []
+        threads = {}
+
+        for event in list(self.events):
+            threads[event["thread_id"]] = event["thread_name"]
+
+            args = {}
+            if event["wait"] is not None:
+                args["wait_us"] = event["wait"] * 1e6
+            if event["msg_id"] is not None:
+                args["msg_id"] = event["msg_id"]
+
+            trace_events.append({
+                "name": event["name"],
+                "cat": event["category"],
+                "ph": "X",
+                "ts": event["start"] * 1e6,
+                "dur": event["duration"] * 1e6,
+                "pid": pid,
+                "tid": event["thread_id"],
+                "args": args
+            })
+
+        # -> Name the threads
+        for thread_id, thread_name in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Write the recorded events to a Chrome trace-event JSON file
+        """
+
+        with open(path, "w") as f:
+            json.dump(self.get_chrome_trace(), f)
+
+    def get_profile_stats(self, name: str = None) -> pstats.Stats or None:
+        """
+        Get the profile accumulated for a callback, or for every callback if no name is given
+
+        :return: The profile statistics, None if no callback was profiled
+        """
+
+        with self.__profiles_lock:
+            if name is not None:
+                return self.profiles.get(name)
+
+            if not self.profiles:
+                return None
+
+            stats = pstats.Stats()
+
+            for profile in self.profiles.values():
+                stats.add(profile)
+
+            return stats
+
+
+# -> Process-wide tracer
+tracer = Tracer()
@@ -0,0 +1,43 @@
+import struct
+
+# -> Batches start with a magic never starting a single message, followed by length-prefixed (u32) messages
+BATCH_MAGIC = b"RB"
+FRAME_HEADER = struct.Struct("<I")
+
+
+def pack_batch(payloads: list) -> bytes:
+    """
+    Pack serialised messages into a single batch payload
+
+    :param payloads: The serialised messages, in order
+    """
+
+    parts = [BATCH_MAGIC]
+
+    for payload in payloads:
+        parts.append(FRAME_HEADER.pack(len(payload)))
+        parts.append(payload)
+
+    return b"".join(parts)
+
+
+def is_batch(data: bytes) -> bool:
+    return data[:len(BATCH_MAGIC)] == BATCH_MAGIC
+
+
+def unpack_batch(data: bytes) -> list:
+    """
+    Unpack a batch payload into its serialised messages, in order
+    """
+
+    payloads = []
+    offset = len(BATCH_MAGIC)
+
+    while offset < len(data):
+        length, = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+
+        payloads.append(data[offset: offset + length])
+        offset += length
+
+    return payloads
@@ -0,0 +1,32 @@
+import lzma
+import zlib
+
+# -> Compression codecs, by name, as (compress, decompress) functions taking and returning bytes
+codecs = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress)
+}
+
+
+def register_codec(name: str, compress, decompress) -> None:
+    """
+    Register a compression codec, usable through QoS_profile(compression=name).
+    The codec must be registered in the processes of both the publishers and the subscribers.
+
+    :param name: The name of the codec
+    :param compress: Function compressing bytes
+    :param decompress: Function decompressing the output of compress, given as a bytes-like object
+                       (a zero-copy memoryview for the messages read from shared memory)
+    """
+    codecs[name] = (compress, decompress)
+
+
+def get_codec(name: str) -> tuple:
+    """
+    Get the (compress, decompress) functions of a registered codec
+    """
+
+    if name not in codecs:
+        raise ValueError(f"Unknown compression codec: {name}, must be one of {list(codecs)} or registered with register_codec")
+
+    return codecs[name]
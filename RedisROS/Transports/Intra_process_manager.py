@@ -0,0 +1,100 @@
+import os
+import socket
+import random
+import string
+from threading import Lock as ThreadLock
+
+
+class Intra_process_manager:
+    def __init__(self):
+        """
+        Process-local registry of the intra-process subscribers of every topic.
+
+        Messages published by an intra-process publisher are handed over by reference to the
+        subscribers registered here, without going through json or redis.
+        Handed over messages are shared between all local subscribers and must be treated as read-only.
+        """
+
+        # -> Initialise the registry properties
+        self.__pid = None
+        self.__process_id = None
+        self.__subscribers = {}
+        self.__registry_lock = ThreadLock()
+
+    @property
+    def process_id(self) -> str:
+        """
+        Unique identifier of the current process, used to tag messages that have already been handed over locally
+        """
+
+        # -> Reset the registry if the process was forked
+        if self.__pid != os.getpid():
+            self.__reset()
+
+        return self.__process_id
+
+    def __reset(self) -> None:
+        # -> Generate a new process id
+        self.__pid = os.getpid()
+        self.__process_id = f"{socket.gethostname()}:{self.__pid}:" \
+                            + ''.join([random.choice(string.ascii_letters + string.digits) for _ in range(8)])
+
+        # -> Forget the subscribers inherited from the parent process
+        self.__subscribers = {}
+
+    def register_subscriber(self, topic: str, subscriber) -> None:
+        """
+        Register a subscriber as an intra-process recipient of the given topic
+
+        :param topic: The topic the subscriber is subscribed to
+        :param subscriber: The subscriber, must expose hand_over(msg)
+        """
+
+        # -> Ensure the registry belongs to the current process
+        self.process_id
+
+        with self.__registry_lock:
+            # -> Copy on write to allow lock-free iteration when publishing
+            self.__subscribers[topic] = self.__subscribers.get(topic, ()) + (subscriber,)
+
+    def unregister_subscriber(self, topic: str, subscriber) -> None:
+        """
+        Remove a subscriber from the intra-process recipients of the given topic
+
+        :param topic: The topic the subscriber is subscribed to
+        :param subscriber: The subscriber to remove
+        """
+
+        with self.__registry_lock:
+            subscribers = tuple(s for s in self.__subscribers.get(topic, ()) if s is not subscriber)
+
+            if subscribers:
+                self.__subscribers[topic] = subscribers
+            else:
+                self.__subscribers.pop(topic, None)
+
+    def get_subscribers(self, topic: str) -> tuple:
+        """
+        Get the intra-process subscribers of the given topic
+        """
+        return self.__subscribers.get(topic, ())
+
+    def publish(self, topic: str, msg) -> int:
+        """
+        Hand over a message to every intra-process subscriber of the given topic
+
+        :param topic: The topic to publish to
+        :param msg: The message (with metadata) to hand over
+        :return: The number of subscribers the message was handed over to
+        """
+
+        subscribers = self.__subscribers.get(topic, ())
+
+        for subscriber in subscribers:
+            subscriber.hand_over(msg)
+
+        return len(subscribers)
+
+
+# -> Process-wide intra-process registry
+intra_process_manager = Intra_process_manager()
@@ -0,0 +1,89 @@
+import struct
+
+# -> Messages start with a fixed-layout header: magic, flags, publisher number (u32), sequence number (u64)
+#    and timestamp (u64, ns since epoch), followed by the JSON serialised message.
+#    The other metadata of the publisher is registered once, under the publisher number (see get_publisher_key).
+MESSAGE_MAGIC = b"RM"
+MESSAGE_HEADER = struct.Struct("<2sBIQQ")
+
+# -> Header flags
+FLAG_CHUNK = 0x01
+FLAG_COMPRESSED = 0x02              # (Compressed with the codec of the publisher metadata)
+
+# -> Chunks of large messages start with their offset and the total size of the message (u32)
+CHUNK_HEADER = struct.Struct("<II")
+
+# -> Counter the publisher numbers are drawn from
+PUBLISHER_COUNTER_KEY = "Publisher_numbers"
+
+
+def get_publisher_key(number: int) -> str:
+    """
+    Get the key of the metadata of a publisher
+    """
+    return f"Publisher_metadata/{number}"
+
+
+def get_subscribers_channel(topic: str) -> str:
+    """
+    Get the channel the subscribers of a topic announce their subscription, unsubscription and content filter on,
+    so the publishers refresh their cached view of the subscribers
+    """
+    return f"{topic}/~subscribers"
+
+
+def pack_message(number: int, seq: int, timestamp: int, payload: bytes, flags: int = 0) -> bytes:
+    """
+    Prefix a serialised message with its header
+
+    :param number: The number of the publisher
+    :param seq: The sequence number of the message
+    :param timestamp: The publication time (ns since epoch)
+    :param payload: The serialised message
+    :param flags: The payload encoding flags
+    """
+    return MESSAGE_HEADER.pack(MESSAGE_MAGIC, flags, number, seq, timestamp) + payload
+
+
+def pack_chunks(number: int, seq: int, timestamp: int, payload: bytes, chunk_size: int, flags: int = 0) -> list:
+    """
+    Split a serialised message into chunks of at most chunk_size bytes, each with its own header
+
+    :return: The chunks, in order
+    """
+
+    view = memoryview(payload)
+    header = MESSAGE_HEADER.pack(MESSAGE_MAGIC, flags | FLAG_CHUNK, number, seq, timestamp)
+
+    return [header + CHUNK_HEADER.pack(offset, len(payload)) + view[offset: offset + chunk_size]
+            for offset in range(0, len(payload), chunk_size)]
+
+
+def is_message(data: bytes) -> bool:
+    return data[:len(MESSAGE_MAGIC)] == MESSAGE_MAGIC
+
+
+def is_chunk(data: bytes) -> bool:
+    return is_message(data) and bool(data[len(MESSAGE_MAGIC)] & FLAG_CHUNK)
+
+
+def unpack_chunk(payload: bytes) -> tuple:
+    """
+    Split the payload of a chunk into its offset in the message, the total size of the message and its data
+    """
+
+    offset, total = CHUNK_HEADER.unpack_from(payload)
+
+    return offset, total, payload[CHUNK_HEADER.size:]
+
+
+def unpack_message(data: bytes) -> tuple:
+    """
+    Split a message into its header fields and its serialised message
+
+    :return: flags, publisher number, sequence number, timestamp (ns) and payload
+    """
+
+    _, flags, number, seq, timestamp = MESSAGE_HEADER.unpack_from(data)
+
+    return flags, number, seq, timestamp, data[MESSAGE_HEADER.size:]
@@ -0,0 +1,185 @@
+import os
+import socket
+import struct
+import random
+import string
+from threading import Lock as ThreadLock
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+# -> Ring layout
+# Header: last written sequence number (u64), slot count (u32), slot size (u32)
+HEADER = struct.Struct("<QII")
+# Slot header: sequence number of the slot content (u64), payload length (u32), padding (u32)
+SLOT_HEADER = struct.Struct("<QII")
+
+# -> Prefix of the notifications referencing a ring slot
+#    (shm:<ring name>:<slot sequence number>:<publisher number>:<first message seq>:<last message seq>)
+SHM_REF_PREFIX = b"shm:"
+
+# -> Prefix of the notifications of the rings closed by their publisher (shm_close:<ring name>)
+SHM_CLOSE_PREFIX = b"shm_close:"
+
+# -> Name of the current host
+HOST = socket.gethostname()
+
+
+def get_shm_channel(topic: str, host: str) -> str:
+    """
+    Get the redis channel used to notify the same-host subscribers of a topic
+    """
+    return f"{topic}/~shm/{host}"
+
+
+class Shm_ring_buffer:
+    def __init__(self,
+                 name: str = None,
+                 slot_count: int = 16,
+                 slot_size: int = 256 * 1024,
+                 create: bool = True
+                 ) -> None:
+        """
+        Single-writer ring buffer of fixed-size slots in a shared memory segment.
+
+        The writer invalidates a slot before overwriting it and commits its sequence number last,
+        readers check the sequence number before and after reading to detect overwritten slots.
+
+        :param name: The name of the shared memory segment. If None, a random name is generated.
+        :param slot_count: The number of slots in the ring (ignored when attaching)
+        :param slot_size: The maximum payload size of a slot in bytes (ignored when attaching)
+        :param create: If True, create the segment, otherwise attach to an existing one
+        """
+
+        if create:
+            # -> Generate a short random name (some platforms limit segment names to 30 characters)
+            if name is None:
+                name = "rr_" + ''.join([random.choice(string.ascii_letters + string.digits) for _ in range(12)])
+
+            # -> Create the segment and initialise the header
+            self.shm = SharedMemory(name=name,
+                                    create=True,
+                                    size=HEADER.size + slot_count * (SLOT_HEADER.size + slot_size))
+            HEADER.pack_into(self.shm.buf, 0, 0, slot_count, slot_size)
+
+        else:
+            self.shm = self.__attach(name=name)
+            _, slot_count, slot_size = HEADER.unpack_from(self.shm.buf, 0)
+
+        # -> Initialise the ring properties
+        self.name = name
+        self.owner = create
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.seq = 0
+
+        self.__write_lock = ThreadLock()
+
+    @staticmethod
+    def __attach(name: str) -> SharedMemory:
+        # -> Attach without registering the segment with the resource tracker,
+        #    otherwise it would be unlinked when the reading process exits
+        try:
+            return SharedMemory(name=name, track=False)     # Python >= 3.13
+
+        except TypeError:
+            shm = SharedMemory(name=name)
+
+            if os.name == "posix":
+                resource_tracker.unregister(shm._name, "shared_memory")
+
+            return shm
+
+    def __slot_offset(self, seq: int) -> int:
+        return HEADER.size + (seq % self.slot_count) * (SLOT_HEADER.size + self.slot_size)
+
+    def write(self, data: bytes) -> int or None:
+        """
+        Write a payload in the next slot of the ring
+
+        :param data: The payload to write
+        :return: The sequence number of the written slot, or None if the payload does not fit in a slot
+        """
+
+        if len(data) > self.slot_size:
+            return None
+
+        with self.__write_lock:
+            seq = self.seq + 1
+            offset = self.__slot_offset(seq=seq)
+
+            # -> Invalidate the slot, write the payload, then commit the sequence number
+            SLOT_HEADER.pack_into(self.shm.buf, offset, 0, 0, 0)
+            self.shm.buf[offset + SLOT_HEADER.size: offset + SLOT_HEADER.size + len(data)] = data
+            SLOT_HEADER.pack_into(self.shm.buf, offset, seq, len(data), 0)
+            HEADER.pack_into(self.shm.buf, 0, seq, self.slot_count, self.slot_size)
+
+            self.seq = seq
+
+        return seq
+
+    def view(self, seq: int) -> memoryview or None:
+        """
+        Get a zero-copy view of the payload of a slot.
+        The view is only valid until the writer wraps around the ring: what was read through it must be discarded
+        unless is_valid(seq) still holds once done reading, and the view must be released before closing the ring.
+
+        :param seq: The sequence number of the slot to read
+        :return: The view of the payload, or None if the slot was already overwritten
+        """
+
+        offset = self.__slot_offset(seq=seq)
+
+        slot_seq, length, _ = SLOT_HEADER.unpack_from(self.shm.buf, offset)
+
+        if slot_seq != seq:
+            return None
+
+        return self.shm.buf[offset + SLOT_HEADER.size: offset + SLOT_HEADER.size + length]
+
+    def is_valid(self, seq: int) -> bool:
+        """
+        Check whether a slot still holds the payload of the given sequence number
+        """
+        return SLOT_HEADER.unpack_from(self.shm.buf, self.__slot_offset(seq=seq))[0] == seq
+
+    def read(self, seq: int) -> bytes or None:
+        """
+        Copy the payload of a slot out of the ring
+
+        :param seq: The sequence number of the slot to read
+        :return: The payload, or None if the slot was overwritten before or while reading it
+        """
+
+        view = self.view(seq=seq)
+
+        if view is None:
+            return None
+
+        try:
+            payload = bytes(view)
+        finally:
+            view.release()
+
+        # -> Check the slot was not overwritten while reading
+        if not self.is_valid(seq=seq):
+            return None
+
+        return payload
+
+    def close(self) -> None:
+        """
+        Close the ring, and unlink the segment if the ring owns it
+        """
+
+        self.shm.close()
+
+        if self.owner:
+            # -> Re-register the segment first, a reader forked from this process shares
+            #    its resource tracker and may have unregistered it when attaching
+            if os.name == "posix":
+                resource_tracker.register(self.shm._name, "shared_memory")
+
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
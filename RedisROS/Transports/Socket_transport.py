@@ -0,0 +1,209 @@
+import os
+import socket
+import struct
+import random
+import string
+import tempfile
+from threading import Thread, Lock as ThreadLock
+
+# -> Frame header: payload length (u32)
+FRAME_HEADER = struct.Struct("<I")
+
+
+def get_p2p_channel(topic: str) -> str:
+    """
+    Get the redis channel used to announce the p2p publishers of a topic
+    """
+    return f"{topic}/~p2p"
+
+
+class Socket_server:
+    def __init__(self,
+                 transport: str = "tcp",
+                 bind_host: str = "0.0.0.0",
+                 advertised_host: str = None,
+                 send_timeout: float = 1.
+                 ) -> None:
+        """
+        Publisher side of the p2p data plane. Accepts subscriber connections and sends them length-prefixed frames.
+
+        :param transport: "tcp", or "unix" for same-host connections through a unix domain socket
+        :param bind_host: The interface to listen on (tcp only)
+        :param advertised_host: The host name subscribers connect to (tcp only). If None, the host name is used.
+        :param send_timeout: The time (s) after which a subscriber not reading its frames is disconnected
+        """
+
+        self.transport = transport
+        self.send_timeout = send_timeout
+        self.path = None
+
+        if transport == "unix":
+            # -> Listen on a unix socket in the temporary directory
+            self.path = os.path.join(tempfile.gettempdir(),
+                                     "redisros_" + ''.join([random.choice(string.ascii_letters + string.digits) for _ in range(12)]) + ".sock")
+
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.bind(self.path)
+            self.address = f"unix://{self.path}"
+
+        elif transport == "tcp":
+            # -> Listen on a free port
+            self.socket = socket.create_server((bind_host, 0))
+
+            if advertised_host is None:
+                advertised_host = socket.gethostname()
+
+            self.address = f"tcp://{advertised_host}:{self.socket.getsockname()[1]}"
+
+        else:
+            raise ValueError(f"Unknown p2p transport: {transport}, must be 'tcp' or 'unix'")
+
+        self.socket.listen()
+
+        # -> Initialise the connected peers
+        self.peers = []
+        self.__peers_lock = ThreadLock()
+        self.closed = False
+
+        # -> Serialise the sends, a frame partially written by sendall could otherwise be interleaved with another one
+        self.__send_lock = ThreadLock()
+
+        # -> Accept connections in the background
+        self.accept_thread = Thread(target=self.__accept_loop, daemon=True)
+        self.accept_thread.start()
+
+    @property
+    def peer_count(self) -> int:
+        return len(self.peers)
+
+    def __accept_loop(self) -> None:
+        while not self.closed:
+            try:
+                peer, _ = self.socket.accept()
+            except OSError:
+                break
+
+            if self.transport == "tcp":
+                peer.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            peer.settimeout(self.send_timeout)
+
+            with self.__peers_lock:
+                self.peers = self.peers + [peer]
+
+    def send(self, data: bytes) -> int:
+        """
+        Send a frame to every connected peer, disconnecting the peers that fail to receive it
+
+        :return: The number of peers the frame was sent to
+        """
+
+        frame = FRAME_HEADER.pack(len(data)) + data
+        failed = []
+
+        with self.__send_lock:
+            for peer in self.peers:
+                try:
+                    peer.sendall(frame)
+                except OSError:
+                    failed.append(peer)
+
+        if failed:
+            with self.__peers_lock:
+                self.peers = [peer for peer in self.peers if peer not in failed]
+
+            for peer in failed:
+                peer.close()
+
+        return len(self.peers)
+
+    def close(self) -> None:
+        self.closed = True
+
+        # -> Stop accepting connections
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+        # -> Disconnect peers
+        with self.__peers_lock:
+            for peer in self.peers:
+                peer.close()
+            self.peers = []
+
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Socket_client:
+    def __init__(self, address: str, on_frame, on_close=None) -> None:
+        """
+        Subscriber side of the p2p data plane. Connects to a publisher and reads its frames in the background.
+
+        :param address: The address advertised by the publisher (tcp://host:port or unix://path)
+        :param on_frame: Function called with the payload of every received frame
+        :param on_close: Function called with the address when the connection is closed
+        """
+
+        self.address = address
+        self.on_frame = on_frame
+        self.on_close = on_close
+
+        # -> Connect to the publisher
+        scheme, location = address.split("://", 1)
+
+        if scheme == "unix":
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(location)
+
+        else:
+            host, port = location.rsplit(":", 1)
+            self.socket = socket.create_connection((host, int(port)))
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.closed = False
+
+        # -> Read frames in the background
+        self.read_thread = Thread(target=self.__read_loop, daemon=True)
+        self.read_thread.start()
+
+    def __read_loop(self) -> None:
+        stream = self.socket.makefile("rb")
+
+        try:
+            while not self.closed:
+                header = stream.read(FRAME_HEADER.size)
+
+                if len(header) < FRAME_HEADER.size:
+                    break
+
+                payload = stream.read(FRAME_HEADER.unpack(header)[0])
+
+                if self.closed:
+                    break
+
+                self.on_frame(payload)
+
+        except (OSError, ValueError):
+            pass
+
+        finally:
+            stream.close()
+            self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+        if self.on_close is not None:
+            self.on_close(self.address)
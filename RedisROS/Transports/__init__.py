@@ -0,0 +1,30 @@
+
+# Import classes and functions
+from .Intra_process_manager import Intra_process_manager, intra_process_manager
+from .Shm_ring_buffer import Shm_ring_buffer
+from .Socket_transport import Socket_server, Socket_client
+from .Batch_framing import pack_batch, unpack_batch, is_batch
+from .Message_framing import pack_message, unpack_message, is_message, pack_chunks, unpack_chunk, is_chunk
+from .Codecs import register_codec, get_codec
+
+# Import submodules
+
+# -> Define public api
+__all__ = [
+    "Intra_process_manager",
+    "intra_process_manager",
+    "Shm_ring_buffer",
+    "Socket_server",
+    "Socket_client",
+    "pack_batch",
+    "unpack_batch",
+    "is_batch",
+    "pack_message",
+    "unpack_message",
+    "is_message",
+    "pack_chunks",
+    "unpack_chunk",
+    "is_chunk",
+    "register_codec",
+    "get_codec"
+]
@@ -1,6 +1,9 @@
 
 # Import classes and functions
 from RedisROS.Node import Node
+from RedisROS.QoS import QoS_profile
+from RedisROS.Content_filter import Content_filter
+from RedisROS.Synchronizer import Time_synchronizer
 # from RedisROS.Config import *
 # from RedisROS.Callback_groups import *
 
@@ -11,6 +14,9 @@ import RedisROS.Nodes
 # -> Define public api
 __all__ = [
     'Node',
+    'QoS_profile',
+    'Content_filter',
+    'Time_synchronizer',
     'Endpoints',
     'Nodes'
 ]
@@ -0,0 +1,15 @@
+
+"""
+RedisROS benchmark suite.
+
+Every benchmark module exposes a run(...) function returning a JSON serialisable dict of results.
+Run the whole suite from the repository root:
+    python -m benchmarks --backend memory --output results.json
+
+Compare two result files:
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+from .utils import summarise, get_metadata, reset_backend
+
+__all__ = ["summarise", "get_metadata", "reset_backend"]
@@ -0,0 +1,94 @@
+
+"""
+Run the RedisROS benchmark suite and write the results as JSON.
+
+Requires a local redis server (with the RedisJSON and RedisGraph modules) on the default port,
+unless run with --backend memory.
+Run from the repository root:
+    python -m benchmarks --backend memory --output results.json
+    python -m benchmarks --backend redis --only pubsub_latency registration_scaling --quick
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from RedisROS import Config
+
+from . import pubsub_throughput, pubsub_latency, shared_variable_contention, node_lifecycle, registration_scaling
+from . import intra_process_latency, p2p_throughput, connection_latency, service_rpc
+from .utils import get_metadata, reset_backend
+
+# -> Benchmarks of the suite, with their full and quick parameters
+suite = {
+    "pubsub_throughput": (pubsub_throughput.run, {}, {"msg_count": 500}),
+    "pubsub_latency": (pubsub_latency.run, {}, {"msg_count": 200}),
+    "shared_variable_contention": (shared_variable_contention.run, {}, {"op_count": 50}),
+    "node_lifecycle": (node_lifecycle.run, {}, {"node_count": 20}),
+    "registration_scaling": (registration_scaling.run, {}, {"graph_sizes": [10, 100], "sample_count": 5}),
+    "intra_process_latency": (intra_process_latency.run, {}, {"msg_count": 200}),
+    "p2p_throughput": (p2p_throughput.run, {}, {"pairs": 2, "msg_count": 200}),
+    "service_rpc": (service_rpc.run, {}, {"call_count": 200}),
+}
+
+# -> Benchmarks only meaningful against a redis server
+redis_suite = {
+    "connection_latency": (connection_latency.run, {}, {"round_trips": 500}),
+}
+
+
+def run_suite(backend: str, only: list = None, quick: bool = False) -> dict:
+    """
+    Run the benchmarks of the suite one after the other
+
+    :param backend: The communication backend benchmarked, "redis" or "memory"
+    :param only: The names of the benchmarks to run. If None, every benchmark is run.
+    :param quick: Whether to use reduced parameters, for a fast smoke run
+    :return: The metadata of the run and the results of every benchmark
+    """
+
+    Config.backend = backend
+
+    benchmarks = dict(suite)
+    if backend == "redis":
+        benchmarks.update(redis_suite)
+
+    if only is not None:
+        unknown = [name for name in only if name not in benchmarks]
+
+        if unknown:
+            raise ValueError(f"Unknown benchmarks: {unknown}, available benchmarks for the {backend} backend: {list(benchmarks.keys())}")
+
+        benchmarks = {name: benchmarks[name] for name in only}
+
+    results = {"metadata": get_metadata(backend=backend), "results": {}}
+
+    for name, (run, params, quick_params) in benchmarks.items():
+        print(f"Running {name}...", file=sys.stderr)
+
+        reset_backend(backend=backend)
+
+        start = time.perf_counter()
+        results["results"][name] = run(**(quick_params if quick else params))
+        results["results"][name]["elapsed_s"] = time.perf_counter() - start
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--only", nargs="+", default=None, help="Names of the benchmarks to run")
+    parser.add_argument("--quick", action="store_true", help="Use reduced parameters for a fast smoke run")
+    parser.add_argument("--output", default=None, help="Path of the JSON results file, printed to stdout if not given")
+    args = parser.parse_args()
+
+    results = run_suite(backend=args.backend, only=args.only, quick=args.quick)
+
+    if args.output is None:
+        print(json.dumps(results, indent=4))
+
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,93 @@
+
+"""
+Compare two benchmark result files and report the metrics that changed by more than a threshold.
+
+Run from the repository root:
+    python -m benchmarks.compare baseline.json results.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+
+# -> Metric name fragments for which higher is better (in the metric name or its parents, e.g. requests_per_s/8),
+#    every other metric is a duration
+higher_is_better = ("rate", "mb_s", "per_s", "received")
+
+# -> Metrics describing the run rather than measuring it
+ignored_metrics = ("n", "msg_size", "sent", "pairs", "threads", "nodes", "graph_size", "elapsed_s")
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """
+    Flatten nested results into {"benchmark/case/metric": value} for the numeric leaves
+    """
+
+    flat = {}
+
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+
+        if isinstance(value, dict):
+            flat.update(flatten(results=value, prefix=path))
+
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and key not in ignored_metrics:
+            flat[path] = value
+
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list:
+    """
+    Compare the results of two runs
+
+    :param baseline: The baseline results file content
+    :param current: The current results file content
+    :param threshold: The relative change above which a metric is reported
+    :return: The (metric, baseline value, current value, relative change, regression) of the changed metrics
+    """
+
+    baseline = flatten(results=baseline["results"])
+    current = flatten(results=current["results"])
+
+    changes = []
+
+    for metric in sorted(baseline.keys() & current.keys()):
+        if baseline[metric] == 0:
+            continue
+
+        change = (current[metric] - baseline[metric]) / abs(baseline[metric])
+
+        if abs(change) < threshold:
+            continue
+
+        if any(fragment in name for name in metric.split("/")[1:] for fragment in higher_is_better):
+            regression = change < 0
+        else:
+            regression = change > 0
+
+        changes.append((metric, baseline[metric], current[metric], change, regression))
+
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change above which a metric is reported")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    with open(args.current) as f:
+        current = json.load(f)
+
+    changes = compare(baseline=baseline, current=current, threshold=args.threshold)
+
+    for metric, baseline_value, current_value, change, regression in changes:
+        print(f"{'REGRESSION' if regression else 'improvement':<12} {metric:<70} {baseline_value:14.2f} -> {current_value:14.2f} ({change:+.1%})")
+
+    # -> Exit with an error if any metric regressed, so the comparison can gate a CI job
+    sys.exit(1 if any(change[-1] for change in changes) else 0)
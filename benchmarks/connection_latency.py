@@ -0,0 +1,82 @@
+
+"""
+Round-trip latency of the redis backend over tcp and over a unix domain socket.
+
+Requires a local redis server listening on both tcp and a unix socket (unixsocket in redis.conf).
+Run from the repository root:
+    python -m benchmarks.connection_latency --unix-socket-path /var/run/redis/redis-server.sock
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS.Backends import Redis_backend
+
+from .utils import summarise
+
+CHANNEL = "/benchmark/connection_latency"
+ROUND_TRIPS = 5000
+
+
+def measure_ping(backend: Redis_backend, round_trips: int = ROUND_TRIPS) -> list:
+    latencies = []
+
+    for _ in range(round_trips):
+        start = time.perf_counter()
+        backend.client.ping()
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def measure_pubsub(backend: Redis_backend, round_trips: int = ROUND_TRIPS) -> list:
+    latencies = []
+
+    pubsub = backend.pubsub()
+    pubsub.subscribe(CHANNEL)
+
+    # -> Let the subscription settle
+    time.sleep(0.1)
+
+    for _ in range(round_trips):
+        start = time.perf_counter()
+        backend.publish(CHANNEL, "ping")
+
+        while pubsub.get_message(timeout=1.) is None:
+            pass
+
+        latencies.append(time.perf_counter() - start)
+
+    pubsub.close()
+
+    return latencies
+
+
+def run(host: str = "localhost", port: int = 6379, unix_socket_path: str = None, round_trips: int = ROUND_TRIPS) -> dict:
+    connections = {"tcp": {"host": host, "port": port, "unix_socket_path": None}}
+
+    if unix_socket_path is not None:
+        connections["uds"] = {"unix_socket_path": unix_socket_path}
+
+    results = {}
+
+    for label, connection in connections.items():
+        backend = Redis_backend(client_name="connection_latency", connection=connection)
+
+        results[label] = {
+            "ping_us": summarise(measure_ping(backend=backend, round_trips=round_trips)),
+            "pubsub_us": summarise(measure_pubsub(backend=backend, round_trips=round_trips))
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--unix-socket-path", default=None)
+    args = parser.parse_args()
+
+    print(json.dumps(run(host=args.host, port=args.port, unix_socket_path=args.unix_socket_path), indent=4))
@@ -0,0 +1,82 @@
+
+"""
+Latency of a publisher/subscriber pair living in the same process, with and without intra-process communications.
+
+Requires a local redis server (with the RedisJSON and RedisGraph modules) on the default port,
+unless run with --backend memory.
+Run from the repository root:
+    python -m benchmarks.intra_process_latency
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, reset_backend
+
+TOPIC = "intra_process_latency"
+MSG_COUNT = 2000
+TIMEOUT = 1.
+
+
+def measure_latency(intra_process_comms: bool, msg_count: int = MSG_COUNT) -> list:
+    """
+    Publish messages one at a time and spin the subscriber until each message is received
+
+    :param intra_process_comms: Whether the publisher and subscriber use intra-process communications
+    :param msg_count: The number of messages to publish
+    :return: The list of latencies (s)
+    """
+
+    pub_node = Node(ref="latency_pub", namespace=NAMESPACE, intra_process_comms=intra_process_comms)
+    sub_node = Node(ref="latency_sub", namespace=NAMESPACE, intra_process_comms=intra_process_comms)
+
+    latencies = []
+
+    def callback(msg):
+        latencies.append(time.perf_counter() - msg["sent"])
+
+    publisher = pub_node.create_publisher(msg_type="dict", topic=TOPIC)
+    subscriber = sub_node.create_subscription(msg_type="dict", topic=TOPIC, callback=callback, manual_spin=True)
+
+    # -> Let the redis subscription settle
+    time.sleep(0.1)
+
+    for i in range(msg_count):
+        publisher.publish(msg={"sent": time.perf_counter(), "seq": i})
+
+        # -> Spin the subscriber until the message is received
+        deadline = time.perf_counter() + TIMEOUT
+        while len(latencies) <= i and time.perf_counter() < deadline:
+            subscriber.spin()
+
+    # -> Drain the redis copies of the messages before tearing down
+    for _ in range(msg_count):
+        subscriber.spin()
+
+    pub_node.destroy_node()
+    sub_node.destroy_node()
+
+    return latencies
+
+
+def run(msg_count: int = MSG_COUNT) -> dict:
+    return {
+        label: {"latency_us": summarise(measure_latency(intra_process_comms=intra_process_comms, msg_count=msg_count))}
+        for label, intra_process_comms in [("backend", False), ("intra", True)]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--msgs", type=int, default=MSG_COUNT)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(msg_count=args.msgs), indent=4))
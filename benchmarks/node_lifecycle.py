@@ -0,0 +1,75 @@
+
+"""
+Node startup and teardown time, for empty nodes and for nodes carrying a publisher, a subscriber and a shared variable.
+
+Run from the repository root:
+    python -m benchmarks.node_lifecycle --backend memory --nodes 100
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, reset_backend
+
+NODE_COUNT = 100
+
+
+def measure_lifecycle(node_count: int, with_endpoints: bool) -> dict:
+    """
+    Create node_count nodes one after the other, then destroy them
+
+    :param node_count: The number of nodes to create
+    :param with_endpoints: Whether every node declares a publisher, a subscriber and a shared variable
+    :return: The startup and teardown time summaries (us)
+    """
+
+    nodes = []
+    startup = []
+    teardown = []
+
+    for i in range(node_count):
+        start = time.perf_counter()
+
+        node = Node(ref=f"lifecycle_{i}", namespace=NAMESPACE)
+
+        if with_endpoints:
+            node.create_publisher(msg_type="str", topic=f"lifecycle_{i}")
+            node.create_subscription(msg_type="str", topic=f"lifecycle_{i}", callback=lambda msg: None, manual_spin=True)
+            node.declare_shared_variable(name=f"lifecycle_{i}", value=0)
+
+        startup.append(time.perf_counter() - start)
+        nodes.append(node)
+
+    for node in nodes:
+        start = time.perf_counter()
+        node.destroy_node()
+        teardown.append(time.perf_counter() - start)
+
+    return {
+        "nodes": node_count,
+        "startup_us": summarise(startup),
+        "teardown_us": summarise(teardown)
+    }
+
+
+def run(node_count: int = NODE_COUNT) -> dict:
+    return {
+        "empty": measure_lifecycle(node_count=node_count, with_endpoints=False),
+        "with_endpoints": measure_lifecycle(node_count=node_count, with_endpoints=True)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--nodes", type=int, default=NODE_COUNT)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(node_count=args.nodes), indent=4))
@@ -0,0 +1,116 @@
+
+"""
+Aggregate throughput of many publisher/subscriber pairs, with payloads going through redis or through the p2p data plane.
+
+Requires a local redis server (with the RedisJSON and RedisGraph modules) on the default port,
+unless run with --backend memory.
+Run from the repository root:
+    python -m benchmarks.p2p_throughput --pairs 8 --msgs 2000 --size 1024
+"""
+
+import argparse
+import json
+import time
+from threading import Thread
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, rate, reset_backend
+
+TIMEOUT = 30.
+PAIRS = 8
+MSG_COUNT = 2000
+MSG_SIZE = 1024
+
+
+def measure_throughput(p2p_comms: bool, pairs: int, msg_count: int, msg_size: int) -> tuple:
+    """
+    Publish msg_count messages on every pair concurrently, and spin every subscriber until all messages are received
+
+    :param p2p_comms: Whether the pairs use the p2p data plane
+    :param pairs: The number of publisher/subscriber pairs
+    :param msg_count: The number of messages published by every publisher
+    :param msg_size: The size of the payload of every message (bytes)
+    :return: The elapsed time (s) and the number of messages received
+    """
+
+    received = [0] * pairs
+    nodes = []
+    publishers = []
+    subscribers = []
+
+    for i in range(pairs):
+        def callback(msg, i=i):
+            received[i] += 1
+
+        pub_node = Node(ref=f"throughput_pub_{i}", namespace=NAMESPACE, p2p_comms=p2p_comms)
+        sub_node = Node(ref=f"throughput_sub_{i}", namespace=NAMESPACE, p2p_comms=p2p_comms)
+        nodes += [pub_node, sub_node]
+
+        subscribers.append(sub_node.create_subscription(msg_type="str", topic=f"throughput_{i}", callback=callback, manual_spin=True))
+        publishers.append(pub_node.create_publisher(msg_type="str", topic=f"throughput_{i}"))
+
+    # -> Let the subscriptions settle and the p2p connections establish
+    for subscriber in subscribers:
+        subscriber.spin()
+    time.sleep(0.5)
+
+    payload = "x" * msg_size
+
+    def publish(publisher):
+        for _ in range(msg_count):
+            publisher.publish(msg=payload)
+
+    def spin(i, deadline):
+        while received[i] < msg_count and time.perf_counter() < deadline:
+            subscribers[i].spin()
+
+    start = time.perf_counter()
+
+    threads = [Thread(target=publish, args=(publisher,)) for publisher in publishers]
+    threads += [Thread(target=spin, args=(i, start + TIMEOUT)) for i in range(pairs)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    for node in nodes:
+        node.destroy_node()
+
+    return elapsed, sum(received)
+
+
+def run(pairs: int = PAIRS, msg_count: int = MSG_COUNT, msg_size: int = MSG_SIZE) -> dict:
+    results = {}
+
+    for label, p2p_comms in [("backend", False), ("p2p", True)]:
+        elapsed, received = measure_throughput(p2p_comms=p2p_comms, pairs=pairs, msg_count=msg_count, msg_size=msg_size)
+
+        results[label] = {
+            "pairs": pairs,
+            "msg_size": msg_size,
+            "sent": pairs * msg_count,
+            "received": received,
+            "delivery_rate": rate(count=received, elapsed=elapsed),
+            "delivery_mb_s": rate(count=received, elapsed=elapsed) * msg_size / 1e6
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--pairs", type=int, default=PAIRS)
+    parser.add_argument("--msgs", type=int, default=MSG_COUNT)
+    parser.add_argument("--size", type=int, default=MSG_SIZE)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(pairs=args.pairs, msg_count=args.msgs, msg_size=args.size), indent=4))
@@ -0,0 +1,78 @@
+
+"""
+End-to-end latency percentiles of a publisher/subscriber pair, one message in flight at a time.
+
+Run from the repository root:
+    python -m benchmarks.pubsub_latency --backend memory --msgs 2000
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, spin_until, reset_backend
+
+TOPIC = "pubsub_latency"
+MSG_COUNT = 2000
+MSG_SIZES = [64, 1024, 64 * 1024]
+TIMEOUT = 1.
+
+
+def measure_latency(msg_count: int, msg_size: int) -> dict:
+    """
+    Publish messages one at a time and spin the subscriber until each message is received
+
+    :param msg_count: The number of messages to publish
+    :param msg_size: The size of the padding of every message (bytes)
+    :return: The latency summary (us) and the number of lost messages
+    """
+
+    pub_node = Node(ref="latency_pub", namespace=NAMESPACE)
+    sub_node = Node(ref="latency_sub", namespace=NAMESPACE)
+
+    latencies = []
+
+    def callback(msg):
+        latencies.append(time.perf_counter() - msg["sent"])
+
+    publisher = pub_node.create_publisher(msg_type="dict", topic=TOPIC)
+    subscriber = sub_node.create_subscription(msg_type="dict", topic=TOPIC, callback=callback, manual_spin=True)
+
+    # -> Let the subscription settle
+    subscriber.spin()
+    time.sleep(0.1)
+
+    padding = "x" * msg_size
+
+    for i in range(msg_count):
+        publisher.publish(msg={"sent": time.perf_counter(), "padding": padding})
+        spin_until(condition=lambda: len(latencies) > i, spin=subscriber.spin, timeout=TIMEOUT)
+
+    pub_node.destroy_node()
+    sub_node.destroy_node()
+
+    return {
+        "msg_size": msg_size,
+        "lost": msg_count - len(latencies),
+        "latency_us": summarise(latencies)
+    }
+
+
+def run(msg_count: int = MSG_COUNT, msg_sizes: list = MSG_SIZES) -> dict:
+    return {f"{msg_size}B": measure_latency(msg_count=msg_count, msg_size=msg_size) for msg_size in msg_sizes}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--msgs", type=int, default=MSG_COUNT)
+    parser.add_argument("--sizes", type=int, nargs="+", default=MSG_SIZES)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(msg_count=args.msgs, msg_sizes=args.sizes), indent=4))
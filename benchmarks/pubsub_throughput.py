@@ -0,0 +1,107 @@
+
+"""
+Publish throughput of a single publisher, and delivery throughput to a subscriber, for several payload sizes.
+
+Run from the repository root:
+    python -m benchmarks.pubsub_throughput --backend memory --msgs 5000
+    python -m benchmarks.pubsub_throughput --backend memory --msgs 5000 --batch-period 0.005
+"""
+
+import argparse
+import json
+import time
+from threading import Thread
+
+from RedisROS import Config
+from RedisROS import Node, QoS_profile
+
+from .utils import NAMESPACE, rate, spin_until, reset_backend
+
+TOPIC = "pubsub_throughput"
+MSG_COUNT = 5000
+MSG_SIZES = [64, 1024, 64 * 1024]
+
+
+def measure_throughput(msg_count: int, msg_size: int, batch_period: float = None) -> dict:
+    """
+    Publish msg_count messages as fast as possible while a subscriber is spun in another thread
+
+    :param msg_count: The number of messages to publish
+    :param msg_size: The size of the payload of every message (bytes)
+    :param batch_period: The batching period of the publisher (s). If None, messages are not batched.
+    :return: The publish and delivery rates (msg/s and MB/s)
+    """
+
+    pub_node = Node(ref="throughput_pub", namespace=NAMESPACE)
+    sub_node = Node(ref="throughput_sub", namespace=NAMESPACE)
+
+    received = [0]
+
+    def callback(msg):
+        received[0] += 1
+
+    publisher = pub_node.create_publisher(msg_type="str", topic=TOPIC, qos_profile=QoS_profile(batch_period=batch_period))
+    subscriber = sub_node.create_subscription(msg_type="str", topic=TOPIC, callback=callback, manual_spin=True)
+
+    # -> Let the subscription settle
+    subscriber.spin()
+    time.sleep(0.1)
+
+    payload = "x" * msg_size
+    publish_elapsed = [0.]
+
+    def publish():
+        start = time.perf_counter()
+
+        for _ in range(msg_count):
+            publisher.publish(msg=payload)
+
+        publish_elapsed[0] = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    publish_thread = Thread(target=publish)
+    publish_thread.start()
+
+    spin_until(condition=lambda: received[0] >= msg_count, spin=subscriber.spin, timeout=30.)
+    delivery_elapsed = time.perf_counter() - start
+
+    publish_thread.join()
+
+    pub_node.destroy_node()
+    sub_node.destroy_node()
+
+    return {
+        "msg_size": msg_size,
+        "batch_period": batch_period,
+        "sent": msg_count,
+        "received": received[0],
+        "publish_rate": rate(count=msg_count, elapsed=publish_elapsed[0]),
+        "delivery_rate": rate(count=received[0], elapsed=delivery_elapsed),
+        "delivery_mb_s": rate(count=received[0], elapsed=delivery_elapsed) * msg_size / 1e6
+    }
+
+
+def run(msg_count: int = MSG_COUNT, msg_sizes: list = MSG_SIZES, batch_period: float = None) -> dict:
+    results = {f"{msg_size}B": measure_throughput(msg_count=msg_count, msg_size=msg_size) for msg_size in msg_sizes}
+
+    # -> Compare with the same messages sent in batches
+    if batch_period is not None:
+        for msg_size in msg_sizes:
+            results[f"{msg_size}B_batched"] = measure_throughput(msg_count=msg_count, msg_size=msg_size, batch_period=batch_period)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--msgs", type=int, default=MSG_COUNT)
+    parser.add_argument("--sizes", type=int, nargs="+", default=MSG_SIZES)
+    parser.add_argument("--batch-period", type=float, default=None)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(msg_count=args.msgs, msg_sizes=args.sizes, batch_period=args.batch_period), indent=4))
@@ -0,0 +1,77 @@
+
+"""
+Cost of registering endpoints in the communication graph as the graph grows.
+
+Every declaration rewrites the comm graph under a lock, so the cost of a declaration grows with the number
+of endpoints already registered. This measures the declaration time at increasing graph sizes.
+
+Run from the repository root:
+    python -m benchmarks.registration_scaling --backend memory --sizes 10 100 500
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, reset_backend
+
+GRAPH_SIZES = [10, 100, 500]
+SAMPLE_COUNT = 20
+
+
+def measure_registration(graph_size: int, sample_count: int) -> dict:
+    """
+    Fill the comm graph with graph_size publishers, then time sample_count more declarations and their removal
+
+    :param graph_size: The number of publishers registered before measuring
+    :param sample_count: The number of declarations measured
+    :return: The declaration and undeclaration time summaries (us)
+    """
+
+    node = Node(ref="registration", namespace=NAMESPACE)
+
+    for i in range(graph_size):
+        node.create_publisher(msg_type="str", topic=f"registration_{i}")
+
+    declare = []
+    undeclare = []
+
+    for i in range(sample_count):
+        start = time.perf_counter()
+        publisher = node.create_publisher(msg_type="str", topic=f"registration_sample_{i}")
+        declare.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        node.destroy_publisher(publisher=publisher)
+        undeclare.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    node.destroy_node()
+    teardown = time.perf_counter() - start
+
+    return {
+        "graph_size": graph_size,
+        "declare_us": summarise(declare),
+        "undeclare_us": summarise(undeclare),
+        "node_teardown_ms": teardown * 1e3
+    }
+
+
+def run(graph_sizes: list = GRAPH_SIZES, sample_count: int = SAMPLE_COUNT) -> dict:
+    return {str(graph_size): measure_registration(graph_size=graph_size, sample_count=sample_count) for graph_size in graph_sizes}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=GRAPH_SIZES)
+    parser.add_argument("--samples", type=int, default=SAMPLE_COUNT)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(graph_sizes=args.sizes, sample_count=args.samples), indent=4))
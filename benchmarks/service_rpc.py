@@ -0,0 +1,86 @@
+"""
+Round-trip latency percentiles of a service/client pair, one call in flight at a time,
+and the request rate of concurrent calls handled in parallel by the service.
+
+Run from the repository root:
+    python -m benchmarks.service_rpc --backend memory --calls 2000
+"""
+
+import argparse
+import json
+import time
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, rate, reset_backend
+
+SERVICE = "service_rpc"
+CALL_COUNT = 2000
+CONCURRENCY = [1, 8, 64]
+TIMEOUT = 5.
+
+
+def measure_rpc(call_count: int, concurrency: list) -> dict:
+    """
+    Call an echo service sequentially, then with several calls in flight at once
+
+    :param call_count: The number of calls of every measure
+    :param concurrency: The numbers of calls kept in flight at once
+    :return: The round-trip latency summary (us), and the request rate for every concurrency
+    """
+
+    srv_node = Node(ref="rpc_srv", namespace=NAMESPACE)
+    cli_node = Node(ref="rpc_cli", namespace=NAMESPACE)
+
+    srv_node.create_service(srv_type="echo", srv_name=SERVICE, callback=lambda request: request)
+    client = cli_node.create_client(srv_type="echo", srv_name=SERVICE)
+    client.wait_for_service(timeout_sec=TIMEOUT)
+
+    # -> Round trips, one call in flight at a time
+    latencies = []
+
+    for i in range(call_count):
+        start = time.perf_counter()
+        client.call(request={"i": i}, timeout=TIMEOUT)
+        latencies.append(time.perf_counter() - start)
+
+    results = {"round_trip_us": summarise(latencies), "requests_per_s": {}}
+
+    # -> Request rate with several calls in flight
+    for in_flight in concurrency:
+        start = time.perf_counter()
+        futures = []
+
+        for i in range(call_count):
+            futures.append(client.call_async(request={"i": i}))
+
+            if len(futures) >= in_flight:
+                futures.pop(0).result(timeout=TIMEOUT)
+
+        for future in futures:
+            future.result(timeout=TIMEOUT)
+
+        results["requests_per_s"][str(in_flight)] = rate(count=call_count, elapsed=time.perf_counter() - start)
+
+    srv_node.destroy_node()
+    cli_node.destroy_node()
+
+    return results
+
+
+def run(call_count: int = CALL_COUNT, concurrency: list = CONCURRENCY) -> dict:
+    return measure_rpc(call_count=call_count, concurrency=concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--calls", type=int, default=CALL_COUNT)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(call_count=args.calls, concurrency=args.concurrency), indent=4))
@@ -0,0 +1,89 @@
+
+"""
+Shared_variable get/set latency with several nodes accessing the same global shared variable concurrently.
+
+Run from the repository root:
+    python -m benchmarks.shared_variable_contention --backend memory --threads 1 4 8
+"""
+
+import argparse
+import json
+import time
+from threading import Thread, Barrier
+
+from RedisROS import Config
+from RedisROS import Node
+
+from .utils import NAMESPACE, summarise, rate, reset_backend
+
+VARIABLE = "contended_variable"
+OP_COUNT = 500
+THREAD_COUNTS = [1, 4, 8]
+
+
+def measure_contention(thread_count: int, op_count: int) -> dict:
+    """
+    Every thread declares the shared variable on its own node, then alternately sets and gets it
+
+    :param thread_count: The number of threads (and nodes) accessing the shared variable
+    :param op_count: The number of set/get pairs performed by every thread
+    :return: The get and set latency summaries (us) and the aggregate operation rate
+    """
+
+    nodes = [Node(ref=f"contention_{i}", namespace=NAMESPACE) for i in range(thread_count)]
+    shared_variables = [node.declare_shared_variable(name=VARIABLE, value=0, variable_type="int") for node in nodes]
+
+    get_latencies = [[] for _ in range(thread_count)]
+    set_latencies = [[] for _ in range(thread_count)]
+    barrier = Barrier(thread_count)
+
+    def access(i):
+        shared_variable = shared_variables[i]
+        barrier.wait()
+
+        for op in range(op_count):
+            start = time.perf_counter()
+            shared_variable.set_value(value=op)
+            set_latencies[i].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            shared_variable.get_value()
+            get_latencies[i].append(time.perf_counter() - start)
+
+    threads = [Thread(target=access, args=(i,)) for i in range(thread_count)]
+
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    for node in nodes:
+        node.destroy_node()
+
+    return {
+        "threads": thread_count,
+        "ops_per_s": rate(count=2 * thread_count * op_count, elapsed=elapsed),
+        "set_us": summarise([latency for latencies in set_latencies for latency in latencies]),
+        "get_us": summarise([latency for latencies in get_latencies for latency in latencies])
+    }
+
+
+def run(op_count: int = OP_COUNT, thread_counts: list = THREAD_COUNTS) -> dict:
+    return {f"{thread_count}_threads": measure_contention(thread_count=thread_count, op_count=op_count) for thread_count in thread_counts}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="redis", choices=["redis", "memory"])
+    parser.add_argument("--ops", type=int, default=OP_COUNT)
+    parser.add_argument("--threads", type=int, nargs="+", default=THREAD_COUNTS)
+    args = parser.parse_args()
+
+    Config.backend = args.backend
+    reset_backend(backend=args.backend)
+
+    print(json.dumps(run(op_count=args.ops, thread_counts=args.threads), indent=4))
@@ -0,0 +1,112 @@
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+from RedisROS import Config
+
+NAMESPACE = "benchmark"
+
+
+def summarise(samples: list, scale: float = 1e6) -> dict:
+    """
+    Summarise a list of samples
+
+    :param samples: The samples to summarise (s)
+    :param scale: The factor the samples are multiplied by, the default reports microseconds
+    :return: The sample count, mean, percentiles and extremes of the samples
+    """
+
+    if not samples:
+        return {"n": 0}
+
+    samples = sorted(sample * scale for sample in samples)
+
+    def percentile(p: float) -> float:
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+    return {
+        "n": len(samples),
+        "mean": statistics.mean(samples),
+        "min": samples[0],
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p99": percentile(0.99),
+        "max": samples[-1]
+    }
+
+
+def rate(count: int, elapsed: float) -> float:
+    """
+    Get the rate (1/s) of count events over elapsed seconds
+    """
+    return count / elapsed if elapsed > 0 else 0.
+
+
+def spin_until(condition, spin, timeout: float = 5.) -> bool:
+    """
+    Call spin until condition is True or the timeout (s) expires
+
+    :return: Whether the condition was met
+    """
+
+    deadline = time.perf_counter() + timeout
+
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+
+        spin()
+
+    return True
+
+
+def reset_backend(backend: str) -> None:
+    """
+    Clear the state left by a previous benchmark. Only the in-memory backend is cleared,
+    benchmarks never flush a redis server and run in their own namespace instead.
+    """
+
+    if backend == "memory":
+        from RedisROS.Backends import memory_store
+        memory_store.clear()
+
+
+def get_git_commit() -> str or None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_metadata(backend: str) -> dict:
+    """
+    Get the context the benchmarks were run in, so results can be compared across versions and machines
+    """
+
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            redisros_version = version("RedisROS")
+        except PackageNotFoundError:
+            redisros_version = None
+
+    except ImportError:
+        redisros_version = None
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "redisros_version": redisros_version,
+        "git_commit": get_git_commit(),
+        "backend": backend,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "config": {
+            "intra_process_comms": Config.intra_process_comms,
+            "shm_comms": Config.shm_comms,
+            "p2p_comms": Config.p2p_comms
+        }
+    }
@@ -1,7 +1,5 @@
 from setuptools import setup, find_packages
 
-from time
-
 # -> Fetch documentation from readme
 with open("README.md", "r") as fh:
     long_description = fh.read()
@@ -14,7 +12,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/vguillet/RedisROS",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=["redis", "python-redis-lock"],
     keywords=["ROS", "ROS2", "event-based", "python", "redis", "robotics"],
     python_requires=">= 3.8",
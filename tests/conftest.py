@@ -0,0 +1,20 @@
+import pytest
+
+from RedisROS import Config
+from RedisROS.Backends import memory_store
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    """
+    Run every test on a fresh in-memory backend
+    """
+
+    backend = Config.backend
+    Config.backend = "memory"
+    memory_store.clear()
+
+    yield memory_store
+
+    memory_store.clear()
+    Config.backend = backend
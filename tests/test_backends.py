@@ -0,0 +1,70 @@
+import pytest
+
+from RedisROS import Node
+from RedisROS.Backends import Memory_backend, create_backend
+from RedisROS.Backends.Memory_backend import Memory_store
+
+from .utils import spin_until
+
+
+def test_create_backend():
+    assert isinstance(create_backend(), Memory_backend)
+    assert isinstance(create_backend(backend="memory"), Memory_backend)
+
+    backend = Memory_backend()
+    assert create_backend(backend=backend) is backend
+
+    with pytest.raises(ValueError):
+        create_backend(backend="unknown")
+
+
+def test_memory_pubsub_and_key_value():
+    backend = Memory_backend(store=Memory_store())
+    received = []
+
+    pubsub = backend.pubsub()
+    pubsub.subscribe(**{"channel": received.append})
+
+    assert backend.numsub("channel", "other") == [(b"channel", 1), (b"other", 0)]
+    assert backend.publish("channel", "data") == 1
+    assert backend.publish("other", "data") == 0
+
+    pubsub.get_message(timeout=1.)
+    assert received[0]["data"] == b"data"
+
+    # -> Values are stored as bytes, as with redis
+    backend.set(key="key", value=1)
+    assert backend.get(key="key") == b"1"
+    assert backend.incr(key="key", amount=2) == 3
+
+    backend.delete(key="key")
+    assert not backend.exists(key="key")
+
+    backend.push(key="list", value="a")
+    backend.push(key="list", value="b", max_length=1)
+    assert backend.get_list(key="list") == [b"b"]
+
+    pubsub.close()
+    assert backend.numsub("channel") == [(b"channel", 0)]
+
+
+def test_nodes_communicate_and_register_on_memory_backend():
+    publisher_node = Node(ref="publisher_node")
+    subscriber_node = Node(ref="subscriber_node")
+    received = []
+
+    subscriber = subscriber_node.create_subscription(msg_type="str", topic="chatter", callback=received.append, manual_spin=True)
+    publisher = publisher_node.create_publisher(msg_type="str", topic="chatter")
+
+    publisher.publish(msg="hello")
+    assert spin_until(lambda: received == ["hello"], spin=subscriber.spin)
+
+    # -> Both nodes and their endpoints are declared in the comm graph
+    comm_graph = publisher.backend.get_comm_graph(comm_graph=publisher.comm_graph)
+    assert [entry["type"] for entry in comm_graph[publisher.parent_address]].count("publisher") == 1
+    assert [entry["type"] for entry in comm_graph[subscriber.parent_address]].count("subscriber") == 1
+
+    publisher_node.destroy_node()
+    subscriber_node.destroy_node()
+
+    assert publisher.parent_address not in publisher.backend.get_comm_graph(comm_graph=publisher.comm_graph)
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from RedisROS import Node, QoS_profile
+from RedisROS.Nodes import Recorder, Player
+
+from .utils import spin_until
+
+
+def record(path, publish) -> None:
+    node = Node(ref="recorded")
+    recorder = Recorder(path=str(path), topics=["odom"])
+    recorder.run()
+
+    publish(node)
+
+    assert spin_until(lambda: recorder.get_info()["count"] == 10)
+
+    recorder.destroy_node()
+    node.destroy_node()
+
+
+def test_record_and_replay(tmp_path):
+    record(tmp_path, lambda node: [node.create_publisher(msg_type="int", topic="odom").publish(msg=i) for i in range(10)])
+
+    node = Node(ref="replayed")
+    received = []
+    subscriber = node.create_subscription(msg_type="int", topic="odom", callback=received.append, manual_spin=True)
+
+    player = Player(path=str(tmp_path))
+    assert player.play(time_factor=None) == 10
+
+    assert spin_until(lambda: received == list(range(10)), spin=subscriber.spin)
+    assert subscriber.get_stats()["lost"] == 0
+
+    player.destroy_node()
+    node.destroy_node()
+
+
+def test_replayed_messages_outlive_their_lifespan(tmp_path):
+    def publish(node):
+        publisher = node.create_publisher(msg_type="int", topic="odom", qos_profile=QoS_profile(lifespan=0.5))
+
+        for i in range(10):
+            publisher.publish(msg=i)
+
+    record(tmp_path, publish)
+    time.sleep(0.6)
+
+    node = Node(ref="replayed")
+    received = []
+    subscriber = node.create_subscription(msg_type="int", topic="odom", callback=received.append, manual_spin=True)
+
+    player = Player(path=str(tmp_path))
+    player.play(time_factor=None)
+
+    assert spin_until(lambda: received == list(range(10)), spin=subscriber.spin)
+    assert subscriber.get_stats()["expired"] == 0
+
+    player.destroy_node()
+    node.destroy_node()
+
+
+def test_topics_recorded_while_recording_are_subscribed_by_the_recording_thread(tmp_path):
+    node = Node(ref="recorded")
+    recorder = Recorder(path=str(tmp_path))
+    recorder.run()
+
+    subscribed_from = []
+    subscribe = recorder.pubsub.subscribe
+    recorder.pubsub.subscribe = lambda *args, **kwargs: (subscribed_from.append(threading.current_thread()), subscribe(*args, **kwargs))
+
+    recorder.record_topic(topic="scan")
+    assert spin_until(lambda: recorder.backend.numsub("/scan")[0][1] == 1)
+    assert subscribed_from == [recorder.recording_thread]
+
+    publisher = node.create_publisher(msg_type="int", topic="scan")
+
+    for i in range(5):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: recorder.get_info()["topics"] == {"/scan": 5})
+
+    recorder.destroy_node()
+    node.destroy_node()
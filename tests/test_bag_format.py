@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from RedisROS.Bag import Bag_writer, Bag_reader, INDEX_FILE
+
+SECOND = 1000000000
+
+
+def write_bag(path) -> None:
+    writer = Bag_writer(path=str(path), segment_size=1000)
+    writer.add_publisher(number=1, metadata={"msg_type": "int", "parent_node_ref": "talker", "publisher_id": "talker"})
+
+    for i in range(100):
+        writer.write(topic="/odom" if i % 2 else "/scan", data=b"%d" % i * 10, timestamp=i * SECOND // 10)
+
+    writer.close()
+
+
+def test_bag_segments_and_time_index(tmp_path):
+    write_bag(tmp_path)
+
+    reader = Bag_reader(path=str(tmp_path))
+    info = reader.get_info()
+
+    assert info["segments"] > 1
+    assert info["count"] == 100 and info["topics"] == {"/odom": 50, "/scan": 50}
+    assert info["duration"] == pytest.approx(9.9)
+    assert reader.publishers[1]["publisher_id"] == "talker"
+
+    # -> Reading from a time seeks through the time index, filtering by topic
+    messages = list(reader.read(topics=["/odom"], start=5 * SECOND, end=6 * SECOND))
+    assert [timestamp for timestamp, _, _ in messages] == [i * SECOND // 10 for i in range(51, 61, 2)]
+    assert all(topic == "/odom" for _, topic, _ in messages)
+    assert bytes(messages[0][2]) == b"51" * 10
+
+    # -> Bags are never overwritten
+    with pytest.raises(FileExistsError):
+        Bag_writer(path=str(tmp_path))
+
+
+def test_bag_index_is_rebuilt_from_the_segments(tmp_path):
+    write_bag(tmp_path)
+    info = Bag_reader(path=str(tmp_path)).get_info()
+
+    # -> An interrupted recording leaves no index
+    os.remove(os.path.join(tmp_path, INDEX_FILE))
+
+    assert Bag_reader(path=str(tmp_path)).get_info() == info
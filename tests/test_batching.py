@@ -0,0 +1,39 @@
+from RedisROS import Node, QoS_profile
+from RedisROS.Transports.Batch_framing import pack_batch, is_batch, unpack_batch
+
+from .utils import spin_until
+
+
+def test_batch_framing_round_trip():
+    payloads = [b"", b"a", b"RB" * 100]
+
+    data = pack_batch(payloads=payloads)
+
+    assert is_batch(data)
+    assert unpack_batch(data) == payloads
+
+
+def test_publisher_coalesces_messages_into_batches():
+    node = Node(ref="batched")
+    received = []
+    batch_sizes = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="batched", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="batched", qos_profile=QoS_profile(batch_period=0.05, batch_max_count=4))
+
+    # -> Count the payloads sent on the topic
+    pubsub = node.backend.pubsub()
+    pubsub.subscribe(**{"/batched": lambda message: batch_sizes.append(len(unpack_batch(message["data"])))})
+
+    for i in range(10):
+        publisher.publish(msg=i)
+
+    # -> Two full batches are sent at once, the rest once the batch period elapses
+    assert spin_until(lambda: received == list(range(10)), spin=lambda: (subscriber.spin(), pubsub.get_message()))
+    assert spin_until(lambda: batch_sizes == [4, 4, 2], spin=pubsub.get_message)
+
+    assert publisher.stats.sent == subscriber.stats.received == 10
+    assert subscriber.get_stats()["lost"] == 0
+
+    pubsub.close()
+    node.destroy_node()
@@ -0,0 +1,25 @@
+from benchmarks.__main__ import run_suite
+from benchmarks.compare import compare
+
+
+def test_quick_suite_runs_on_memory_backend():
+    results = run_suite(backend="memory", only=["pubsub_latency", "service_rpc"], quick=True)
+
+    assert results["metadata"]["backend"] == "memory"
+    assert results["results"]["pubsub_latency"]["64B"]["lost"] == 0
+    assert results["results"]["service_rpc"]["requests_per_s"]["8"] > 0
+
+
+def test_compare_reports_regressions():
+    baseline = {"results": {"service_rpc": {"round_trip_us": {"p50": 100.}, "requests_per_s": {"8": 1000.}},
+                            "pubsub_throughput": {"64B": {"received": 500, "delivery_rate": 1000.}}}}
+    current = {"results": {"service_rpc": {"round_trip_us": {"p50": 150.}, "requests_per_s": {"8": 2000.}},
+                           "pubsub_throughput": {"64B": {"received": 400, "delivery_rate": 1050.}}}}
+
+    changes = {metric: regression for metric, _, _, _, regression in compare(baseline=baseline, current=current, threshold=0.1)}
+
+    assert changes == {
+        "service_rpc/round_trip_us/p50": True,
+        "service_rpc/requests_per_s/8": False,
+        "pubsub_throughput/64B/received": True
+    }
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from RedisROS import Node, QoS_profile
+from RedisROS.Endpoints.Core.Subscriber.Message_queue import Message_queue
+
+from .utils import spin_until
+
+
+def fill(queue: Message_queue, count: int) -> list:
+    return [queue.put(i) for i in range(count)]
+
+
+def drain(queue: Message_queue) -> list:
+    return list(iter(queue.get, None))
+
+
+def test_overflow_policies():
+    drops = []
+
+    queue = Message_queue(depth=3, overflow_policy="drop_oldest", on_drop=lambda: drops.append(1))
+    assert fill(queue, 5) == [True] * 5
+    assert drain(queue) == [2, 3, 4]
+    assert (queue.dropped, len(drops), queue.high_watermark) == (2, 2, 3)
+
+    queue = Message_queue(depth=3, overflow_policy="drop_newest")
+    assert fill(queue, 5) == [True] * 3 + [False] * 2
+    assert drain(queue) == [0, 1, 2]
+
+    with pytest.raises(ValueError):
+        Message_queue(depth=3, overflow_policy="drop_everything")
+
+
+def test_block_policy_waits_for_room():
+    queue = Message_queue(depth=1, overflow_policy="block", block_timeout=1.)
+    queue.put(0)
+
+    # -> The producer is released by the consumer
+    threading.Timer(0.05, queue.get).start()
+
+    start = time.monotonic()
+    assert queue.put(1)
+    assert 0.04 < time.monotonic() - start < 1.
+
+    # -> Or drops the message once the timeout elapses
+    queue.block_timeout = 0.01
+    assert not queue.put(2)
+    assert queue.dropped == 1
+
+
+def test_bounded_subscriber_drops_and_counts_the_oldest_messages():
+    node = Node(ref="bounded")
+    received = []
+
+    publisher = node.create_publisher(msg_type="int", topic="bounded")
+    subscriber = node.create_subscription(msg_type="int", topic="bounded", callback=received.append, manual_spin=True,
+                                          qos_profile=QoS_profile(depth=5))
+
+    publisher.publish(msg=0)
+    assert spin_until(lambda: received == [0], spin=subscriber.spin)
+
+    for i in range(1, 21):
+        publisher.publish(msg=i)
+
+    # -> The reader thread fills the queue without spinning
+    assert spin_until(lambda: subscriber.queue.dropped == 15)
+
+    subscriber.spin()
+
+    # -> The dropped messages are missing from the sequence of the publisher
+    stats = subscriber.get_stats()
+    assert received == [0] + list(range(16, 21))
+    assert (stats["dropped"], stats["lost"], stats["queue_high_watermark"]) == (15, 15, 5)
+
+    node.destroy_node()
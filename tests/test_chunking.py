@@ -0,0 +1,45 @@
+from RedisROS import Node, QoS_profile
+from RedisROS.Transports.Message_framing import pack_chunks, unpack_message, unpack_chunk, is_chunk
+
+from .utils import spin_until
+
+
+def test_chunks_reassemble_the_payload():
+    payload = bytes(range(256)) * 10
+
+    chunks = pack_chunks(number=1, seq=0, timestamp=0, payload=payload, chunk_size=1000)
+
+    assert len(chunks) == 3 and all(is_chunk(chunk) for chunk in chunks)
+
+    parts = [unpack_chunk(unpack_message(chunk)[4]) for chunk in chunks]
+    assert [(offset, total) for offset, total, _ in parts] == [(0, 2560), (1000, 2560), (2000, 2560)]
+    assert b"".join(data for _, _, data in parts) == payload
+
+
+def test_large_messages_are_streamed_in_chunks():
+    node = Node(ref="chunked")
+    received = []
+    chunk_count = []
+
+    subscriber = node.create_subscription(msg_type="list", topic="chunked", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="list", topic="chunked", qos_profile=QoS_profile(chunk_size=1000))
+
+    pubsub = node.backend.pubsub()
+    pubsub.subscribe(**{"/chunked": lambda message: chunk_count.append(is_chunk(message["data"]))})
+
+    large = list(range(2000))
+    publisher.publish(msg=1)
+    publisher.publish(msg=large)
+    publisher.publish(msg=2)
+
+    assert spin_until(lambda: len(received) == 3, spin=lambda: (subscriber.spin(), pubsub.get_message()))
+    assert spin_until(lambda: len(chunk_count) > 3, spin=pubsub.get_message)
+
+    # -> Only the large message is chunked, and counted once
+    assert received == [1, large, 2]
+    assert chunk_count.count(False) == 2 and chunk_count.count(True) > 1
+    assert (subscriber.stats.received, subscriber.stats.lost) == (3, 0)
+    assert subscriber.partial_messages == {}
+
+    pubsub.close()
+    node.destroy_node()
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from RedisROS import Node
+from RedisROS.Nodes import Clock, Sim_clock
+from RedisROS.Nodes.Clock import get_sim_datetime
+
+from .utils import spin_until
+
+
+def test_sim_datetime_from_anchor():
+    anchor = {"real_start": 100., "sim_start": "2020-01-01T00:00:00", "time_factor": 10.}
+
+    assert get_sim_datetime(anchor=anchor, real_time=101.5) == datetime(2020, 1, 1, 0, 0, 15)
+
+
+def test_sim_clock_follows_the_clock_anchor():
+    node = Node(ref="simulated")
+    sim_clock = Sim_clock(node=node, refresh_period=0.01)
+
+    assert sim_clock.now() is None
+
+    clock = Clock(start_datetime=datetime(2020, 1, 1), time_factor=10.)
+    clock.run()
+
+    assert spin_until(lambda: sim_clock.now() is not None)
+    assert abs(sim_clock.now() - clock.get_sim_datetime()) < timedelta(seconds=0.5)
+
+    # -> A new time factor moves the anchor, without jumping
+    before = clock.get_sim_datetime()
+    clock.set_time_factor(1000.)
+
+    assert spin_until(lambda: sim_clock.now() - before > timedelta(seconds=10))
+    assert clock.get_sim_datetime() - before < timedelta(seconds=100)
+
+    clock.destroy_node()
+    node.destroy_node()
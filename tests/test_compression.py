@@ -0,0 +1,60 @@
+import zlib
+
+import pytest
+
+from RedisROS import Node, QoS_profile
+from RedisROS.Transports import Codecs, register_codec
+
+from .utils import spin_until
+
+DOCUMENT = {"map": [[0] * 100 for _ in range(50)]}
+
+
+def exchange(qos_profile: QoS_profile) -> tuple:
+    node = Node(ref="compressed")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="map", topic="map", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="map", topic="map", qos_profile=qos_profile)
+
+    publisher.publish(msg=1)
+    publisher.publish(msg=DOCUMENT)
+
+    assert spin_until(lambda: len(received) == 2, spin=subscriber.spin)
+    assert received == [1, DOCUMENT]
+
+    stats = publisher.get_stats(), subscriber.get_stats()
+    node.destroy_node()
+
+    return stats
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_messages_above_the_threshold_are_compressed(codec):
+    publisher_stats, subscriber_stats = exchange(qos_profile=QoS_profile(compression=codec, compression_threshold=100))
+
+    # -> Only the document is compressed
+    assert publisher_stats["compression"]["count"] == subscriber_stats["compression"]["count"] == 1
+    assert publisher_stats["compression"]["ratio"] > 10
+    assert publisher_stats["bytes_sent"] < len(str(DOCUMENT))
+
+
+def test_registered_codecs(monkeypatch):
+    monkeypatch.setattr(Codecs, "codecs", dict(Codecs.codecs))
+    calls = []
+
+    def decompress(data):
+        calls.append(len(data))
+        return zlib.decompress(data)
+
+    register_codec("counting", zlib.compress, decompress)
+
+    exchange(qos_profile=QoS_profile(compression="counting", compression_threshold=100))
+    assert len(calls) == 1
+
+    node = Node(ref="unknown")
+
+    with pytest.raises(ValueError):
+        node.create_publisher(msg_type="map", topic="map", qos_profile=QoS_profile(compression="unknown"))
+
+    node.destroy_node()
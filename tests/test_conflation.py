@@ -0,0 +1,37 @@
+from RedisROS import Node, QoS_profile
+from RedisROS.Endpoints.Core.Subscriber.Message_queue import Conflating_queue
+
+from .utils import spin_until
+
+
+def test_conflating_queue_keeps_the_latest_item_per_key():
+    queue = Conflating_queue(key=lambda item: item[0])
+
+    for item in [("a", 0), ("b", 0), ("a", 1), (None, 0), (None, 1), ("b", 1)]:
+        queue.put(item)
+
+    # -> Items come out in the order their latest version arrived, items without key are never replaced
+    assert list(iter(queue.get, None)) == [("a", 1), (None, 0), (None, 1), ("b", 1)]
+    assert queue.conflated == 2
+
+
+def test_latest_only_subscriber_delivers_the_newest_message():
+    node = Node(ref="conflated")
+    received = []
+
+    publisher = node.create_publisher(msg_type="pose", topic="pose")
+    subscriber = node.create_subscription(msg_type="pose", topic="pose", callback=received.append, manual_spin=True,
+                                          qos_profile=QoS_profile(conflate=True))
+
+    for i in range(10):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: subscriber.queue.conflated == 9)
+
+    subscriber.spin()
+
+    stats = subscriber.get_stats()
+    assert received == [9]
+    assert (stats["conflated"], stats["lost"], stats["dropped"]) == (9, 0, 0)
+
+    node.destroy_node()
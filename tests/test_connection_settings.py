@@ -0,0 +1,80 @@
+import select
+import socket
+import time
+from threading import Timer
+
+import pytest
+
+from RedisROS import Config
+from RedisROS.Backends.Connection_settings import get_connection_settings
+
+
+def test_settings_priority(monkeypatch):
+    monkeypatch.setattr(Config, "redis_port", 6380)
+    monkeypatch.setenv("REDISROS_REDIS_HOST", "redis.local")
+    monkeypatch.setenv("REDISROS_REDIS_SOCKET_KEEPALIVE", "yes")
+    monkeypatch.setenv("REDISROS_REDIS_SHARDS", "redis://a:6379, unix:///tmp/b.sock")
+
+    settings = get_connection_settings(connection={"host": "override", "db": 2})
+
+    assert settings["port"] == 6380
+    assert settings["host"] == "override"
+    assert settings["db"] == 2
+    assert settings["socket_keepalive"] is True
+    assert settings["shards"] == ["redis://a:6379", "unix:///tmp/b.sock"]
+
+
+def test_unknown_setting_is_rejected():
+    with pytest.raises(ValueError):
+        get_connection_settings(connection={"hots": "localhost"})
+
+
+def test_topic_channels_are_hashed_to_the_same_shard():
+    # (Clients connect lazily, no server is needed)
+    Redis_backend = pytest.importorskip("RedisROS.Backends.Redis_backend").Redis_backend
+
+    backend = Redis_backend(connection={"unix_socket_path": "/tmp/primary.sock", "shards": ["redis://a:6379", {"host": "b"}]})
+
+    assert len(backend.channel_clients) == 3
+    assert backend.client.connection_pool.connection_kwargs["path"] == "/tmp/primary.sock"
+    assert {backend.get_shard(channel=f"/topic_{i}") for i in range(20)} == {0, 1, 2}
+    assert all(backend.get_shard(channel=f"/topic_{i}/~subscribers") == backend.get_shard(channel=f"/topic_{i}") for i in range(20))
+
+
+class Fake_connection:
+    def __init__(self):
+        self._sock, self.peer = socket.socketpair()
+
+    def can_read(self, timeout: float = 0.) -> bool:
+        return bool(select.select([self._sock], [], [], timeout)[0])
+
+
+class Fake_pubsub:
+    def __init__(self):
+        self.connection = Fake_connection()
+
+    def get_message(self, timeout: float = 0.):
+        return self.connection._sock.recv(1024) if self.connection.can_read(timeout=timeout) else None
+
+
+def test_sharded_pubsub_reads_the_first_instance_with_a_message():
+    Sharded_pubsub = pytest.importorskip("RedisROS.Backends.Redis_backend").Sharded_pubsub
+
+    pubsub = Sharded_pubsub(backend=None)
+    pubsub.pubsubs = {shard: Fake_pubsub() for shard in range(3)}
+
+    # -> A message pending on any instance is read at once
+    pubsub.pubsubs[2].connection.peer.send(b"first")
+
+    start = time.monotonic()
+    assert pubsub.get_message(timeout=1.) == b"first"
+    assert time.monotonic() - start < 0.5
+
+    # -> Otherwise every instance is waited on
+    Timer(0.05, lambda: pubsub.pubsubs[0].connection.peer.send(b"second")).start()
+
+    start = time.monotonic()
+    assert pubsub.get_message(timeout=1.) == b"second"
+    assert time.monotonic() - start < 0.5
+
+    assert pubsub.get_message(timeout=0.01) is None
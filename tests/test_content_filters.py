@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from RedisROS import Node, Config
+from RedisROS.Content_filter import Content_filter, register_filter, get_filters
+
+from .utils import spin_until
+
+
+def test_filter_conditions():
+    content_filter = Content_filter([("msg.robot.id", "in", [1, 2]), ("msg_type", "==", "obstacle")])
+
+    assert content_filter.match({"msg_type": "obstacle", "msg": {"robot": {"id": 2}}})
+    assert not content_filter.match({"msg_type": "obstacle", "msg": {"robot": {"id": 3}}})
+    assert not content_filter.match({"msg_type": "pose", "msg": {"robot": {"id": 2}}})
+
+    # -> A message missing a field fails its conditions
+    assert not content_filter.match({"msg_type": "obstacle", "msg": {"robot": 2}})
+
+    with pytest.raises(ValueError):
+        Content_filter([("msg", "~=", 1)])
+
+
+def test_filtered_subscribers_only_receive_the_matching_messages():
+    node = Node(ref="listener")
+    talker = Node(ref="talker")
+    near, robot_3 = [], []
+
+    near_subscriber = node.create_subscription(msg_type="obstacle", topic="obstacles", callback=near.append,
+                                               content_filter=[("msg.range", "<", 2)], manual_spin=True)
+    robot_3_subscriber = node.create_subscription(msg_type="obstacle", topic="obstacles", callback=robot_3.append,
+                                                  content_filter={"msg.id": 3}, manual_spin=True)
+    publisher = talker.create_publisher(msg_type="obstacle", topic="obstacles")
+
+    for i in range(10):
+        publisher.publish(msg={"id": i, "range": i})
+
+    assert spin_until(lambda: len(near) == 2 and len(robot_3) == 1,
+                      spin=lambda: (near_subscriber.spin(), robot_3_subscriber.spin()))
+
+    assert [msg["id"] for msg in near] == [0, 1]
+    assert [msg["id"] for msg in robot_3] == [3]
+
+    # -> The messages no subscriber wants are not sent, the skipped messages are not counted as lost
+    assert publisher.stats.filtered == 7
+    assert near_subscriber.stats.lost == robot_3_subscriber.stats.lost == 0
+
+    talker.destroy_node()
+    node.destroy_node()
+
+
+def test_plain_publishers_do_not_watch_the_subscribers():
+    node = Node(ref="node")
+    received = []
+
+    # -> The topic is not filtered when the publisher is created, the subscriber filters the messages itself
+    publisher = node.create_publisher(msg_type="int", topic="late_filter")
+    subscriber = node.create_subscription(msg_type="int", topic="late_filter", callback=received.append,
+                                          content_filter=[("msg", ">", 5)], manual_spin=True)
+
+    assert publisher._Publisher__announcements is None
+
+    for i in range(8):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: received == [6, 7], spin=subscriber.spin)
+    assert publisher.stats.filtered == 0
+
+    node.destroy_node()
+
+
+def test_the_filters_of_crashed_subscribers_expire(monkeypatch):
+    monkeypatch.setattr(Config, "filter_lease", 0.3)
+    monkeypatch.setattr(Config, "remote_check_period", 0.)
+
+    node = Node(ref="node")
+    filtered, unfiltered = [], []
+
+    # -> A live subscriber renews its filter
+    filtered_subscriber = node.create_subscription(msg_type="int", topic="crashed", callback=filtered.append,
+                                                   content_filter=[("msg", ">", 5)], manual_spin=True)
+
+    time.sleep(0.6)
+    assert len(get_filters(backend=filtered_subscriber.backend, topic=filtered_subscriber.topic)) == 1
+
+    # -> A crashed subscriber leaves its filter registered, without renewing it or listening to the topic
+    register_filter(backend=filtered_subscriber.backend, topic=filtered_subscriber.topic, filter_id="crashed",
+                    content_filter=Content_filter([("msg", "<", 0)]))
+    node.destroy_subscription(subscriber=filtered_subscriber)
+
+    publisher = node.create_publisher(msg_type="int", topic="crashed")
+    unfiltered_subscriber = node.create_subscription(msg_type="int", topic="crashed", callback=unfiltered.append, manual_spin=True)
+
+    # -> Once its lease expired, the messages it filters out are sent to the other subscribers
+    time.sleep(0.4)
+    publisher.publish(msg=1)
+
+    assert spin_until(lambda: unfiltered == [1], spin=unfiltered_subscriber.spin)
+    assert publisher.stats.filtered == 0
+
+    node.destroy_node()
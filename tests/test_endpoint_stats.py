@@ -0,0 +1,67 @@
+from RedisROS import Node, Config
+from RedisROS.Endpoints.Core import Histogram
+
+from .utils import spin_until
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(bounds=[1., 2., 4.])
+
+    for value in [0.5] * 90 + [3.] * 9 + [10.]:
+        histogram.record(value)
+
+    snapshot = histogram.snapshot()
+
+    assert (snapshot["count"], snapshot["min"], snapshot["max"]) == (100, 0.5, 10.)
+    assert (snapshot["p50"], snapshot["p90"], snapshot["p99"]) == (1., 1., 4.)
+    assert snapshot["buckets"] == [[1., 90], [4., 9], [None, 1]]
+
+
+def test_node_stats_count_the_traffic_of_every_endpoint():
+    node = Node(ref="stats")
+    received = []
+
+    publisher = node.create_publisher(msg_type="int", topic="counted")
+    subscriber = node.create_subscription(msg_type="int", topic="counted", callback=received.append, manual_spin=True)
+
+    for i in range(5):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(received) == 5, spin=subscriber.spin)
+
+    stats = {endpoint["type"]: endpoint for endpoint in node.get_stats()["endpoints"] if endpoint.get("topic") == "/counted"}
+
+    assert stats["Publisher"]["sent"] == 5 and stats["Publisher"]["bytes_sent"] > 0
+    assert stats["Subscriber"]["received"] == 5 and stats["Subscriber"]["callbacks"] == 5
+    assert stats["Subscriber"]["latency"]["count"] == 5
+
+    node.reset_stats()
+    assert publisher.stats.sent == subscriber.stats.received == 0
+
+    node.destroy_node()
+
+
+def test_stats_publisher_publishes_snapshots():
+    node = Node(ref="stats")
+    monitor = Node(ref="monitor")
+    snapshots = []
+
+    subscriber = monitor.create_subscription(msg_type="stats", topic=Config.stats_topic, callback=snapshots.append, manual_spin=True)
+    node.start_stats_publisher(period=0.01)
+
+    assert spin_until(lambda: any(snapshot["node"] == "stats" for snapshot in snapshots), spin=subscriber.spin)
+
+    node.destroy_node()
+    monitor.destroy_node()
+
+
+def test_shared_variables_read_their_value_once_per_spin():
+    node = Node(ref="stats")
+
+    variable = node.declare_shared_variable(name="counted", value=1, manual_spin=True)
+    variable.stats.reset()
+
+    assert variable.get_value(spin=True) == 1
+    assert variable.stats.received == 1
+
+    node.destroy_node()
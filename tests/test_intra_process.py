@@ -0,0 +1,67 @@
+from RedisROS import Node
+
+from .utils import spin_until
+
+
+def count_topic_publishes(publisher) -> list:
+    """
+    Record the payloads the publisher sends on its redis topic
+    """
+
+    sent = []
+    publish = publisher.backend.publish
+
+    def recording_publish(channel, data):
+        if channel == publisher.topic:
+            sent.append(data)
+        return publish(channel, data)
+
+    publisher.backend.publish = recording_publish
+    return sent
+
+
+def test_intra_process_skips_redis_without_remote_subscribers():
+    node = Node(ref="intra", intra_process_comms=True)
+    received = []
+
+    node.create_subscription(msg_type="dict", topic="intra", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="dict", topic="intra")
+    sent = count_topic_publishes(publisher)
+
+    msg = {"value": 1}
+    publisher.publish(msg=msg)
+
+    subscriber = node.subscriptions[0]
+    assert spin_until(lambda: received, spin=subscriber.spin)
+
+    # -> The message was handed over by reference, without being serialised for redis
+    assert received[0] is msg
+    assert sent == []
+    assert publisher.stats.sent == 1
+
+    node.destroy_node()
+
+
+def test_intra_process_publishes_to_remote_subscribers():
+    node = Node(ref="intra", intra_process_comms=True)
+    remote = Node(ref="remote")
+    local_received, remote_received = [], []
+
+    local = node.create_subscription(msg_type="int", topic="mixed", callback=local_received.append, manual_spin=True)
+    other = remote.create_subscription(msg_type="int", topic="mixed", callback=remote_received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="mixed")
+    sent = count_topic_publishes(publisher)
+
+    for i in range(3):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(local_received) == 3 and len(remote_received) == 3,
+                      spin=lambda: (local.spin(), other.spin()))
+
+    # -> The local subscriber ignores the redis copy of the messages handed over
+    assert local_received == [0, 1, 2]
+    assert remote_received == [0, 1, 2]
+    assert len(sent) == 3
+
+    node.destroy_node()
+    remote.destroy_node()
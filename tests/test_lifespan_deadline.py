@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from RedisROS import Node, QoS_profile
+
+from .utils import spin_until
+
+
+@pytest.mark.parametrize("intra_process", [False, True])
+def test_expired_messages_are_dropped(intra_process):
+    node = Node(ref="expiring", intra_process_comms=intra_process)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="expiring", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="expiring", qos_profile=QoS_profile(lifespan=0.05))
+
+    for i in range(3):
+        publisher.publish(msg=i)
+
+    time.sleep(0.1)
+    publisher.publish(msg=3)
+
+    assert spin_until(lambda: received == [3], spin=subscriber.spin)
+
+    # -> The expired messages are skipped, not lost
+    assert (subscriber.stats.expired, subscriber.stats.lost) == (3, 0)
+
+    node.destroy_node()
+
+
+def test_missed_deadlines_are_reported():
+    node = Node(ref="watched")
+    events = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="watched", callback=lambda msg: None, manual_spin=True,
+                                          qos_profile=QoS_profile(deadline=0.05), deadline_callback=events.append)
+    publisher = node.create_publisher(msg_type="int", topic="watched")
+
+    # -> No deadline is missed while messages keep arriving
+    for i in range(10):
+        publisher.publish(msg=i)
+        subscriber.spin()
+        time.sleep(0.01)
+
+    assert subscriber.stats.deadline_missed == 0
+
+    assert spin_until(lambda: subscriber.stats.deadline_missed >= 2)
+    assert [(event["topic"], event["total_count"]) for event in events[:2]] == [("/watched", 1), ("/watched", 2)]
+
+    node.destroy_node()
@@ -0,0 +1,83 @@
+import importlib
+import threading
+import time
+from datetime import datetime, timedelta
+
+from RedisROS import Node
+from RedisROS.Nodes import Clock, Sim_clock
+
+from .utils import spin_until
+
+# (The module, shadowed by the Clock class in RedisROS.Nodes)
+Clock_module = importlib.import_module("RedisROS.Nodes.Clock")
+
+
+def test_lockstep_steps_once_every_node_acknowledged():
+    clock = Clock(step_size=0.5, start_datetime=datetime(2020, 1, 1))
+    nodes = [Node(ref=f"stepped_{i}") for i in range(3)]
+    sim_clocks = [Sim_clock(node=node, lockstep=True) for node in nodes]
+    clock.run()
+
+    steps = {i: [] for i in range(3)}
+
+    def step(i):
+        for _ in range(10):
+            stepped = sim_clocks[i].wait_step(timeout=2.)
+            steps[i].append((stepped, sim_clocks[i].now()))
+            sim_clocks[i].ack()
+
+    threads = [threading.Thread(target=step, args=(i,)) for i in range(3)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # -> Every node saw every step, at the same sim time
+    for i in range(3):
+        assert steps[i] == [(k, datetime(2020, 1, 1) + timedelta(seconds=0.5 * k)) for k in range(10)]
+
+    # -> The clock waits for the slowest node
+    assert spin_until(lambda: clock.step == 10)
+    sim_clocks[0].close()
+    sim_clocks[1].close()
+    time.sleep(0.05)
+    assert clock.step == 10
+
+    assert sim_clocks[2].wait_step(timeout=1.) == 10
+    sim_clocks[2].ack()
+    assert spin_until(lambda: clock.step == 11)
+
+    sim_clocks[2].close()
+    clock.destroy_node()
+
+    for node in nodes:
+        node.destroy_node()
+
+
+def test_lockstep_resumes_once_a_crashed_node_expires(monkeypatch):
+    monkeypatch.setattr(Clock_module, "PARTICIPANT_LEASE", 0.3)
+    monkeypatch.setattr(Clock_module, "BARRIER_CHECK_PERIOD", 0.05)
+
+    clock = Clock(step_size=1.)
+    nodes = [Node(ref=f"stepped_{i}") for i in range(2)]
+    sim_clocks = [Sim_clock(node=node, lockstep=True) for node in nodes]
+    clock.run()
+
+    for sim_clock in sim_clocks:
+        assert sim_clock.wait_step(timeout=1.) == 0
+
+    # -> The second node crashes: it stops renewing its registration without unregistering
+    sim_clocks[1]._Sim_clock__heartbeat_stop.set()
+    sim_clocks[0].ack()
+
+    time.sleep(0.1)
+    assert clock.step == 0
+
+    assert spin_until(lambda: clock.step == 1, timeout=2.)
+
+    sim_clocks[0].close()
+    clock.destroy_node()
+
+    for node in nodes:
+        node.destroy_node()
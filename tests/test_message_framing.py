@@ -0,0 +1,48 @@
+import json
+import time
+
+from RedisROS import Node
+from RedisROS.Transports.Message_framing import pack_message, unpack_message, is_message, get_publisher_key
+
+from .utils import spin_until
+
+
+def test_header_round_trip():
+    data = pack_message(number=7, seq=2 ** 40, timestamp=time.time_ns(), payload=b"[1,2]", flags=0x02)
+
+    assert is_message(data)
+    assert unpack_message(data)[:3] == (0x02, 7, 2 ** 40)
+    assert unpack_message(data)[4] == b"[1,2]"
+
+
+def test_metadata_is_registered_once_per_publisher():
+    node = Node(ref="talker")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="framed", callback=lambda msg, raw_msg: received.append(raw_msg), manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="framed")
+
+    assert json.loads(node.backend.get(key=get_publisher_key(number=publisher.number)))["publisher_id"] == publisher.id
+
+    publisher.publish(msg=1)
+    assert spin_until(lambda: received, spin=subscriber.spin)
+
+    raw_msg = received[0]
+    assert (raw_msg["msg"], raw_msg["msg_type"], raw_msg["parent_node_ref"], raw_msg["publisher_id"]) == (1, "int", "talker", publisher.id)
+    assert abs(raw_msg["timestamp"] - time.time()) < 1.
+
+    node.destroy_node()
+
+
+def test_messages_without_header_are_accepted():
+    node = Node(ref="listener")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="legacy", callback=received.append, manual_spin=True)
+
+    node.backend.publish("/legacy", json.dumps({"msg": 1, "msg_type": "int", "parent_node_ref": "other",
+                                                "publisher_id": "legacy", "timestamp": time.time()}))
+
+    assert spin_until(lambda: received == [1], spin=subscriber.spin)
+
+    node.destroy_node()
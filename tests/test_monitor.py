@@ -0,0 +1,41 @@
+import time
+
+from RedisROS.Endpoints.Core import Endpoint_stats
+from RedisROS.Nodes import Monitor
+from RedisROS.Nodes.Monitor import TOPIC_FIELDS
+
+
+def snapshot(timestamp: float, stats: Endpoint_stats) -> dict:
+    return {
+        "node": "talker",
+        "timestamp": timestamp,
+        "endpoints": [{"id": 0, "type": "subscriber", "topic": "/chatter", **stats.snapshot()}]
+    }
+
+
+def test_monitor_reports_every_endpoint_counter():
+    monitor = Monitor(window=60.)
+    stats = Endpoint_stats()
+    now = time.time()
+
+    monitor.stats_callback(snapshot(timestamp=now - 1., stats=stats))
+
+    stats.received += 10
+    stats.filtered += 1
+    stats.throttled += 2
+    stats.expired += 3
+    stats.deadline_missed += 4
+    monitor.stats_callback(snapshot(timestamp=now, stats=stats))
+
+    summary = monitor.sample()
+    topic = summary["topics"]["/chatter"]
+
+    assert topic["receive_rate"] == 10.
+    assert (topic["filtered"], topic["throttled"], topic["expired"], topic["deadline_missed"]) == (1, 2, 3, 4)
+
+    # -> The time series follow the same fields
+    sample = monitor.get_series(kind="topic", name="/chatter")[-1]
+    assert set(TOPIC_FIELDS) == set(sample)
+    assert sample["expired"] == 3
+
+    monitor.destroy_node()
@@ -0,0 +1,80 @@
+from threading import Thread
+
+from RedisROS import Node
+from RedisROS.Transports.Socket_transport import Socket_server, Socket_client
+
+from .utils import spin_until
+
+
+def test_p2p_messages_are_received_once():
+    node = Node(ref="p2p", p2p_comms=True)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="p2p", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="p2p")
+
+    # -> The first messages are sent before the subscriber connected to the publisher, through redis only
+    for i in range(5):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(received) == 5, spin=subscriber.spin)
+    assert spin_until(lambda: subscriber.p2p_connections, spin=subscriber.spin)
+
+    # -> Once connected, the redis copies of the messages received through the socket are skipped
+    for i in range(5, 10):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(received) == 10, spin=subscriber.spin)
+
+    for _ in range(20):
+        subscriber.spin()
+
+    assert received == list(range(10))
+    assert subscriber.stats.lost == 0
+    assert subscriber.stats.reordered == 0
+
+    node.destroy_node()
+
+
+def test_p2p_publisher_skips_redis_once_every_subscriber_is_connected():
+    node = Node(ref="p2p", p2p_comms=True)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="p2p", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="p2p")
+
+    assert spin_until(lambda: publisher.p2p_server.peer_count == 1, spin=subscriber.spin)
+
+    sent = []
+    publish = publisher.backend.publish
+    publisher.backend.publish = lambda channel, data: sent.append(channel) or publish(channel, data)
+
+    publisher.publish(msg=0)
+
+    assert spin_until(lambda: received == [0], spin=subscriber.spin)
+    assert publisher.topic not in sent
+
+    node.destroy_node()
+
+
+def test_concurrent_sends_do_not_interleave_frames():
+    server = Socket_server(transport="unix")
+    frames = []
+    client = Socket_client(address=server.address, on_frame=frames.append)
+
+    assert spin_until(lambda: server.peer_count == 1)
+
+    # -> Frames larger than the socket buffer are written in several parts by sendall
+    payloads = [bytes([i]) * 1_000_000 for i in range(4)]
+    threads = [Thread(target=lambda payload=payload: [server.send(data=payload) for _ in range(5)]) for payload in payloads]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert spin_until(lambda: len(frames) == 20)
+    assert sorted(frames) == sorted(payloads * 5)
+
+    client.close()
+    server.close()
@@ -0,0 +1,52 @@
+from RedisROS import Node, QoS_profile
+
+from .utils import spin_until
+
+
+def test_pattern_subscription_receives_the_matching_topics():
+    node = Node(ref="listener")
+    talker = Node(ref="talker")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="pose", topic="/robot_*/pose", pattern=True, manual_spin=True,
+                                          callback=lambda msg, raw_msg: received.append((raw_msg["topic"], msg)))
+
+    publishers = [talker.create_publisher(msg_type="pose", topic=f"robot_{i}/pose") for i in range(3)]
+    other = talker.create_publisher(msg_type="scan", topic="robot_0/scan")
+
+    for k in range(2):
+        for publisher in publishers:
+            publisher.publish(msg=k)
+
+        other.publish(msg=k)
+
+    assert spin_until(lambda: len(received) == 6, spin=subscriber.spin)
+    assert sorted(received) == [(f"/robot_{i}/pose", k) for i in range(3) for k in range(2)]
+    assert subscriber.stats.lost == 0
+
+    node.destroy_node()
+    assert talker.backend.numpat() == 0
+
+    talker.destroy_node()
+
+
+def test_pattern_subscription_conflates_every_topic_separately():
+    node = Node(ref="listener")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="pose", topic="/robot_?/pose", pattern=True, manual_spin=True,
+                                          callback=lambda msg, raw_msg: received.append((raw_msg["topic"], msg)),
+                                          qos_profile=QoS_profile(conflate=True))
+
+    publishers = [node.create_publisher(msg_type="pose", topic=f"robot_{i}/pose") for i in range(2)]
+
+    for k in range(5):
+        for publisher in publishers:
+            publisher.publish(msg=k)
+
+    assert spin_until(lambda: subscriber.queue.conflated == 8)
+    subscriber.spin()
+
+    assert sorted(received) == [("/robot_0/pose", 4), ("/robot_1/pose", 4)]
+
+    node.destroy_node()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from RedisROS import Node, QoS_profile
+
+from .utils import spin_until
+
+
+def test_subscriber_keeps_every_nth_message():
+    node = Node(ref="downsampled")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="downsampled", callback=received.append,
+                                          qos_profile=QoS_profile(keep_every=3), manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="downsampled")
+
+    for i in range(10):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: subscriber.stats.received + subscriber.stats.throttled == 10, spin=subscriber.spin)
+    assert received == [0, 3, 6, 9]
+    assert (subscriber.stats.throttled, subscriber.stats.lost) == (6, 0)
+
+    with pytest.raises(ValueError):
+        QoS_profile(keep_every=0)
+
+    node.destroy_node()
+
+
+def test_publisher_rate_limit_drops_the_messages_above_the_burst():
+    node = Node(ref="limited")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="limited", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="limited", qos_profile=QoS_profile(rate_limit=1., rate_burst=5))
+
+    for i in range(20):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(received) == 5, spin=subscriber.spin)
+    assert received == list(range(5))
+    assert (publisher.stats.sent, publisher.stats.throttled) == (5, 15)
+
+    node.destroy_node()
+
+
+def test_publisher_rate_limit_coalesces_to_the_latest_message():
+    node = Node(ref="limited")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="limited", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="limited", qos_profile=QoS_profile(rate_limit=20., rate_policy="coalesce"))
+
+    for i in range(10):
+        publisher.publish(msg=i)
+
+    # -> The first message is sent at once, the latest of the others once a token is available
+    assert spin_until(lambda: received == [0, 9], spin=subscriber.spin)
+    assert (publisher.stats.sent, publisher.stats.throttled) == (2, 8)
+    assert subscriber.stats.lost == 0
+
+    node.destroy_node()
+
+
+def test_coalesced_messages_are_sent_before_the_next_ones():
+    node = Node(ref="limited")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="limited", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="limited",
+                                      qos_profile=QoS_profile(rate_limit=100., rate_burst=1, rate_policy="coalesce"))
+
+    # -> The coalesced message is slow to send from the timer thread, tokens are available again meanwhile
+    publish = publisher.backend.publish
+
+    def slow_publish(channel, data):
+        if threading.current_thread() is not threading.main_thread():
+            time.sleep(0.05)
+        return publish(channel, data)
+
+    publisher.backend.publish = slow_publish
+
+    for i in range(40):
+        publisher.publish(msg=i)
+        time.sleep(0.004)
+
+    assert spin_until(lambda: len(received) == publisher.stats.sent, spin=subscriber.spin)
+    assert received == sorted(set(received))
+    assert subscriber.stats.lost == 0
+
+    node.destroy_node()
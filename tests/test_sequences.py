@@ -0,0 +1,48 @@
+import json
+import time
+
+from RedisROS import Node
+from RedisROS.Transports.Message_framing import pack_message, get_publisher_key, PUBLISHER_COUNTER_KEY
+
+from .utils import spin_until
+
+
+def test_subscriber_counts_lost_and_reordered_messages():
+    node = Node(ref="listener")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="sequenced", callback=received.append, manual_spin=True)
+
+    # -> Publish from a registered publisher number, in a chosen sequence order
+    number = node.backend.incr(key=PUBLISHER_COUNTER_KEY)
+    node.backend.set(key=get_publisher_key(number=number),
+                     value=json.dumps({"msg_type": "int", "parent_node_ref": "talker", "publisher_id": "talker"}))
+
+    for seq in [3, 4, 6, 5, 9]:
+        node.backend.publish("/sequenced", pack_message(number=number, seq=seq, timestamp=time.time_ns(), payload=json.dumps(seq).encode()))
+
+    assert spin_until(lambda: len(received) == 5, spin=subscriber.spin)
+
+    # -> Messages before the first one received are not lost, 5 arrived late, 7 and 8 are missing
+    stats = subscriber.get_stats()
+    assert received == [3, 4, 6, 5, 9]
+    assert (stats["lost"], stats["reordered"]) == (2, 1)
+
+    node.destroy_node()
+
+
+def test_sequences_are_followed_per_publisher():
+    node = Node(ref="listener")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="sequenced", callback=received.append, manual_spin=True)
+    publishers = [node.create_publisher(msg_type="int", topic="sequenced") for _ in range(2)]
+
+    for i in range(5):
+        for publisher in publishers:
+            publisher.publish(msg=i)
+
+    assert spin_until(lambda: len(received) == 10, spin=subscriber.spin)
+    assert (subscriber.stats.lost, subscriber.stats.reordered) == (0, 0)
+
+    node.destroy_node()
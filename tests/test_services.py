@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from RedisROS import Node
+from RedisROS.Callback_groups import CallbackGroup, MutuallyExclusiveCallbackGroup
+
+
+def test_services_share_the_pool_of_their_callback_group():
+    server = Node(ref="server")
+    client_node = Node(ref="client")
+    threads = set()
+
+    def echo(request):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.1)
+        return request
+
+    server.create_service(srv_type="echo", srv_name="echo_0", callback=echo)
+    server.create_service(srv_type="echo", srv_name="echo_1", callback=echo)
+
+    clients = [client_node.create_client(srv_type="echo", srv_name=f"echo_{i}") for i in range(2)]
+
+    # -> Requests are handled in parallel, by the threads of the default service callback group
+    start = time.monotonic()
+    futures = [client.call_async(request=i) for i in range(5) for client in clients]
+    assert [future.result(timeout=2.) for future in futures] == [i for i in range(5) for _ in clients]
+    assert time.monotonic() - start < 0.5
+
+    assert all(name.startswith("default_service_callback_group") for name in threads)
+
+    client_node.destroy_node()
+    server.destroy_node()
+
+
+def test_mutually_exclusive_services_handle_one_request_at_a_time():
+    server = Node(ref="server")
+    client_node = Node(ref="client")
+    running = []
+    overlaps = []
+
+    def handle(request):
+        running.append(request)
+        overlaps.append(len(running))
+        time.sleep(0.01)
+        running.remove(request)
+        return request
+
+    service = server.create_service(srv_type="echo", srv_name="echo", callback=handle, callback_group=MutuallyExclusiveCallbackGroup(name="exclusive"))
+    client = client_node.create_client(srv_type="echo", srv_name="echo")
+
+    futures = [client.call_async(request=i) for i in range(10)]
+    assert [future.result(timeout=2.) for future in futures] == list(range(10))
+    assert max(overlaps) == 1
+
+    # (Endpoints of a callback group the node does not hold are not destroyed with it)
+    server.destroy_service(service=service)
+    client_node.destroy_node()
+    server.destroy_node()
+
+
+def test_a_service_name_is_served_once():
+    node = Node(ref="server", namespace="robot_0")
+    other = Node(ref="other", namespace="robot_1")
+
+    node.create_service(srv_type="add", srv_name="add", callback=lambda request: request["a"] + request["b"])
+
+    # -> Service names are global like topics, whatever the namespace of the node
+    with pytest.raises(ValueError):
+        other.create_service(srv_type="add", srv_name="add", callback=lambda request: 0)
+
+    client = other.create_client(srv_type="add", srv_name="add")
+    assert client.name == other.create_publisher(msg_type="int", topic="add").topic == "/add"
+    assert client.call(request={"a": 1, "b": 2}, timeout=1.) == 3
+
+    other.destroy_node()
+    node.destroy_node()
+
+
+def test_clients_are_identified_across_processes():
+    server = Node(ref="server")
+    client_node = Node(ref="client")
+
+    server.create_service(srv_type="echo", srv_name="echo", callback=lambda request: request)
+    clients = [client_node.create_client(srv_type="echo", srv_name="echo") for _ in range(2)]
+
+    # -> Reply channels and request ids do not depend on the process-local endpoint ids
+    assert clients[0].reply_channel != clients[1].reply_channel
+    assert all(client.id not in client.reply_channel for client in clients)
+
+    futures = [client.call_async(request=i) for i, client in enumerate(clients)]
+    assert futures[0].request_id != futures[1].request_id
+    assert [future.result(timeout=1.) for future in futures] == [0, 1]
+
+    client_node.destroy_node()
+    server.destroy_node()
+
+
+def test_callback_groups_run_the_submitted_work_in_order_by_default():
+    group = CallbackGroup(name="base")
+    calls = []
+
+    futures = [group.submit(calls.append, i) for i in range(5)]
+
+    for future in futures:
+        future.result(timeout=5)
+
+    assert calls == list(range(5))
+
+    group.shutdown()
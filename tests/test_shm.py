@@ -0,0 +1,95 @@
+from RedisROS import Node, Config, QoS_profile
+from RedisROS.Transports import Shm_ring_buffer
+
+from .utils import spin_until
+
+
+def test_ring_view_is_invalidated_by_overwrite():
+    ring = Shm_ring_buffer(slot_count=2, slot_size=64)
+
+    try:
+        seq = ring.write(data=b"first")
+        view = ring.view(seq=seq)
+
+        # -> The view reads the slot in place
+        assert isinstance(view, memoryview)
+        assert view == b"first"
+        assert ring.is_valid(seq=seq)
+        view.release()
+
+        # -> Wrap around the ring
+        ring.write(data=b"second")
+        ring.write(data=b"third")
+
+        assert not ring.is_valid(seq=seq)
+        assert ring.view(seq=seq) is None
+        assert ring.read(seq=seq) is None
+    finally:
+        ring.close()
+
+
+def test_shm_overrun_counts_lost_messages(monkeypatch):
+    monkeypatch.setattr(Config, "shm_slot_count", 16)
+
+    node = Node(ref="shm", shm_comms=True)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="shm", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="int", topic="shm")
+
+    # -> Publish more messages than the ring holds before the subscriber reads them
+    for i in range(20):
+        publisher.publish(msg=i)
+
+    assert spin_until(lambda: subscriber.stats.lost + len(received) == 20, spin=subscriber.spin)
+
+    assert received == list(range(4, 20))
+    assert subscriber.stats.lost == 4
+    assert subscriber.stats.dropped == 0
+
+    # -> Overwritten slots are not counted again by the sequence of the publisher
+    publisher.publish(msg=20)
+    assert spin_until(lambda: len(received) == 17, spin=subscriber.spin)
+    assert subscriber.stats.lost == 4
+
+    node.destroy_node()
+
+
+def test_subscriber_detaches_from_destroyed_publisher_rings():
+    node = Node(ref="shm", shm_comms=True)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="shm", callback=received.append, manual_spin=True)
+
+    for i in range(3):
+        publisher = node.create_publisher(msg_type="int", topic="shm")
+        publisher.publish(msg=i)
+
+        assert spin_until(lambda: len(received) == i + 1, spin=subscriber.spin)
+        assert len(subscriber.shm_rings) == 1
+
+        node.destroy_publisher(publisher=publisher)
+
+        assert spin_until(lambda: not subscriber.shm_rings, spin=subscriber.spin)
+
+    node.destroy_node()
+
+
+def test_shm_decodes_batched_and_compressed_messages():
+    node = Node(ref="shm", shm_comms=True)
+    received = []
+
+    subscriber = node.create_subscription(msg_type="str", topic="shm", callback=received.append, manual_spin=True)
+    publisher = node.create_publisher(msg_type="str", topic="shm",
+                                      qos_profile=QoS_profile(batch_period=0.01, compression="zlib", compression_threshold=16))
+
+    msgs = [f"message {i} " * 10 for i in range(5)]
+
+    for msg in msgs:
+        publisher.publish(msg=msg)
+
+    assert spin_until(lambda: len(received) == 5, spin=subscriber.spin)
+    assert received == msgs
+    assert subscriber.stats.compressed == 5
+
+    node.destroy_node()
@@ -0,0 +1,57 @@
+from RedisROS import Node, Config
+
+from .utils import spin_until
+
+
+def test_publishers_notice_new_subscribers_before_the_check_period(monkeypatch):
+    # -> Only announcements can refresh the cached view of the subscribers
+    monkeypatch.setattr(Config, "remote_check_period", 3600.)
+
+    node = Node(ref="local", intra_process_comms=True)
+    remote = Node(ref="remote")
+    received = []
+
+    publisher = node.create_publisher(msg_type="int", topic="late")
+
+    # -> No subscriber yet, the message is not sent through redis
+    publisher.publish(msg=0)
+
+    subscriber = remote.create_subscription(msg_type="int", topic="late", callback=received.append, manual_spin=True)
+    publisher.publish(msg=1)
+
+    assert spin_until(lambda: received == [1], spin=subscriber.spin)
+
+    node.destroy_node()
+    remote.destroy_node()
+
+
+def test_publishers_notice_filter_changes_before_the_check_period(monkeypatch):
+    monkeypatch.setattr(Config, "remote_check_period", 3600.)
+
+    node = Node(ref="node")
+    filtered, unfiltered = [], []
+
+    filtered_subscriber = node.create_subscription(msg_type="int", topic="filtered", callback=filtered.append,
+                                                   manual_spin=True, content_filter=[("msg", ">", 5)])
+    publisher = node.create_publisher(msg_type="int", topic="filtered")
+
+    publisher.publish(msg=1)
+    assert publisher.stats.filtered == 1
+
+    # -> A subscriber without filter wants every message
+    unfiltered_subscriber = node.create_subscription(msg_type="int", topic="filtered", callback=unfiltered.append, manual_spin=True)
+
+    publisher.publish(msg=2)
+    assert publisher.stats.filtered == 1
+    assert spin_until(lambda: unfiltered == [2], spin=unfiltered_subscriber.spin)
+
+    # -> Once it is destroyed, the messages no subscriber wants are skipped again
+    node.destroy_subscription(subscriber=unfiltered_subscriber)
+
+    publisher.publish(msg=3)
+    assert publisher.stats.filtered == 2
+
+    filtered_subscriber.spin()
+    assert filtered == []
+
+    node.destroy_node()
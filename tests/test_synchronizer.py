@@ -0,0 +1,82 @@
+from RedisROS import Node
+from RedisROS.Synchronizer import Time_synchronizer
+
+MS = 1000000
+
+
+def create_synchronizer(topics: list, slop: float = None, queue_size: int = 10) -> tuple:
+    node = Node(ref="synchronized")
+    matched = []
+
+    synchronizer = Time_synchronizer(node=node, topics=topics, callback=lambda *msgs: matched.append(msgs),
+                                     slop=slop, queue_size=queue_size, manual_spin=True)
+
+    return node, synchronizer, matched
+
+
+def test_exact_policy_matches_equal_stamps():
+    node, synchronizer, matched = create_synchronizer(topics=["a", "b"])
+
+    synchronizer.add(index=0, msg="a0", stamp=0)
+    synchronizer.add(index=0, msg="a1", stamp=10 * MS)
+    synchronizer.add(index=1, msg="b1", stamp=10 * MS)
+
+    assert matched == [("a1", "b1")]
+    assert synchronizer.get_stats() == {"matched": 1, "dropped": 1, "buffered": [0, 0]}
+
+    node.destroy_node()
+
+
+def test_approximate_policy_rejects_sets_spanning_more_than_slop():
+    node, synchronizer, matched = create_synchronizer(topics=["a", "b", "c"], slop=0.01)
+
+    # -> b and c are each within slop of a, but 16 ms apart
+    synchronizer.add(index=1, msg="b", stamp=92 * MS)
+    synchronizer.add(index=2, msg="c", stamp=108 * MS)
+    synchronizer.add(index=0, msg="a", stamp=100 * MS)
+
+    assert matched == []
+
+    # -> A set within slop of each other is matched
+    synchronizer.add(index=2, msg="c'", stamp=101 * MS)
+
+    assert matched == [("a", "b", "c'")]
+
+    node.destroy_node()
+
+
+def test_messages_older_than_a_full_buffer_are_dropped_unmatched():
+    node, synchronizer, matched = create_synchronizer(topics=["a", "b"], slop=0.01, queue_size=2)
+
+    synchronizer.add(index=0, msg="a100", stamp=100 * MS)
+    synchronizer.add(index=0, msg="a200", stamp=200 * MS)
+    synchronizer.add(index=1, msg="b5", stamp=5 * MS)
+
+    # -> The new message is the oldest of the full buffer, it is dropped instead of being matched
+    synchronizer.add(index=0, msg="a0", stamp=0)
+
+    assert matched == []
+    assert synchronizer.get_stats() == {"matched": 0, "dropped": 1, "buffered": [2, 1]}
+
+    node.destroy_node()
+
+
+def test_the_new_message_is_matched_among_equal_stamps():
+    node, synchronizer, matched = create_synchronizer(topics=["a", "b", "c"], slop=0.01)
+
+    synchronizer.add(index=0, msg="a0", stamp=100 * MS)
+    synchronizer.add(index=1, msg="b100", stamp=100 * MS)
+    synchronizer.add(index=1, msg="b111", stamp=111 * MS)
+
+    # -> c is closer to b111 than to b100, which is more than slop from a0
+    synchronizer.add(index=2, msg="c106", stamp=106 * MS)
+
+    assert matched == []
+
+    # -> A message with the stamp of a0 completes a set, with itself rather than a0
+    synchronizer.add(index=0, msg="a1", stamp=100 * MS)
+
+    assert matched == [("a1", "b100", "c106")]
+    assert synchronizer.get_stats() == {"matched": 1, "dropped": 1, "buffered": [0, 1, 0]}
+
+    node.destroy_node()
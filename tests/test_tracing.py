@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from RedisROS import Node
+from RedisROS.Tracing import tracer
+
+
+
+@pytest.fixture
+def tracing():
+    tracer.clear()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.clear()
+
+
+def test_subscriber_trace_records_the_queue_wait(tracing):
+    node = Node(ref="traced")
+    received = []
+
+    subscriber = node.create_subscription(msg_type="int", topic="traced", callback=received.append, manual_spin=True)
+
+    # -> A message published long ago, queued for 50 ms
+    subscriber.hand_over(msg={"publisher_id": "old", "seq": 0, "timestamp": time.time() - 100., "msg": 1})
+    time.sleep(0.05)
+    subscriber.spin()
+
+    assert received == [1]
+
+    event, = [event for event in tracing.events if event["category"] == "dispatch"]
+    assert 0.05 <= event["wait"] < 1.
+
+    node.destroy_node()
+
+
+def test_service_trace_records_the_queue_wait(tracing):
+    server = Node(ref="server")
+    client_node = Node(ref="client")
+
+    server.create_service(srv_type="add", srv_name="add", callback=lambda request: request["x"] + request["y"])
+    client = client_node.create_client(srv_type="add", srv_name="add")
+
+    assert client.call({"x": 1, "y": 2}, timeout=1.) == 3
+
+    event, = [event for event in tracing.events if event["category"] == "service"]
+    assert event["wait"] is not None and 0. <= event["wait"] < 1.
+
+    client_node.destroy_node()
+    server.destroy_node()
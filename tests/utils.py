@@ -0,0 +1,20 @@
+import time
+
+
+def spin_until(condition, spin=lambda: None, timeout: float = 5.) -> bool:
+    """
+    Call spin until condition is True or the timeout (s) expires
+
+    :return: Whether the condition was met
+    """
+
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+
+        spin()
+        time.sleep(0.001)
+
+    return True